@@ -1,3 +1,5 @@
+import datetime
+import itertools
 import math
 import uuid
 from contextlib import suppress
@@ -5,6 +7,7 @@ from datetime import date
 from functools import cached_property
 from typing import Any, Optional
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
@@ -23,6 +26,7 @@ from apps.accounts.utils import (
     get_default_group,
     get_group_permissions,
     get_superadmins_group,
+    get_user_visibility,
 )
 from apps.commons.enums import SDG, Language
 from apps.commons.mixins import (
@@ -318,6 +322,7 @@ class ProjectUser(
         self._event_queryset: QuerySet[Event] | None = None
         self._instruction_queryset: QuerySet[Instruction] | None = None
         self._related_organizations: list[Organization] = None
+        self._visibility: dict[str, list[int | str] | QuerySet] | None = None
 
     # AbstractUser unused fields
     username_validator = None
@@ -503,6 +508,18 @@ class ProjectUser(
         """Return the first_name plus the last_name, with a space in between."""
         return f"{self.given_name.capitalize()} {self.family_name.capitalize()}".strip()
 
+    def get_visibility(self) -> dict[str, list[int | str] | QuerySet]:
+        """
+        Return the ids of the organizations, projects, groups and permission groups
+        used to filter the objects the user can see.
+
+        The result is cached until the user's groups or their permissions change,
+        so the guardian permissions are not expanded on every request.
+        """
+        if self._visibility is None:
+            self._visibility = get_user_visibility(self)
+        return self._visibility
+
     def get_project_queryset(self) -> QuerySet["Project"]:
         """get Project queryset
 
@@ -512,21 +529,19 @@ class ProjectUser(
         if self._project_queryset is not None:
             return self._project_queryset
 
+        # if user is superuser, we reset all preview filters ( to return all elements)
+        if self.is_superuser:
+            self._project_queryset = Project.objects.all().distinct()
+            return self._project_queryset
+
+        visibility = self.get_visibility()
         q_filter = Q(publication_status=Project.PublicationStatus.PUBLIC)
         q_filter |= Q(
             publication_status=Project.PublicationStatus.ORG,
-            organizations__in=get_objects_for_user(
-                self, "organizations.view_org_project"
-            ),
+            organizations__in=visibility["org_project_organizations"],
         )
-        q_filter |= Q(
-            organizations__in=get_objects_for_user(self, "organizations.view_project")
-        )
-        q_filter |= Q(id__in=get_objects_for_user(self, "projects.view_project"))
-
-        # if user is superuser, we reset all preview filters ( to return all elements)
-        if self.is_superuser:
-            q_filter = Q()
+        q_filter |= Q(organizations__in=visibility["project_organizations"])
+        q_filter |= Q(id__in=visibility["projects"])
 
         self._project_queryset = Project.objects.filter(q_filter).distinct()
         return self._project_queryset
@@ -536,20 +551,16 @@ class ProjectUser(
             if self.is_superuser:
                 self._news_queryset = News.objects.all()
             else:
-                groups = PeopleGroup.objects.filter(groups__users=self)
+                visibility = self.get_visibility()
                 organizations = self.get_related_organizations()
                 self._news_queryset = News.objects.filter(
                     Q(visible_by_all=True)
-                    | Q(people_groups__in=groups)
+                    | Q(people_groups__in=visibility["member_people_groups"])
                     | (
                         Q(organization__in=organizations)
                         & Q(people_groups__isnull=True)
                     )
-                    | Q(
-                        organization__in=get_objects_for_user(
-                            self, "organizations.view_news"
-                        )
-                    )
+                    | Q(organization__in=visibility["news_organizations"])
                 )
         return self._news_queryset.distinct()
 
@@ -558,20 +569,16 @@ class ProjectUser(
             if self.is_superuser:
                 self._instruction_queryset = Instruction.objects.all()
             else:
-                groups = PeopleGroup.objects.filter(groups__users=self)
+                visibility = self.get_visibility()
                 organizations = self.get_related_organizations()
                 self._instruction_queryset = Instruction.objects.filter(
                     Q(visible_by_all=True)
-                    | Q(people_groups__in=groups)
+                    | Q(people_groups__in=visibility["member_people_groups"])
                     | (
                         Q(organization__in=organizations)
                         & Q(people_groups__isnull=True)
                     )
-                    | Q(
-                        organization__in=get_objects_for_user(
-                            self, "organizations.view_instruction"
-                        )
-                    )
+                    | Q(organization__in=visibility["instruction_organizations"])
                 )
         return self._instruction_queryset.distinct()
 
@@ -580,20 +587,16 @@ class ProjectUser(
             if self.is_superuser:
                 self._event_queryset = Event.objects.all()
             else:
-                groups = PeopleGroup.objects.filter(groups__users=self)
+                visibility = self.get_visibility()
                 organizations = self.get_related_organizations()
                 self._event_queryset = Event.objects.filter(
                     Q(visible_by_all=True)
-                    | Q(people_groups__in=groups)
+                    | Q(people_groups__in=visibility["member_people_groups"])
                     | (
                         Q(organization__in=organizations)
                         & Q(people_groups__isnull=True)
                     )
-                    | Q(
-                        organization__in=get_objects_for_user(
-                            self, "organizations.view_event"
-                        )
-                    )
+                    | Q(organization__in=visibility["event_organizations"])
                 )
         return self._event_queryset.distinct()
 
@@ -606,26 +609,20 @@ class ProjectUser(
         if self._user_queryset is not None:
             return self._user_queryset
 
+        # if user is superuser, we reset all preview filters ( to return all elements)
+        if self.is_superuser:
+            self._user_queryset = ProjectUser.objects.all().distinct()
+            return self._user_queryset
+
+        visibility = self.get_visibility()
         q_filter = Q(id=self.id)
         q_filter |= Q(
             privacy_settings__publication_status=PrivacySettings.PrivacyChoices.PUBLIC
         )
         q_filter |= Q(
             privacy_settings__publication_status=PrivacySettings.PrivacyChoices.ORGANIZATION
-        ) & Q(
-            groups__organizations__in=get_objects_for_user(
-                self, "organizations.view_org_projectuser"
-            )
-        )
-        q_filter |= Q(
-            groups__organizations__in=get_objects_for_user(
-                self, "organizations.view_projectuser"
-            )
-        )
-
-        # if user is superuser, we reset all preview filters ( to return all elements)
-        if self.is_superuser:
-            q_filter = Q()
+        ) & Q(groups__organizations__in=visibility["org_user_organizations"])
+        q_filter |= Q(groups__organizations__in=visibility["user_organizations"])
         self._user_queryset = ProjectUser.objects.filter(q_filter).distinct()
         return self._user_queryset
 
@@ -637,23 +634,18 @@ class ProjectUser(
         if self._people_group_queryset is not None:
             return self._people_group_queryset
 
-        q_filter = Q(publication_status=PeopleGroup.PublicationStatus.PUBLIC)
-        q_filter |= Q(id__in=get_objects_for_user(self, "accounts.view_peoplegroup"))
-        q_filter |= Q(publication_status=PeopleGroup.PublicationStatus.ORG) & Q(
-            organization__in=get_objects_for_user(
-                self, "organizations.view_org_peoplegroup"
-            )
-        )
-        q_filter |= Q(
-            organization__in=get_objects_for_user(
-                self, "organizations.view_peoplegroup"
-            )
-        )
-
         # if user is superuser, we reset all preview filters ( to return all elements)
         if self.is_superuser:
-            q_filter = Q()
+            self._people_group_queryset = PeopleGroup.objects.all().distinct()
+            return self._people_group_queryset
 
+        visibility = self.get_visibility()
+        q_filter = Q(publication_status=PeopleGroup.PublicationStatus.PUBLIC)
+        q_filter |= Q(id__in=visibility["people_groups"])
+        q_filter |= Q(publication_status=PeopleGroup.PublicationStatus.ORG) & Q(
+            organization__in=visibility["org_people_group_organizations"]
+        )
+        q_filter |= Q(organization__in=visibility["people_group_organizations"])
         self._people_group_queryset = PeopleGroup.objects.filter(q_filter).distinct()
         return self._people_group_queryset
 
@@ -757,18 +749,14 @@ class UserScore(models.Model):
     activity = models.FloatField(default=0)
     score = models.FloatField(default=0)
 
-    def get_completeness(self) -> float:
-        has_job = bool(self.user.job)
-
-        skills_level = (
-            self.user.skills.all().values_list("level", flat=True).distinct("level")
-        )
-        has_expert_skills = 4 in skills_level
-        has_competent_skills = 3 in skills_level
-        has_rich_content = (
-            "<img" in self.user.description or "<iframe" in self.user.description
-        )
-        description_length = len(self.user.description)
+    @staticmethod
+    def compute_completeness(
+        has_job: bool,
+        has_expert_skills: bool,
+        has_competent_skills: bool,
+        has_rich_content: bool,
+        description_length: int,
+    ) -> float:
         return (
             int(has_job)
             + int(has_expert_skills)
@@ -777,8 +765,8 @@ class UserScore(models.Model):
             + math.log10(1 + description_length)
         )
 
-    def get_activity(self) -> float:
-        last_activity = self.user.last_login
+    @staticmethod
+    def compute_activity(last_activity: datetime.datetime | None) -> float:
         if last_activity:
             weeks_since_last_activity = (
                 timezone.localtime(timezone.now()) - last_activity
@@ -786,6 +774,23 @@ class UserScore(models.Model):
             return 5 / (1 + weeks_since_last_activity)
         return 0
 
+    def get_completeness(self) -> float:
+        skills_level = (
+            self.user.skills.all().values_list("level", flat=True).distinct("level")
+        )
+        return self.compute_completeness(
+            has_job=bool(self.user.job),
+            has_expert_skills=4 in skills_level,
+            has_competent_skills=3 in skills_level,
+            has_rich_content=(
+                "<img" in self.user.description or "<iframe" in self.user.description
+            ),
+            description_length=len(self.user.description),
+        )
+
+    def get_activity(self) -> float:
+        return self.compute_activity(self.user.last_login)
+
     def set_score(self) -> "UserScore":
         completeness = self.get_completeness()
         activity = self.get_activity()
@@ -795,6 +800,61 @@ class UserScore(models.Model):
         self.score = score
         return self
 
+    @classmethod
+    def calculate_scores(cls, users: QuerySet["ProjectUser"] | None = None) -> int:
+        """
+        Calculate and save the scores of the given users with a single grouped
+        query for each chunk of `SCORES_CHUNK_SIZE` users.
+
+        Args:
+            - users (QuerySet[ProjectUser] | None): The users to score, all the
+                users if None.
+
+        Returns:
+            - int: The number of scores saved.
+        """
+        if users is None:
+            users = ProjectUser.objects.all()
+        rows = users.values_list("id", "job", "description", "last_login", "score__id")
+        count = 0
+        for chunk in itertools.batched(
+            rows.iterator(chunk_size=settings.SCORES_CHUNK_SIZE),
+            settings.SCORES_CHUNK_SIZE,
+        ):
+            count += cls._calculate_chunk(chunk)
+        return count
+
+    @classmethod
+    def _calculate_chunk(cls, rows: list[tuple]) -> int:
+        skill_model = ProjectUser._meta.get_field("skills").related_model
+        skills_levels = set(
+            skill_model.objects.filter(
+                user_id__in=[row[0] for row in rows], level__in=[3, 4]
+            )
+            .values_list("user_id", "level")
+            .distinct()
+        )
+        created, updated = [], []
+        for user_id, job, description, last_login, score_id in rows:
+            description = description or ""
+            score = cls(
+                id=score_id,
+                user_id=user_id,
+                completeness=cls.compute_completeness(
+                    has_job=bool(job),
+                    has_expert_skills=(user_id, 4) in skills_levels,
+                    has_competent_skills=(user_id, 3) in skills_levels,
+                    has_rich_content="<img" in description or "<iframe" in description,
+                    description_length=len(description),
+                ),
+                activity=cls.compute_activity(last_login),
+            )
+            score.score = score.completeness + score.activity
+            (updated if score_id else created).append(score)
+        cls.objects.bulk_create(created)
+        cls.objects.bulk_update(updated, ["score", "completeness", "activity"])
+        return len(rows)
+
 
 class PrivacySettings(models.Model, HasOwner):
     class PrivacyChoices(models.TextChoices):
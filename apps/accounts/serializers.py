@@ -21,7 +21,7 @@ from apps.commons.serializers import (
     StringsImagesSerializer,
 )
 from apps.files.models import Image
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.modules.serializers import ModulesSerializers
 from apps.notifications.models import Notification
 from apps.organizations.models import Organization
@@ -65,6 +65,20 @@ class PrivacySettingsSerializer(serializers.ModelSerializer):
         ]
 
 
+class ProfilePictureSerializerMixin:
+    """
+    Resolve the urls of the users' profile pictures in bulk with the other images of
+    a list, they are serialized in a method field to apply the privacy settings.
+    """
+
+    def get_serialized_images(self, instances: list[ProjectUser]) -> list[Image]:
+        return [
+            user.profile_picture
+            for user in instances
+            if getattr(user, "profile_picture", None) is not None
+        ]
+
+
 @auto_translated
 class UserAdminListSerializer(serializers.ModelSerializer):
     current_org_role = serializers.CharField(required=False, read_only=True)
@@ -104,7 +118,7 @@ class UserAdminListSerializer(serializers.ModelSerializer):
 
 
 @auto_translated
-class UserLighterSerializer(serializers.ModelSerializer):
+class UserLighterSerializer(ProfilePictureSerializerMixin, serializers.ModelSerializer):
     email = PrivacySettingProtectedEmailField(
         privacy_field="email", required=False, allow_blank=True
     )
@@ -115,6 +129,7 @@ class UserLighterSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ProjectUser
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "slug",
@@ -147,7 +162,7 @@ class UserLighterSerializer(serializers.ModelSerializer):
 
 
 @auto_translated
-class UserLightSerializer(serializers.ModelSerializer):
+class UserLightSerializer(ProfilePictureSerializerMixin, serializers.ModelSerializer):
     email = PrivacySettingProtectedEmailField(
         privacy_field="email", required=False, allow_blank=True
     )
@@ -165,6 +180,7 @@ class UserLightSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ProjectUser
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "slug",
@@ -295,6 +311,7 @@ class PeopleGroupLightSerializer(
 
     class Meta:
         model = PeopleGroup
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = ["organization", "is_root", "publication_status"]
         fields = read_only_fields + [
             "id",
@@ -331,6 +348,7 @@ class PeopleGroupHierarchySerializer(
 
     class Meta:
         model = PeopleGroup
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "slug",
@@ -603,6 +621,7 @@ class PeopleGroupSerializer(
 
     class Meta:
         model = PeopleGroup
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = ["is_root", "slug", "modules"]
         fields = read_only_fields + [
             "id",
@@ -626,6 +645,7 @@ class PeopleGroupSerializer(
 @extend_schema_serializer(exclude_fields=("roles",))
 @auto_translated
 class UserSerializer(
+    ProfilePictureSerializerMixin,
     StringsImagesSerializer,
     serializers.ModelSerializer,
 ):
@@ -733,6 +753,7 @@ class UserSerializer(
 
     class Meta:
         model = ProjectUser
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "slug",
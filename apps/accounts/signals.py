@@ -1,7 +1,11 @@
-from django.db.models.signals import post_save, pre_delete
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from apps.accounts.models import PeopleGroup, PrivacySettings
+from apps.accounts.models import PeopleGroup, PrivacySettings, ProjectUser
+from apps.accounts.utils import invalidate_user_visibility
+from apps.modules.base import invalidate_modules_count
+from apps.projects.models import Project
 
 
 @receiver(post_save, sender="accounts.ProjectUser")
@@ -27,3 +31,104 @@ def delete_people_group_roles(sender, instance, **kwargs):
 def change_people_group_children_parent(sender, instance, **kwargs):
     """Change the parent of the children groups."""
     instance.children.update(parent=instance.parent)
+
+
+def _invalidate_groups_users_visibility(group_ids):
+    invalidate_user_visibility(
+        ProjectUser.objects.filter(groups__in=group_ids)
+        .values_list("id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(m2m_changed, sender=ProjectUser.groups.through)
+def invalidate_user_groups_visibility(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the visibility set of the users whose groups changed."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        invalidate_user_visibility([instance.pk])
+    elif pk_set is not None:
+        invalidate_user_visibility(pk_set)
+    else:
+        invalidate_user_visibility()
+
+
+def _invalidate_groups_modules_count(group_ids):
+    invalidate_modules_count(
+        Project,
+        Project.objects.filter(groups__in=group_ids)
+        .values_list("id", flat=True)
+        .distinct(),
+    )
+    invalidate_modules_count(
+        PeopleGroup,
+        PeopleGroup.objects.filter(groups__in=group_ids)
+        .values_list("id", flat=True)
+        .distinct(),
+    )
+
+
+@receiver(m2m_changed, sender=ProjectUser.groups.through)
+@receiver(m2m_changed, sender=PeopleGroup.groups.through)
+def invalidate_members_modules_count(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the cached members counts of the projects and groups changed."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if reverse:
+        _invalidate_groups_modules_count([instance.pk])
+        if sender is PeopleGroup.groups.through:
+            # The removed people groups are not linked to the group anymore
+            invalidate_modules_count(PeopleGroup, pk_set)
+    elif pk_set is not None:
+        _invalidate_groups_modules_count(pk_set)
+    else:
+        invalidate_modules_count(Project)
+        invalidate_modules_count(PeopleGroup)
+
+
+@receiver(m2m_changed, sender=PeopleGroup.featured_projects.through)
+def invalidate_featured_projects_modules_count(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the cached featured projects counts of the groups changed."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        invalidate_modules_count(PeopleGroup, [instance.pk])
+    elif pk_set is not None:
+        invalidate_modules_count(PeopleGroup, pk_set)
+    else:
+        invalidate_modules_count(PeopleGroup)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions_visibility(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the visibility set of the users whose global permissions changed."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        _invalidate_groups_users_visibility([instance.pk])
+    elif pk_set is not None:
+        _invalidate_groups_users_visibility(pk_set)
+    else:
+        invalidate_user_visibility()
+
+
+@receiver(post_save, sender="guardian.GroupObjectPermission")
+@receiver(post_delete, sender="guardian.GroupObjectPermission")
+def invalidate_group_object_permissions_visibility(sender, instance, **kwargs):
+    """Invalidate the visibility set of the users whose object permissions changed."""
+    _invalidate_groups_users_visibility([instance.group_id])
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_deleted_group_visibility(sender, instance, **kwargs):
+    """Invalidate the visibility set of the users of a deleted group."""
+    _invalidate_groups_users_visibility([instance.pk])
@@ -8,24 +8,10 @@ from .models import ProjectUser, UserScore
 @app.task(name="apps.accounts.tasks.calculate_users_scores")
 @clear_memory
 def calculate_users_scores():
-    """calculate users scores, get all projectsUser, calculate scores
-    next we update all user/score during a bulk_update
+    """calculate users scores with grouped queries,
+    next we create or update all users scores during bulk operations
     """
-    bulk_update: list[UserScore] = []
-    bulk_create: list[UserScore] = []
-
-    for user in (
-        ProjectUser.objects.select_related("score").prefetch_related("skills").all()
-    ):
-        user.calculate_score()
-        if user.score.pk:
-            bulk_update.append(user.score)
-        else:
-            bulk_create.append(user.score)
-
-    # update or creates scores
-    UserScore.objects.bulk_create(bulk_create)
-    UserScore.objects.bulk_update(bulk_update, ["score", "completeness", "activity"])
+    UserScore.calculate_scores()
 
 
 @app.task(name="apps.accounts.tasks.send_email_to_user")
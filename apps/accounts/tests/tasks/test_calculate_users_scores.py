@@ -0,0 +1,25 @@
+from apps.accounts.factories import UserFactory
+from apps.accounts.models import UserScore
+from apps.accounts.tasks import calculate_users_scores
+from apps.commons.test import JwtAPITestCase
+from apps.skills.factories import SkillFactory
+
+
+class CalculateUsersScoresTestCase(JwtAPITestCase):
+    def test_calculate_users_scores(self):
+        expert = UserFactory(description='<iframe src="video"></iframe>')
+        SkillFactory(user=expert, level=4)
+        SkillFactory(user=expert, level=2)
+        competent = UserFactory(job="")
+        SkillFactory(user=competent, level=3)
+        UserScore.objects.create(user=competent, score=-1)
+        users = [expert, competent, UserFactory()]
+
+        calculate_users_scores()
+        for user in users:
+            user.refresh_from_db()
+            score = UserScore.objects.get(user=user)
+            expected = UserScore(user=user).set_score()
+            self.assertAlmostEqual(score.completeness, expected.completeness)
+            self.assertAlmostEqual(score.activity, expected.activity)
+            self.assertAlmostEqual(score.score, expected.score)
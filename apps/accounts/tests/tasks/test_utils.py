@@ -1,7 +1,9 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-from apps.accounts.factories import PeopleGroupFactory
-from apps.accounts.utils import get_instance_from_group
+from apps.accounts.factories import PeopleGroupFactory, UserFactory
+from apps.accounts.models import ProjectUser
+from apps.accounts.utils import get_instance_from_group, get_user_visibility
 from apps.organizations.factories import OrganizationFactory
 from apps.projects.factories import ProjectFactory
 
@@ -62,3 +64,37 @@ class GetInstanceFromGroupTestCase(TestCase):
         ]:
             instance = get_instance_from_group(group)
             self.assertIsNone(instance)
+
+
+@override_settings(
+    ENABLE_CACHE=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class UserVisibilityTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = OrganizationFactory()
+        cls.project = ProjectFactory(organizations=[cls.organization])
+        cls.user = UserFactory()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get_visibility(self):
+        # Reload the user to bypass the visibility memoized on the instance
+        return get_user_visibility(ProjectUser.objects.get(pk=self.user.pk))
+
+    def test_visibility_invalidated_on_groups_change(self):
+        self.assertNotIn(self.project.pk, self.get_visibility()["projects"])
+        self.user.groups.add(self.project.get_members())
+        self.assertIn(self.project.pk, self.get_visibility()["projects"])
+        self.project.get_members().users.remove(self.user)
+        self.assertNotIn(self.project.pk, self.get_visibility()["projects"])
+
+    def test_visibility_invalidated_on_organization_role(self):
+        visibility = self.get_visibility()
+        self.assertNotIn(self.organization.pk, visibility["project_organizations"])
+        self.user.groups.add(self.organization.get_admins())
+        visibility = self.get_visibility()
+        self.assertIn(self.organization.pk, visibility["project_organizations"])
@@ -1,6 +1,7 @@
 import json
 from base64 import b64decode
-from typing import Any
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
 
 import jwt
 from cryptography.hazmat.primitives import serialization
@@ -8,11 +9,18 @@ from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import QuerySet
 from googleapiclient.errors import HttpError
-from guardian.shortcuts import assign_perm, get_group_perms
+from guardian.shortcuts import assign_perm, get_group_perms, get_objects_for_user
 from keycloak import KeycloakError
 from rest_framework.request import Request
 
+from apps.commons.cache import (
+    get_cache_versions,
+    get_or_set_cache,
+    invalidate_cache_tag,
+)
 from apps.commons.mixins import HasPermissionsSetup
 from apps.commons.models import GroupData
 
@@ -23,6 +31,24 @@ from .exceptions import (
     TokenPrefixMissingError,
 )
 
+if TYPE_CHECKING:
+    from apps.accounts.models import ProjectUser
+
+# Permissions expanded in the visibility set of a user, by visibility set key
+USER_VISIBILITY_PERMISSIONS = {
+    "org_project_organizations": "organizations.view_org_project",
+    "project_organizations": "organizations.view_project",
+    "projects": "projects.view_project",
+    "org_user_organizations": "organizations.view_org_projectuser",
+    "user_organizations": "organizations.view_projectuser",
+    "org_people_group_organizations": "organizations.view_org_peoplegroup",
+    "people_group_organizations": "organizations.view_peoplegroup",
+    "people_groups": "accounts.view_peoplegroup",
+    "news_organizations": "organizations.view_news",
+    "instruction_organizations": "organizations.view_instruction",
+    "event_organizations": "organizations.view_event",
+}
+
 
 def decode_token(request: Request) -> dict[str, Any] | None:
     """Decode the request's JWT token."""
@@ -155,3 +181,68 @@ def account_sync_errors_handler(
         return wrapper
 
     return decorator
+
+
+def compute_user_visibility(user: "ProjectUser") -> dict[str, QuerySet]:
+    """
+    Expand the permissions of a user into the ids used to filter the objects they
+    can see.
+
+    The returned querysets are lazy, they are evaluated by `get_user_visibility`
+    when the result is cached.
+    """
+    from apps.accounts.models import PeopleGroup
+
+    return {
+        "groups": user.groups.values_list("id", flat=True),
+        "member_people_groups": PeopleGroup.objects.filter(
+            groups__users=user
+        ).values_list("id", flat=True),
+        **{
+            key: get_objects_for_user(user, permission).values_list("pk", flat=True)
+            for key, permission in USER_VISIBILITY_PERMISSIONS.items()
+        },
+    }
+
+
+def _get_user_visibility_key(user_id: int, version: int) -> str:
+    return f"user_visibility.{version}.{user_id}"
+
+
+def get_user_visibility(
+    user: "ProjectUser",
+) -> dict[str, list[int | str] | QuerySet]:
+    """
+    Return the visibility set of a user.
+
+    The visibility set is cached until the groups of the user or the permissions of
+    these groups change. If the cache is disabled, the lazy querysets are returned
+    and used as subqueries.
+    """
+    if not settings.ENABLE_CACHE:
+        return compute_user_visibility(user)
+    (version,) = get_cache_versions("user_visibility")
+    return get_or_set_cache(
+        _get_user_visibility_key(user.pk, version),
+        "user_visibility",
+        lambda: {
+            key: list(value) for key, value in compute_user_visibility(user).items()
+        },
+        settings.CACHE_USER_VISIBILITY_TTL,
+    )
+
+
+def invalidate_user_visibility(user_ids: Iterable[int] | None = None):
+    """
+    Invalidate the visibility sets of the given users, or of all the users if no
+    ids are given.
+    """
+    if not settings.ENABLE_CACHE:
+        return
+    if user_ids is None:
+        invalidate_cache_tag("user_visibility")
+        return
+    (version,) = get_cache_versions("user_visibility")
+    cache.delete_many(
+        [_get_user_visibility_key(user_id, version) for user_id in user_ids]
+    )
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.organizations.models import Organization
 from apps.projects.models import Project
 from apps.skills.models import Tag
@@ -15,6 +15,7 @@ class StatsOrganizationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Organization
+        list_serializer_class = ImageUrlsListSerializer
         fields = [
             "id",
             "background_color",
@@ -6,7 +6,7 @@ from apps.commons.serializers import (
     ProjectRelatedSerializer,
     StringsImagesSerializer,
 )
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.organizations.models import Organization
 from apps.projects.models import Project
 from services.translator.serializers import auto_translated
@@ -20,6 +20,7 @@ class ProjectAnnouncementSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
+        list_serializer_class = ImageUrlsListSerializer
         fields = [
             "id",
             "title",
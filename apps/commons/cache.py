@@ -1,19 +1,90 @@
+import time
+from functools import wraps
+from typing import Any
+
 from django.conf import settings
 from django.core.cache import cache
 from django.db import models
+from prometheus_client import Counter
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+# Sentinel used to differentiate a cache miss from a cached `None` value
+CACHE_MISS = object()
+
+cache_hits = Counter(
+    "projects_cache_hits_total", "Number of cache hits.", ["key_prefix"]
+)
+cache_misses = Counter(
+    "projects_cache_misses_total", "Number of cache misses.", ["key_prefix"]
+)
+
+
+def _get_version_key(tag: str) -> str:
+    return f"cache_version.{tag}"
+
+
+def get_cache_versions(*tags: str) -> list[int]:
+    """
+    Return the current version of each given tag in a single cache round trip.
+
+    Cached values are stored under keys containing the versions of their tags, so
+    incrementing a version invalidates all the related keys without scanning the
+    keyspace. Stale keys are left to expire with their timeout.
+    """
+    keys = [_get_version_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Use a timestamp so that a version evicted from the cache can't be
+            # reused by stale keys.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key, 0)
+    return [versions[key] for key in keys]
+
+
+def invalidate_cache_tag(tag: str):
+    """Invalidate all the keys cached under the given tag."""
+    key = _get_version_key(tag)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def get_or_set_cache(
+    key: str, key_prefix: str, func, timeout: int | None = None
+) -> Any:
+    """
+    Return the value cached under `key`, or compute it with `func` and cache it.
+    """
+    value = cache.get(key, CACHE_MISS)
+    if value is not CACHE_MISS:
+        cache_hits.labels(key_prefix=key_prefix).inc()
+        return value
+    cache_misses.labels(key_prefix=key_prefix).inc()
+    value = func()
+    if timeout is None:
+        cache.set(key, value)
+    else:
+        cache.set(key, value, timeout)
+    return value
+
 
 def redis_cache_view(
     key_prefix: str = "cache", timeout: int = 60 * settings.CACHE_DEFAULT_TTL
 ):
     def decorator(func):
+        @wraps(func)
         def wrapper(request, *args, **kwargs):
             if settings.ENABLE_CACHE:
-                key = f"{key_prefix}.{request.build_absolute_uri()}"
-                if key in cache.keys("*"):  # noqa: SIM118
-                    return Response(cache.get(key))
+                (version,) = get_cache_versions(key_prefix)
+                key = f"{key_prefix}.{version}.{request.build_absolute_uri()}"
+                data = cache.get(key, CACHE_MISS)
+                if data is not CACHE_MISS:
+                    cache_hits.labels(key_prefix=key_prefix).inc()
+                    return Response(data)
+                cache_misses.labels(key_prefix=key_prefix).inc()
                 response = func(request, *args, **kwargs)
                 cache.set(key, response.data, timeout)
                 return response
@@ -26,9 +97,10 @@ def redis_cache_view(
 
 def clear_cache_with_key(key_prefix: str):
     def decorator(func):
+        @wraps(func)
         def wrapper(request, *args, **kwargs):
             if request.method != "GET" and settings.ENABLE_CACHE:
-                cache.delete_many(cache.keys(f"{key_prefix}*"))
+                invalidate_cache_tag(key_prefix)
             return func(request, *args, **kwargs)
 
         return wrapper
@@ -38,14 +110,19 @@ def clear_cache_with_key(key_prefix: str):
 
 def redis_cache_model_method(key_suffix: str):
     def decorator(func):
+        @wraps(func)
         def wrapper(instance, *args, **kwargs):
             if settings.ENABLE_CACHE:
-                key = f"{instance.__class__.__name__}.{instance.pk}.{key_suffix}"
-                if key in cache.keys("*"):  # noqa: SIM118
-                    return cache.get(key)
-                response = func(instance, *args, **kwargs)
-                cache.set(key, response)
-                return response
+                instance_tag = f"{instance.__class__.__name__}.{instance.pk}"
+                versions = get_cache_versions(
+                    instance_tag, f"{instance_tag}.{key_suffix}"
+                )
+                key = f"{instance_tag}.{'.'.join(map(str, versions))}.{key_suffix}"
+                return get_or_set_cache(
+                    key,
+                    instance.__class__.__name__,
+                    lambda: func(instance, *args, **kwargs),
+                )
             return func(instance, *args, **kwargs)
 
         return wrapper
@@ -54,26 +131,29 @@ def redis_cache_model_method(key_suffix: str):
 
 
 def clear_redis_cache_model_method(instance: models.Model, key_suffix: str = ""):
+    """
+    Clear the cached methods of the instance, or only the method cached under
+    `key_suffix` if given.
+    """
     if settings.ENABLE_CACHE:
-        cache.delete_many(
-            cache.keys(f"{instance.__class__.__name__}.{instance.pk}.{key_suffix}*")
-        )
+        tag = f"{instance.__class__.__name__}.{instance.pk}"
+        invalidate_cache_tag(f"{tag}.{key_suffix}" if key_suffix else tag)
 
 
 def redis_cache_viewset_method(
     key_prefix: str, timeout: int = 60 * settings.CACHE_DEFAULT_TTL
 ):
     def decorator(func):
+        @wraps(func)
         def wrapper(view: GenericViewSet, *args, **kwargs):
             if settings.ENABLE_CACHE:
                 user = view.request.user.id
                 uri = view.request.build_absolute_uri()
-                key = f"{key_prefix}.{user}.{uri}"
-                if key in cache.keys("*"):  # noqa: SIM118
-                    return cache.get(key)
-                response = func(view, *args, **kwargs)
-                cache.set(key, response, timeout)
-                return response
+                (version,) = get_cache_versions(key_prefix)
+                key = f"{key_prefix}.{version}.{user}.{uri}"
+                return get_or_set_cache(
+                    key, key_prefix, lambda: func(view, *args, **kwargs), timeout
+                )
             return func(view, *args, **kwargs)
 
         return wrapper
@@ -0,0 +1,187 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from faker import Faker
+
+from apps.accounts.factories import PeopleGroupFactory, UserFactory
+from apps.accounts.models import PeopleGroup, PrivacySettings, ProjectUser
+from apps.newsfeed.factories import EventFactory, InstructionFactory, NewsFactory
+from apps.newsfeed.utils import init_newsfeed
+from apps.organizations.factories import OrganizationFactory
+from apps.organizations.models import Organization
+from apps.projects.factories import BlogEntryFactory, ProjectFactory
+from apps.projects.models import Project
+from apps.skills.factories import SkillFactory, TagFactory
+
+faker = Faker()
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Seed a synthetic organization for load testing and write the fixture used "
+        "by `load-testing/locustfile_local.py`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            "-o",
+            type=str,
+            default="LOADTEST",
+            help="Organization code.",
+        )
+        parser.add_argument(
+            "--users", type=int, default=500, help="Number of users to create."
+        )
+        parser.add_argument(
+            "--projects", type=int, default=1000, help="Number of projects to create."
+        )
+        parser.add_argument(
+            "--groups",
+            type=int,
+            default=50,
+            help="Number of people groups to create.",
+        )
+        parser.add_argument(
+            "--news", type=int, default=100, help="Number of news to create."
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the random generators."
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default="load-testing/fixture.json",
+            help="Path of the fixture file.",
+        )
+
+    def create_users(
+        self, organization: Organization, count: int
+    ) -> dict[str, list[ProjectUser]]:
+        tags = TagFactory.create_batch(size=50, organization=organization)
+        users = {
+            "admin": UserFactory.create_batch(
+                size=max(1, count // 100), groups=[organization.get_admins()]
+            ),
+            "facilitator": UserFactory.create_batch(
+                size=max(1, count // 50), groups=[organization.get_facilitators()]
+            ),
+            "user": [],
+        }
+        for _ in range(count - len(users["admin"]) - len(users["facilitator"])):
+            user = UserFactory(
+                groups=[organization.get_users()],
+                publication_status=random.choice(  # nosec B311
+                    PrivacySettings.PrivacyChoices.values
+                ),
+            )
+            for tag in random.sample(tags, k=random.randint(0, 5)):  # nosec B311
+                SkillFactory(user=user, tag=tag)
+            users["user"].append(user)
+        return users
+
+    def create_people_groups(
+        self, organization: Organization, users: list[ProjectUser], count: int
+    ) -> list[PeopleGroup]:
+        root_people_group = PeopleGroup.update_or_create_root(organization)
+        people_groups = []
+        for _ in range(count):
+            people_group = PeopleGroupFactory(
+                organization=organization,
+                parent=random.choice([root_people_group, *people_groups]),  # nosec
+                publication_status=random.choice(  # nosec B311
+                    PeopleGroup.PublicationStatus.values
+                ),
+            )
+            members = random.sample(users, k=min(len(users), 20))
+            people_group.managers.add(members[0])
+            people_group.members.add(*members[1:])
+            people_groups.append(people_group)
+        return people_groups
+
+    def create_projects(
+        self, organization: Organization, users: list[ProjectUser], count: int
+    ) -> list[Project]:
+        projects = []
+        for _ in range(count):
+            project = ProjectFactory(
+                organizations=[organization],
+                publication_status=random.choice(  # nosec B311
+                    Project.PublicationStatus.values
+                ),
+            )
+            members = random.sample(users, k=min(len(users), 5))
+            project.owners.add(members[0])
+            project.members.add(*members[1:])
+            for _ in range(random.randint(0, 3)):  # nosec B311
+                BlogEntryFactory(project=project)
+            projects.append(project)
+        return projects
+
+    def create_newsfeed(
+        self,
+        organization: Organization,
+        people_groups: list[PeopleGroup],
+        count: int,
+    ):
+        now = timezone.localtime(timezone.now())
+        for i in range(count):
+            date = now - timezone.timedelta(hours=i)
+            NewsFactory(
+                organization=organization,
+                publication_date=date,
+                visible_by_all=random.random() < 0.5,  # nosec B311
+                people_groups=random.sample(  # nosec B311
+                    people_groups, k=min(len(people_groups), 2)
+                ),
+            )
+            InstructionFactory(organization=organization, publication_date=date)
+            EventFactory(organization=organization, start_date=date)
+        init_newsfeed()
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        faker.seed_instance(options["seed"])
+        organization = OrganizationFactory(code=options["organization"])
+        users = self.create_users(organization, options["users"])
+        all_users = [user for role_users in users.values() for user in role_users]
+        self.stdout.write(self.style.SUCCESS(f"{len(all_users)} users created."))
+        people_groups = self.create_people_groups(
+            organization, all_users, options["groups"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(people_groups)} people groups created.")
+        )
+        projects = self.create_projects(organization, all_users, options["projects"])
+        self.stdout.write(self.style.SUCCESS(f"{len(projects)} projects created."))
+        self.create_newsfeed(organization, people_groups, options["news"])
+        self.stdout.write(self.style.SUCCESS("Newsfeed items created."))
+
+        fixture = {
+            "organization": organization.code,
+            "users": {
+                role: [
+                    {
+                        "id": user.id,
+                        "keycloak_id": str(user.keycloak_account.keycloak_id),
+                    }
+                    for user in role_users
+                ]
+                for role, role_users in users.items()
+            },
+            "people_groups": [people_group.slug for people_group in people_groups],
+            "projects": [project.slug for project in projects],
+            "search_terms": sorted(
+                {
+                    word
+                    for project in random.sample(projects, k=min(len(projects), 50))
+                    for word in project.title.split()
+                    if len(word) > 3
+                }
+            ),
+        }
+        with open(options["output"], "w") as f:
+            json.dump(fixture, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Fixture written to {options['output']}"))
@@ -4,6 +4,7 @@ from copy import copy
 from functools import cached_property
 from typing import TYPE_CHECKING, Any, Optional, Self
 
+from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q, QuerySet
@@ -311,6 +312,21 @@ class DuplicableModel:
         instance_copy.save()
         return instance_copy
 
+    def clone(self, **fields) -> Self:
+        """
+        Return an unsaved copy of the instance with the given fields changed, to
+        duplicate many instances with a single `bulk_create`.
+        """
+        values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+        }
+        for name, value in fields.items():
+            values.pop(self._meta.get_field(name).attname, None)
+            values[name] = value
+        return type(self)(**values)
+
 
 class HasMultipleIDs:
     """
@@ -487,9 +503,9 @@ class HasEmbedding:
             vector = self.embedding.embedding
             model_embedding = type(self).embedding.related.related_model
             queryset = type(self).objects.all()
-            return model_embedding.vector_search(vector, queryset, threshold).exclude(
-                pk=self.pk
-            )
+            return model_embedding.vector_search(
+                vector, queryset, threshold, limit=settings.VECTOR_SEARCH_CANDIDATES
+            ).exclude(pk=self.pk)
         return type(self).objects.none()
 
 
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.commons.cache import (
+    cache_hits,
+    cache_misses,
+    clear_redis_cache_model_method,
+    invalidate_cache_tag,
+    redis_cache_model_method,
+    redis_cache_viewset_method,
+)
+from apps.commons.test import JwtAPITestCase
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+class CachedModel:
+    def __init__(self, pk: int):
+        self.pk = pk
+        self.calls = 0
+
+    @redis_cache_model_method("value")
+    def get_value(self):
+        self.calls += 1
+        return None
+
+
+class CachedViewSet:
+    def __init__(self, uri: str):
+        self.request = SimpleNamespace(
+            user=SimpleNamespace(id=1), build_absolute_uri=lambda: uri
+        )
+        self.calls = 0
+
+    @redis_cache_viewset_method("test_cache_viewset")
+    def get_value(self):
+        self.calls += 1
+        return self.calls
+
+
+@override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES)
+class RedisCacheTestCase(JwtAPITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_cached_none_is_a_hit(self):
+        instance = CachedModel(1)
+        hits = cache_hits.labels(key_prefix="CachedModel")._value.get()
+        misses = cache_misses.labels(key_prefix="CachedModel")._value.get()
+        self.assertIsNone(instance.get_value())
+        self.assertIsNone(instance.get_value())
+        self.assertEqual(instance.calls, 1)
+        self.assertEqual(
+            cache_hits.labels(key_prefix="CachedModel")._value.get(), hits + 1
+        )
+        self.assertEqual(
+            cache_misses.labels(key_prefix="CachedModel")._value.get(), misses + 1
+        )
+
+    def test_clear_model_method(self):
+        instance = CachedModel(2)
+        instance.get_value()
+        clear_redis_cache_model_method(instance, "value")
+        instance.get_value()
+        self.assertEqual(instance.calls, 2)
+        clear_redis_cache_model_method(instance)
+        instance.get_value()
+        self.assertEqual(instance.calls, 3)
+
+    def test_invalidate_tag(self):
+        view = CachedViewSet("http://testserver/recommendations/")
+        self.assertEqual(view.get_value(), 1)
+        self.assertEqual(view.get_value(), 1)
+        invalidate_cache_tag("test_cache_viewset")
+        self.assertEqual(view.get_value(), 2)
+
+    def test_invalidate_evicted_tag(self):
+        view = CachedViewSet("http://testserver/recommendations/")
+        self.assertEqual(view.get_value(), 1)
+        cache.delete("cache_version.test_cache_viewset")
+        invalidate_cache_tag("test_cache_viewset")
+        self.assertEqual(view.get_value(), 2)
@@ -0,0 +1,48 @@
+import re
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from projects.middlewares import QueryRecorder
+
+SQL_TIMING = re.compile(r'sql;dur=[\d.]+;desc="(\d+) queries"')
+
+
+@override_settings(
+    MIDDLEWARE=["projects.middlewares.QueryCountMiddleware", *settings.MIDDLEWARE]
+)
+class QueryCountMiddlewareTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.user = UserFactory()
+
+    @patch("projects.middlewares.logger")
+    def test_server_timing_header(self, mocked_logger):
+        response = self.client.get(reverse("ProjectUser-detail", args=(self.user.id,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        match = SQL_TIMING.search(response.headers["Server-Timing"])
+        self.assertIsNotNone(match)
+        self.assertGreater(int(match.group(1)), 0)
+        extra = mocked_logger.log.call_args.kwargs["extra"]
+        self.assertEqual(extra["view"], "ProjectUser-detail")
+        self.assertEqual(extra["query_count"], int(match.group(1)))
+
+
+class QueryRecorderTestCase(JwtAPITestCase):
+    def test_duplicates(self):
+        recorder = QueryRecorder()
+        recorder.queries = [
+            ("SELECT * FROM a WHERE id IN (%s, %s)", 0.1),
+            ("SELECT * FROM a WHERE id IN (%s, %s, %s)", 0.3),
+            ("SELECT * FROM b WHERE id = %s", 0.2),
+        ]
+        self.assertDictEqual(
+            recorder.get_duplicates(), {"SELECT * FROM a WHERE id IN (%s, ...)": 2}
+        )
+        self.assertEqual(recorder.get_slowest(1), [recorder.queries[1]])
@@ -3,6 +3,7 @@ import gc
 import html
 import io
 import itertools
+import re
 import uuid
 from contextlib import suppress
 from typing import TYPE_CHECKING, Optional
@@ -96,6 +97,30 @@ def remove_images_text(text: str, unescape=True) -> str:
     return str(soup)
 
 
+def replace_many(text: str | None, replacements: dict[str, str]) -> str | None:
+    """Replace all the given substrings of a text in a single pass.
+
+    Parameters
+    ----------
+    text : str, optional
+        The text to process.
+    replacements : dict[str, str]
+        The new values of the substrings to replace.
+
+    Returns
+    -------
+    str, optional
+        The text with the substrings replaced.
+    """
+    if not text or not replacements:
+        return text
+    # Longest substrings first, so a substring doesn't shadow a longer one
+    pattern = re.compile(
+        "|".join(map(re.escape, sorted(replacements, key=len, reverse=True)))
+    )
+    return pattern.sub(lambda match: replacements[match.group(0)], text)
+
+
 def process_text(
     text: str,
     instance: Model | None = None,
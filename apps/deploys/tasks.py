@@ -7,6 +7,7 @@ from apps.accounts.utils import (
     get_default_group_permissions,
     get_superadmins_group,
     get_superadmins_group_permissions,
+    invalidate_user_visibility,
 )
 from apps.commons.models import GroupData
 from apps.commons.utils import clear_memory
@@ -93,6 +94,7 @@ def reassign_projects_permissions():
             (GroupData.Role.MEMBER_GROUPS, members_permissions),
         )
     )
+    invalidate_user_visibility()
 
 
 @app.task(name="apps.deploys.tasks.reassign_people_groups_permissions")
@@ -108,6 +110,7 @@ def reassign_people_groups_permissions():
             (GroupData.Role.MEMBERS, members_permissions),
         )
     )
+    invalidate_user_visibility()
 
 
 @app.task(name="apps.deploys.tasks.reassign_organizations_permissions")
@@ -131,3 +134,4 @@ def reassign_organizations_permissions():
             organization.get_admins(),
             organization.get_global_admins_permissions(),
         )
+    invalidate_user_visibility()
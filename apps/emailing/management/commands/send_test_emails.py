@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from apps.emailing.utils import queue_emails, send_emails
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Send test emails by batches over single SMTP connections, e.g. to a local "
+        "debugging SMTP server like Mailpit, and report the throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, default=100, help="Number of emails to send."
+        )
+        parser.add_argument(
+            "--to", default="test@example.com", help="Recipient of the emails."
+        )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Send the batches with Celery tasks instead of this process.",
+        )
+
+    def handle(self, *args, **options):
+        messages = [
+            {
+                "subject": f"Test email {i + 1}/{options['count']}",
+                "text_content": "This is a test email.",
+                "to": [options["to"]],
+                "html_content": "<p>This is a test email.</p>",
+            }
+            for i in range(options["count"])
+        ]
+        if options["queue"]:
+            count = queue_emails(messages)
+            self.stdout.write(f"{count} emails queued.")
+            return
+
+        start = time.perf_counter()
+        not_sent = 0
+        for i in range(0, len(messages), settings.EMAIL_BATCH_SIZE):
+            not_sent += len(send_emails(messages[i : i + settings.EMAIL_BATCH_SIZE]))
+        duration = time.perf_counter() - start
+        sent = len(messages) - not_sent
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sent} emails sent in {duration:.2f}s "
+                f"({sent / duration:.1f} emails/s), {not_sent} not sent after a "
+                "connection error."
+            )
+        )
@@ -1,8 +1,12 @@
+import logging
+
 from django.conf import settings
 
 from projects.celery import app
 
-from .utils import send_email
+from .utils import emails_failed, send_email, send_emails
+
+logger = logging.getLogger(__name__)
 
 
 @app.task(name="apps.emailing.tasks.send_email_task")
@@ -16,3 +20,25 @@ def send_email_task(
     cc: list[str] | None = None,
 ):
     send_email(subject, text_content, to, from_email, html_content, reply_to, cc)
+
+
+@app.task(
+    name="apps.emailing.tasks.send_emails_task",
+    bind=True,
+    max_retries=settings.EMAIL_BATCH_MAX_RETRIES,
+)
+def send_emails_task(self, messages: list[dict]):
+    """
+    Send a batch of emails over a single SMTP connection, and retry the messages
+    that could not be sent with an exponential backoff.
+    """
+    remaining = send_emails(messages)
+    if remaining:
+        if self.request.retries >= self.max_retries:
+            emails_failed.inc(len(remaining))
+            logger.error("%s emails could not be sent", len(remaining))
+            return
+        raise self.retry(
+            args=(remaining,),
+            countdown=settings.EMAIL_BATCH_RETRY_DELAY * 2**self.request.retries,
+        )
@@ -0,0 +1,69 @@
+import smtplib
+from unittest.mock import MagicMock, patch
+
+from django.core import mail
+from django.test import override_settings
+
+from apps.commons.test import JwtAPITestCase
+from apps.emailing import tasks
+from apps.emailing.utils import queue_emails, send_emails
+
+
+class SendEmailsTestCase(JwtAPITestCase):
+    @staticmethod
+    def get_messages(count: int) -> list[dict]:
+        return [
+            {
+                "subject": f"subject {i}",
+                "text_content": f"text {i}",
+                "to": [f"user{i}@example.com"],
+                "html_content": f"<p>text {i}</p>",
+            }
+            for i in range(count)
+        ]
+
+    def test_send_emails(self):
+        messages = self.get_messages(3)
+        remaining = send_emails(messages)
+        self.assertEqual(remaining, [])
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].subject, "subject 0")
+        self.assertEqual(mail.outbox[0].alternatives[0][0], "<p>text 0</p>")
+
+    @patch("apps.emailing.utils.get_connection")
+    def test_send_emails_connection_error(self, mocked_get_connection):
+        connection = MagicMock()
+        connection.__enter__.return_value = connection
+        connection.send_messages.side_effect = [
+            1,
+            smtplib.SMTPRecipientsRefused({}),
+            1,
+            smtplib.SMTPServerDisconnected(),
+        ]
+        mocked_get_connection.return_value = connection
+        messages = self.get_messages(5)
+        remaining = send_emails(messages)
+        # The refused message is skipped, the others are sent again later
+        self.assertEqual(remaining, messages[3:])
+        self.assertEqual(connection.send_messages.call_count, 4)
+        mocked_get_connection.assert_called_once()
+
+    @override_settings(EMAIL_BATCH_SIZE=2)
+    def test_queue_emails(self):
+        messages = self.get_messages(5)
+        with patch.object(tasks.send_emails_task, "delay") as mocked_delay:
+            count = queue_emails(messages)
+        self.assertEqual(count, 5)
+        self.assertEqual(
+            [call.args[0] for call in mocked_delay.call_args_list],
+            [messages[:2], messages[2:4], messages[4:]],
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_queue_emails_single_batch(self):
+        messages = self.get_messages(2)
+        with patch.object(tasks.send_emails_task, "delay") as mocked_delay:
+            count = queue_emails(messages)
+        self.assertEqual(count, 2)
+        mocked_delay.assert_not_called()
+        self.assertEqual(len(mail.outbox), 2)
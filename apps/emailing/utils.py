@@ -1,14 +1,59 @@
+import itertools
 import logging
 import smtplib
+import time
+from collections.abc import Iterable
+from typing import Any
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.exceptions import TemplateDoesNotExist
 from django.template.loader import render_to_string
 from django.utils import translation
+from prometheus_client import Counter, Histogram
 
 logger = logging.getLogger(__name__)
 
+emails_sent = Counter("projects_emails_sent_total", "Number of emails sent.")
+emails_failed = Counter(
+    "projects_emails_failed_total", "Number of emails that could not be sent."
+)
+emails_batch_duration = Histogram(
+    "projects_emails_batch_duration_seconds",
+    "Time spent sending a batch of emails over a single SMTP connection.",
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300),
+)
+
+# Errors raised by the SMTP server for a single message, the other messages can
+# still be sent over the same connection.
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+def build_email(
+    subject: str,
+    text_content: str,
+    to: list[str],
+    from_email: str = settings.EMAIL_HOST_USER,
+    html_content: str | None = None,
+    reply_to: list[str] | None = None,
+    cc: list[str] | None = None,
+) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        subject,
+        text_content,
+        from_email=from_email,
+        to=to,
+        reply_to=reply_to,
+        cc=cc,
+    )
+    if html_content is not None:
+        message.attach_alternative(html_content, "text/html")
+    return message
+
 
 def send_email(
     subject: str,
@@ -20,21 +65,85 @@ def send_email(
     cc: list[str] | None = None,
 ):
     try:
-        message = EmailMultiAlternatives(
-            subject,
-            text_content,
-            from_email=from_email,
-            to=to,
-            reply_to=reply_to,
-            cc=cc,
-        )
-        if html_content is not None:
-            message.attach_alternative(html_content, "text/html")
-        message.send()
+        build_email(
+            subject, text_content, to, from_email, html_content, reply_to, cc
+        ).send()
     except smtplib.SMTPException:
         logger.error("Error while sending email", exc_info=True)
 
 
+def send_emails(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Send emails over a single SMTP connection.
+
+    A message refused by the server is logged and skipped. If the connection
+    fails, the messages that were not sent yet are returned so they can be sent
+    again later.
+
+    Args:
+        - messages (list[dict[str, Any]]): the keyword arguments of `send_email`
+            for each message
+
+    Returns:
+        - list[dict[str, Any]]: the messages that were not sent because of a
+            connection error
+    """
+    index = 0
+    start = time.perf_counter()
+    try:
+        with get_connection() as connection:
+            for index, message in enumerate(messages):
+                try:
+                    connection.send_messages([build_email(**message)])
+                    emails_sent.inc()
+                except MESSAGE_ERRORS:
+                    emails_failed.inc()
+                    logger.error("Error while sending email", exc_info=True)
+            index = len(messages)
+    except (smtplib.SMTPException, OSError):
+        logger.warning(
+            "SMTP connection failed, %s emails not sent",
+            len(messages) - index,
+            exc_info=True,
+        )
+    finally:
+        emails_batch_duration.observe(time.perf_counter() - start)
+    return messages[index:]
+
+
+def queue_emails(messages: Iterable[dict[str, Any]]) -> int:
+    """
+    Send emails by batches of `settings.EMAIL_BATCH_SIZE` messages, each batch
+    using a single SMTP connection.
+
+    A single batch is sent right away, several batches are sent concurrently by
+    the Celery workers. The messages that could not be sent because of a connection
+    error are retried later with an exponential backoff.
+
+    Args:
+        - messages (Iterable[dict[str, Any]]): the keyword arguments of
+            `send_email` for each message
+
+    Returns:
+        - int: the number of queued messages
+    """
+    from .tasks import send_emails_task
+
+    batches = [
+        list(batch) for batch in itertools.batched(messages, settings.EMAIL_BATCH_SIZE)
+    ]
+    if len(batches) == 1:
+        remaining = send_emails(batches[0])
+        if remaining:
+            send_emails_task.apply_async(
+                (remaining,), countdown=settings.EMAIL_BATCH_RETRY_DELAY
+            )
+    else:
+        for batch in batches:
+            send_emails_task.delay(batch)
+    return sum(len(batch) for batch in batches)
+
+
 def send_email_with_attached_file(
     subject: str,
     text_content: str,
@@ -0,0 +1,30 @@
+from django.core.management import BaseCommand
+
+from apps.files.models import Image, PeopleGroupImage
+from apps.files.tasks import render_image_variations
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Render again the variations of the existing images, e.g. after adding a "
+        "format to `settings.IMAGE_VARIATIONS_FORMATS`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Render the variations in this process instead of Celery tasks.",
+        )
+
+    def handle(self, *args, **options):
+        for model in (Image, PeopleGroupImage):
+            queryset = model.objects.exclude(file="")
+            # Until they are rendered, the variations fall back on the original
+            queryset.update(variations_pending=True)
+            for pk in queryset.values_list("pk", flat=True).iterator():
+                if options["sync"]:
+                    render_image_variations(model._meta.label, pk)
+                else:
+                    render_image_variations.delay(model._meta.label, pk)
+            self.stdout.write(f"{model.__name__}: {queryset.count()} images queued.")
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.4 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0005_alter_image_options_peoplegroupimage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="image",
+            name="variations_pending",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="peoplegroupimage",
+            name="variations_pending",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,18 +1,22 @@
 import datetime
 import uuid
+from collections.abc import Iterable
 from contextlib import suppress
+from functools import partial
 from typing import TYPE_CHECKING, Any, Optional, Self
 
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core.exceptions import AzureError
 from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import models, transaction
 from django.db.models import ForeignObjectRel, ImageField, Model, Q, QuerySet
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 from simple_history.models import HistoricalRecords
+from simple_history.utils import bulk_create_with_history
 from stdimage import StdImageField
+from stdimage.models import StdImageFieldFile
 
 from apps.commons.mixins import (
     DuplicableModel,
@@ -24,7 +28,12 @@ from apps.commons.mixins import (
 from services.translator.mixins import HasAutoTranslatedFields
 
 from .enums import AttachmentLinkCategory, AttachmentType
-from .utils import resize_and_autorotate
+from .utils import (
+    copy_files,
+    get_variation_format_name,
+    get_variation_formats,
+    render_variations,
+)
 
 if TYPE_CHECKING:
     from apps.accounts.models import ProjectUser
@@ -211,19 +220,42 @@ class AttachmentFile(
         """Return the project related to this model."""
         return self.project
 
-    def duplicate(self, project: "Project") -> Optional["AttachmentFile"]:
-        with suppress(ResourceNotFoundError):
-            file_path = self.file.name.split("/")
-            file_name = file_path.pop()
-            file_extension = file_name.split(".")[-1]
-            new_name = "/".join([*file_path, f"{uuid.uuid4()}.{file_extension}"])
-            new_file = SimpleUploadedFile(
-                name=new_name,
-                content=self.file.read(),
-                content_type=f"application/{file_extension}",
+    @classmethod
+    def bulk_duplicate(
+        cls, files: Iterable["AttachmentFile"], project: "Project"
+    ) -> list["AttachmentFile"]:
+        """
+        Duplicate attachment files in another project with a single insert, copying
+        the files concurrently in the storage without reading them.
+
+        Args:
+            - files (Iterable[AttachmentFile]): the attachment files to duplicate
+            - project (Project): the project of the copies
+
+        Returns:
+            - list[AttachmentFile]: the copies, without the attachment files whose
+                file doesn't exist anymore
+        """
+        files = list(files)
+        names = {}
+        for attachment in files:
+            directory = "".join(attachment.file.name.rpartition("/")[:2])
+            extension = attachment.file.name.rsplit(".", 1)[-1]
+            names[attachment.file.name] = f"{directory}{uuid.uuid4()}.{extension}"
+        copies = copy_files(cls._meta.get_field("file").storage, names)
+        duplicates = {
+            attachment.pk: attachment.clone(
+                project=project, file=copies[attachment.file.name]
             )
-            return super().duplicate(project=project, file=new_file)
-        return None
+            for attachment in files
+            if attachment.file.name in copies
+        }
+        bulk_create_with_history(list(duplicates.values()), cls)
+        cls.copy_auto_translated_fields(duplicates)
+        return list(duplicates.values())
+
+    def duplicate(self, project: "Project") -> Optional["AttachmentFile"]:
+        return next(iter(self.bulk_duplicate([self], project)), None)
 
 
 class BaseImage(models.Model, DuplicableModel):
@@ -232,7 +264,8 @@ class BaseImage(models.Model, DuplicableModel):
         upload_to=dynamic_upload_to,
         height_field="height",
         width_field="width",
-        render_variations=resize_and_autorotate,
+        # The variations are rendered asynchronously by `render_image_variations`
+        render_variations=False,
         variations={
             "full": (1920, MAX_IMAGE_HEIGHT),
             "large": (1024, MAX_IMAGE_HEIGHT),
@@ -249,6 +282,7 @@ class BaseImage(models.Model, DuplicableModel):
     left = models.FloatField(blank=True, null=True)
     top = models.FloatField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    variations_pending = models.BooleanField(default=False)
 
     class Meta:
         ordering = ("-created_at",)
@@ -282,50 +316,217 @@ class BaseImage(models.Model, DuplicableModel):
         obj = {}
         for name in field.variations.keys():
             obj[name] = f"image::url::{name}::{self.pk}"
+            for file_format in get_variation_formats():
+                variation = f"{name}_{file_format.lower()}"
+                obj[variation] = f"image::url::{variation}::{self.pk}"
         return obj
 
+    def __get_variation_field(self, name: str) -> FieldFile | None:
+        field = getattr(self.file, name, None)
+        if field is None and "_" in name:
+            # variation rendered in another format, e.g. `small_webp`
+            name, file_format = name.rsplit("_", 1)
+            field = getattr(self.file, name, None)
+            if field:
+                field = FieldFile(
+                    self,
+                    self.file.field,
+                    get_variation_format_name(field.name, file_format),
+                )
+        return field
+
+    def __get_variation_names(self, file_name: str) -> list[str]:
+        return [
+            StdImageFieldFile.get_variation_name(file_name, name)
+            for name in self.file.field.variations
+        ]
+
+    @property
+    def __url_fields(self) -> dict[str, ImageField | None]:
+        fields = {self.__url_key: self.file}
+        # The variations are not rendered yet
+        if not self.variations_pending:
+            for name, key in self.__url_variations_key.items():
+                fields[key] = self.__get_variation_field(name)
+        return fields
+
+    @classmethod
+    def resolve_urls(cls, images: Iterable[Optional["BaseImage"]]):
+        """
+        Resolve the urls of the images and of their variations with a single cache
+        read, signing only the missing ones and caching them with a single write.
+
+        The urls are stored on the instances, so `url` and `variations` don't hit
+        the cache anymore.
+
+        Args:
+            - images (Iterable[BaseImage | None]): the images to resolve
+        """
+        fields = {}
+        for image in images:
+            if image is not None:
+                image._resolved_urls = {}
+                for key, field in image.__url_fields.items():
+                    # The same image can be serialized through several instances
+                    fields.setdefault(key, (field, []))[1].append(image)
+        if not fields:
+            return
+
+        urls = cache.get_many(list(fields))
+        missing = {}
+        for key, (field, key_images) in fields.items():
+            url = urls.get(key)
+            if not url and field:
+                try:
+                    url = field.url
+                except AttributeError:
+                    url = ""
+                except AzureError:
+                    # Let the serializers handle the error of this image
+                    continue
+                if url:
+                    missing[key] = url
+            for image in key_images:
+                image._resolved_urls[key] = url or ""
+        if missing:
+            # expirations defined by azure/env - 60s
+            cache.set_many(missing, timeout=settings.STORAGE_EXPIRATION_SECS - 60)
+
+    def _get_url(self, cache_key: str, field: ImageField) -> str:
+        resolved_urls = getattr(self, "_resolved_urls", None) or {}
+        if cache_key in resolved_urls:
+            return resolved_urls[cache_key]
+        return self.get_url(cache_key, field)
+
     @property
     def url(self) -> str:
         """create cache for url file"""
-        return self.get_url(self.__url_key, self.file)
+        return self._get_url(self.__url_key, self.file)
 
     @property
     def variations(self) -> dict[str, str]:
         varias = {"original": self.url}
 
         for name, key in self.__url_variations_key.items():
-            field = getattr(self.file, name, None)
+            if self.variations_pending:
+                # fallback on the original until the variations are rendered
+                varias[name] = varias["original"]
+                continue
+            field = self.__get_variation_field(name)
 
             url = ""
             if field:
-                url = self.get_url(key, field)
+                url = self._get_url(key, field)
             varias[name] = url
         return varias
 
+    def delete_variations_formats(self):
+        """Delete the variations rendered in other formats than the original."""
+        for name in self.file.field.variations:
+            variation = getattr(self.file, name, None)
+            if variation:
+                for file_format in get_variation_formats():
+                    self.file.storage.delete(
+                        get_variation_format_name(variation.name, file_format)
+                    )
+
+    def render_variations(self):
+        """Render the variations of the image and mark them as available."""
+        width, height = render_variations(
+            self.file.name, self.file.field.variations, self.file.storage
+        )
+        self.clear_cache_urls()
+        self.width, self.height, self.variations_pending = width, height, False
+        type(self).objects.filter(pk=self.pk, file=self.file.name).update(
+            width=width, height=height, variations_pending=False
+        )
+
     def clear_cache_urls(self):
+        self._resolved_urls = None
         cache.delete_many([self.__url_key, *list(self.__url_variations_key.values())])
 
-    def duplicate(self, upload_to: str = "", **fields) -> None | Self:
-        with suppress(ResourceNotFoundError):
-            file_path = self.file.name.split("/")
-            file_name = file_path.pop()
-            file_extension = file_name.split(".")[-1]
-            if upload_to:
-                upload_to = f"{upload_to}{uuid.uuid4()}.{file_extension}"
-            else:
-                upload_to = "/".join([*file_path, f"{uuid.uuid4()}.{file_extension}"])
-            new_file = SimpleUploadedFile(
-                name=upload_to,
-                content=self.file.read(),
-                content_type=f"image/{file_extension}",
+    @classmethod
+    def bulk_duplicate(
+        cls, images: Iterable[Self], upload_to: str = "", **fields
+    ) -> dict[int, Self]:
+        """
+        Duplicate images with a single insert. The files and their variations are
+        copied concurrently in the storage without being read, so the variations
+        are only rendered again if some of them are missing.
+
+        Args:
+            - images (Iterable[BaseImage]): the images to duplicate
+            - upload_to (str): directory of the copies, defaults to the directory of
+                each original image
+            - fields: values of the fields set on all the copies
+
+        Returns:
+            - dict[int, BaseImage]: the copies by primary key of the original images,
+                without the images whose file doesn't exist anymore
+        """
+        from .tasks import render_image_variations
+
+        images = list({image.pk: image for image in images}.values())
+        formats = get_variation_formats()
+        names = {}
+        for image in images:
+            directory = upload_to or "".join(image.file.name.rpartition("/")[:2])
+            extension = image.file.name.rsplit(".", 1)[-1]
+            name = f"{directory}{uuid.uuid4()}.{extension}"
+            names[image.file.name] = name
+            if image.variations_pending:
+                continue
+            for source, target in zip(
+                image.__get_variation_names(image.file.name),
+                image.__get_variation_names(name),
+            ):
+                names[source] = target
+                for file_format in formats:
+                    source_format = get_variation_format_name(source, file_format)
+                    target_format = get_variation_format_name(target, file_format)
+                    names[source_format] = target_format
+        copies = copy_files(cls._meta.get_field("file").storage, names)
+
+        duplicates = {}
+        for image in images:
+            if image.file.name not in copies:
+                continue
+            variations_pending = image.variations_pending or any(
+                name not in copies
+                for name in image.__get_variation_names(image.file.name)
             )
-            _upload_to = lambda instance, filename: upload_to  # noqa: E731
-            return super().duplicate(_upload_to=_upload_to, file=new_file, **fields)
-        return None
+            duplicates[image.pk] = image.clone(
+                file=copies[image.file.name],
+                variations_pending=variations_pending,
+                **fields,
+            )
+        cls.objects.bulk_create(duplicates.values())
+        for duplicate in duplicates.values():
+            if duplicate.variations_pending:
+                transaction.on_commit(
+                    partial(
+                        render_image_variations.delay, cls._meta.label, duplicate.pk
+                    )
+                )
+        return duplicates
+
+    def duplicate(self, upload_to: str = "", **fields) -> None | Self:
+        return self.bulk_duplicate([self], upload_to, **fields).get(self.pk)
 
     def save(self, *ar, **kw):
+        from .tasks import render_image_variations
+
         self.clear_cache_urls()
-        return super().save(*ar, **kw)
+        # a new file was uploaded, its variations are rendered after the commit
+        new_file = bool(self.file) and not self.file._committed
+        if new_file:
+            self.variations_pending = True
+        result = super().save(*ar, **kw)
+        if new_file:
+            transaction.on_commit(
+                partial(render_image_variations.delay, self._meta.label, self.pk)
+            )
+        return result
 
 
 class Image(BaseImage, HasOwner, ProjectRelated, OrganizationRelated):
@@ -7,8 +7,11 @@ import requests
 from azure.core.exceptions import AzureError
 from bs4 import BeautifulSoup
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Manager
 from django.http import QueryDict
 from rest_framework import serializers
+from rest_framework.fields import SkipField
 from rest_framework.validators import UniqueTogetherValidator
 
 from apps.commons.serializers import (
@@ -32,6 +35,7 @@ from .models import (
     AttachmentFile,
     AttachmentLink,
     AttachmentType,
+    BaseImage,
     Image,
     OrganizationAttachmentFile,
     PeopleGroupImage,
@@ -336,6 +340,56 @@ class AttachmentFileSerializer(
         return None
 
 
+def get_serializer_images(
+    serializer: serializers.BaseSerializer, instances: list
+) -> list[BaseImage]:
+    """
+    Return the images serialized by the `ImageSerializer` fields of a serializer for
+    the given instances, following the nested serializers.
+
+    Serializers serializing images in other fields (e.g. a `SerializerMethodField`)
+    can return them from a `get_serialized_images(instances)` method.
+    """
+    images = []
+    if hasattr(serializer, "get_serialized_images"):
+        images.extend(serializer.get_serialized_images(instances))
+    for field in serializer.fields.values():
+        if (
+            field.write_only
+            or not isinstance(field, serializers.BaseSerializer)
+            or isinstance(field, serializers.ListSerializer)
+        ):
+            continue
+        related = []
+        for instance in instances:
+            try:
+                attribute = field.get_attribute(instance)
+            except (AttributeError, KeyError, ObjectDoesNotExist, SkipField):
+                continue
+            if attribute is not None:
+                related.append(attribute)
+        if isinstance(field, ImageSerializer):
+            images.extend(related)
+        elif related:
+            images.extend(get_serializer_images(field, related))
+    return images
+
+
+class ImageUrlsListSerializer(serializers.ListSerializer):
+    """
+    `ListSerializer` resolving the urls of all the images of the list in bulk,
+    instead of one cache round trip per image and variation.
+    """
+
+    def to_representation(self, data):
+        data = list(data.all() if isinstance(data, Manager) else data)
+        if isinstance(self.child, ImageSerializer):
+            BaseImage.resolve_urls(data)
+        else:
+            BaseImage.resolve_urls(get_serializer_images(self.child, data))
+        return super().to_representation(data)
+
+
 class ImageSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
     variations = serializers.SerializerMethodField()
@@ -343,6 +397,7 @@ class ImageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Image
+        list_serializer_class = ImageUrlsListSerializer
         fields = [
             "id",
             "name",
@@ -357,7 +412,9 @@ class ImageSerializer(serializers.ModelSerializer):
             "created_at",
             "file",
             "variations",
+            "variations_pending",
         ]
+        read_only_fields = ["variations_pending"]
 
     def get_variations(self, file):
         return file.variations
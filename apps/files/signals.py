@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Image, PeopleGroupImage
+
+
+@receiver(post_delete, sender=Image)
+@receiver(post_delete, sender=PeopleGroupImage)
+def delete_image_variations_formats(sender, instance, **kwargs):
+    """Delete the variations rendered in other formats than the original."""
+    if instance.file:
+        instance.delete_variations_formats()
@@ -1,3 +1,5 @@
+from django.apps import apps
+
 from projects.celery import app
 
 from .models import Image
@@ -19,3 +21,19 @@ def delete_orphan_images(threshold: int = None):
     deleted = list(qs.values_list("pk", flat=True))
     qs.delete()
     return deleted
+
+
+@app.task(name="apps.files.tasks.render_image_variations")
+def render_image_variations(model: str, pk: int):
+    """Render the variations of an uploaded image.
+
+    Parameters
+    ----------
+    model: str
+        Label of the image model, e.g. `files.Image`.
+    pk: int
+        Primary key of the image.
+    """
+    image = apps.get_model(model).objects.filter(pk=pk).first()
+    if image is not None and image.variations_pending:
+        image.render_variations()
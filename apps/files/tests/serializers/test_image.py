@@ -0,0 +1,128 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.accounts.factories import UserFactory
+from apps.accounts.models import ProjectUser
+from apps.accounts.serializers import UserLighterSerializer
+from apps.accounts.utils import get_superadmins_group
+from apps.commons.test import JwtAPITestCase
+from apps.files.models import Image
+from apps.files.serializers import ImageSerializer
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+from apps.projects.serializers import ProjectSuperLightSerializer
+
+
+class MockedRequest:
+    def __init__(self, user):
+        self.user = user
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ImageUrlsListSerializerTestCase(JwtAPITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_resolve_urls_in_bulk(self):
+        images = [self.get_test_image() for _ in range(3)]
+        expected = [
+            image.variations
+            for image in Image.objects.filter(pk__in=[i.pk for i in images])
+        ]
+        cache.clear()
+        images = list(Image.objects.filter(pk__in=[image.pk for image in images]))
+        with (
+            patch.object(cache, "get", wraps=cache.get) as mocked_get,
+            patch.object(cache, "get_many", wraps=cache.get_many) as mocked_get_many,
+            patch.object(cache, "set_many", wraps=cache.set_many) as mocked_set_many,
+        ):
+            data = ImageSerializer(images, many=True).data
+        mocked_get.assert_not_called()
+        mocked_get_many.assert_called_once()
+        mocked_set_many.assert_called_once()
+        self.assertEqual([image["variations"] for image in data], expected)
+
+        # The urls are now cached
+        images = list(Image.objects.filter(pk__in=[image.pk for image in images]))
+        with patch.object(cache, "set_many") as mocked_set_many:
+            ImageSerializer(images, many=True).data
+        mocked_set_many.assert_not_called()
+
+    def test_resolve_nested_images(self):
+        organization = OrganizationFactory()
+        projects = [
+            ProjectFactory(
+                organizations=[organization], header_image=self.get_test_image()
+            )
+            for _ in range(2)
+        ]
+        with (
+            patch.object(cache, "get_many", wraps=cache.get_many) as mocked_get_many,
+            patch.object(cache, "get", wraps=cache.get) as mocked_get,
+        ):
+            data = ProjectSuperLightSerializer(projects, many=True).data
+        mocked_get_many.assert_called_once()
+        mocked_get.assert_not_called()
+        for project, project_data in zip(projects, data):
+            self.assertEqual(
+                project_data["header_image"]["variations"],
+                project.header_image.variations,
+            )
+
+    def test_resolve_shared_image(self):
+        organization = OrganizationFactory()
+        image = self.get_test_image()
+        for _ in range(2):
+            ProjectFactory(organizations=[organization], header_image=image)
+        cache.clear()
+        # Each project has its own instance of the shared image
+        projects = list(
+            Project.objects.filter(header_image=image).select_related("header_image")
+        )
+        self.assertIsNot(projects[0].header_image, projects[1].header_image)
+        with (
+            patch.object(cache, "get_many", wraps=cache.get_many) as mocked_get_many,
+            patch.object(cache, "get", wraps=cache.get) as mocked_get,
+        ):
+            data = ProjectSuperLightSerializer(projects, many=True).data
+        mocked_get_many.assert_called_once()
+        mocked_get.assert_not_called()
+        self.assertEqual(
+            data[0]["header_image"]["variations"],
+            data[1]["header_image"]["variations"],
+        )
+
+    def test_resolve_profile_pictures(self):
+        users = [UserFactory(profile_picture=self.get_test_image()) for _ in range(2)]
+        request = MockedRequest(UserFactory(groups=[get_superadmins_group()]))
+        cache.clear()
+        users = list(
+            ProjectUser.objects.filter(pk__in=[user.pk for user in users])
+            .select_related("profile_picture")
+            .order_by("pk")
+        )
+        with (
+            patch.object(cache, "get_many", wraps=cache.get_many) as mocked_get_many,
+            patch.object(cache, "get", wraps=cache.get) as mocked_get,
+        ):
+            data = UserLighterSerializer(
+                users,
+                many=True,
+                context={"request": request, "force_display": True},
+            ).data
+        mocked_get_many.assert_called_once()
+        mocked_get.assert_not_called()
+        for user, user_data in zip(users, data):
+            self.assertEqual(
+                user_data["profile_picture"]["variations"],
+                user.profile_picture.variations,
+            )
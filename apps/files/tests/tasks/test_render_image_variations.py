@@ -0,0 +1,70 @@
+import io
+import uuid
+from unittest.mock import patch
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from PIL import ExifTags
+from PIL import Image as PILImage
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from apps.files import tasks
+from apps.files.models import Image
+from apps.files.utils import get_variation_format_name, get_variation_formats
+
+
+class RenderImageVariationsTestCase(JwtAPITestCase):
+    @staticmethod
+    def get_image(size: tuple[int, int], orientation: int = 1) -> Image:
+        exif = PILImage.Exif()
+        exif[ExifTags.Base.Orientation] = orientation
+        with io.BytesIO() as buffer, PILImage.new("RGB", size) as image:
+            image.save(buffer, format="JPEG", exif=exif)
+            content = ContentFile(buffer.getvalue())
+        image = Image(
+            name=str(uuid.uuid4()), file=File(content, name=f"{uuid.uuid4()}.jpg")
+        )
+        image._upload_to = lambda instance, filename: f"test/{uuid.uuid4()}"
+        image.owner = UserFactory()
+        image.save()
+        return image
+
+    def test_rendering_is_scheduled_on_upload(self):
+        with (
+            patch.object(tasks.render_image_variations, "delay") as mocked_delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            image = self.get_image((600, 300))
+        self.assertTrue(image.variations_pending)
+        mocked_delay.assert_called_once_with("files.Image", image.pk)
+        variations = image.variations
+        self.assertTrue(
+            all(url == variations["original"] for url in variations.values())
+        )
+
+    def test_render_image_variations(self):
+        image = self.get_image((1200, 300))
+        tasks.render_image_variations("files.Image", image.pk)
+        image.refresh_from_db()
+        self.assertFalse(image.variations_pending)
+        storage = image.file.storage
+        for name, width in [("large", 1024), ("medium", 768), ("small", 500)]:
+            variation = getattr(image.file, name)
+            with storage.open(variation.name) as f, PILImage.open(f) as rendered:
+                self.assertEqual(rendered.size, (width, width // 4))
+            for file_format in get_variation_formats():
+                self.assertTrue(
+                    storage.exists(
+                        get_variation_format_name(variation.name, file_format)
+                    )
+                )
+        self.assertNotEqual(image.variations["small"], image.variations["original"])
+
+    def test_original_is_rotated(self):
+        image = self.get_image((600, 300), orientation=6)
+        tasks.render_image_variations("files.Image", image.pk)
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (300, 600))
+        with image.file.storage.open(image.file.name) as f, PILImage.open(f) as file:
+            self.assertEqual(file.size, (300, 600))
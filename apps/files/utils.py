@@ -1,41 +1,154 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 
+from azure.core.exceptions import ResourceNotFoundError
+from django.conf import settings
 from django.core.files.base import ContentFile
-from PIL import Image
+from django.core.files.storage import Storage
+from PIL import ExifTags, Image, ImageOps, features
 from PIL.GifImagePlugin import GifImageFile
-from stdimage.utils import render_variations
-
-
-def resize_and_autorotate(file_name, variations, storage):
-    with (
-        storage.open(file_name) as f,
-        Image.open(f) as image,
-        BytesIO() as file_buffer,
-    ):
-        if not isinstance(image, GifImageFile):
-            file_format = image.format
-            try:
-                exif = image._getexif()
-            except AttributeError:  # Some images formats don't implement _getexif
-                exif = None
-            # if image has exif data about orientation, rotate it
-            orientation_key = 274  # cf ExifTags
-            if exif and orientation_key in exif:
-                orientation = exif[orientation_key]
-
-                rotate_values = {
-                    3: Image.ROTATE_180,
-                    6: Image.ROTATE_270,
-                    8: Image.ROTATE_90,
-                }
-
-                if orientation in rotate_values:
-                    image = image.transpose(rotate_values[orientation])
-
-            image.save(file_buffer, file_format)
-            f = ContentFile(file_buffer.getvalue())
-            storage.delete(file_name)
-            storage.save(file_name, f)
-        # render stdimage variations
-        render_variations(file_name, variations, replace=True, storage=storage)
-    return False  # prevent default rendering
+from stdimage.models import StdImageFieldFile
+from storages.backends.azure_storage import AzureStorage
+
+
+def get_variation_format_name(variation_name: str, file_format: str) -> str:
+    """Return the name of the variation saved in another format, e.g. WebP."""
+    return f"{os.path.splitext(variation_name)[0]}.{file_format.lower()}"
+
+
+def get_variation_formats() -> list[str]:
+    """Return the additional formats of the variations supported by Pillow."""
+    return [
+        file_format
+        for file_format in settings.IMAGE_VARIATIONS_FORMATS
+        if features.check(file_format.lower())
+    ]
+
+
+def _save(storage: Storage, name: str, content: bytes):
+    # Storages overwriting files (e.g. Azure) replace the file in a single request
+    if not getattr(storage, "overwrite_files", False) and storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def _encode(image: Image.Image, file_format: str, **kwargs) -> bytes:
+    if file_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    with BytesIO() as file_buffer:
+        image.save(file_buffer, file_format, **kwargs)
+        return file_buffer.getvalue()
+
+
+def render_variations(
+    file_name: str, variations: dict[str, dict], storage: Storage
+) -> tuple[int, int]:
+    """
+    Rotate the original image according to its EXIF orientation and render its
+    variations, in its original format and in the formats given by the
+    `IMAGE_VARIATIONS_FORMATS` setting.
+
+    The original is read once and only written back if it was rotated. The
+    variations are downscaled from the largest one, using the JPEG draft mode and
+    Pillow's reducing gap.
+
+    Args:
+        - file_name (str): name of the original image in the storage
+        - variations (dict[str, dict]): the variations of the stdimage field
+        - storage (Storage): the storage of the image
+
+    Returns:
+        - tuple[int, int]: the width and the height of the original image
+    """
+    with storage.open(file_name) as f, Image.open(f) as image:
+        if isinstance(image, GifImageFile):
+            # Animated images are not resized
+            for variation in variations.values():
+                name = StdImageFieldFile.get_variation_name(
+                    file_name, variation["name"]
+                )
+                f.seek(0)
+                _save(storage, name, f.read())
+            return image.size
+
+        file_format = image.format
+        size = image.size
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+        if orientation != 1:
+            image = ImageOps.exif_transpose(image)
+            size = image.size
+            _save(storage, file_name, _encode(image, file_format))
+
+        variations = sorted(
+            variations.values(), key=lambda v: v["width"] or 0, reverse=True
+        )
+        formats = get_variation_formats()
+        for variation in variations:
+            box = (variation["width"], variation["height"])
+            # `thumbnail` uses the draft mode of JPEG images that aren't loaded
+            # yet, and the following variations are reduced from the previous one.
+            image.thumbnail(box, reducing_gap=3.0)
+            name = StdImageFieldFile.get_variation_name(file_name, variation["name"])
+            options = {"optimize": True} if file_format in ("JPEG", "PNG") else {}
+            if file_format == "JPEG":
+                options["quality"] = "web_high"
+            _save(storage, name, _encode(image, file_format, **options))
+            for variation_format in formats:
+                _save(
+                    storage,
+                    get_variation_format_name(name, variation_format),
+                    _encode(image, variation_format),
+                )
+    return size
+
+
+def copy_file(storage: Storage, source: str, target: str) -> str | None:
+    """
+    Copy a file of the storage without loading it in memory. Azure blobs are copied
+    server-side, the other storages stream the file in chunks.
+
+    Args:
+        - storage (Storage): the storage of the file
+        - source (str): name of the file to copy
+        - target (str): name of the copy
+
+    Returns:
+        - str | None: the name of the copy, or None if the source doesn't exist
+    """
+    try:
+        if isinstance(storage, AzureStorage):
+            blob = storage.client.get_blob_client(storage._get_valid_path(target))
+            blob.upload_blob_from_url(storage.url(source), overwrite=True)
+            return target
+        with storage.open(source) as f:
+            return storage.save(target, f)
+    except (ResourceNotFoundError, OSError):
+        return None
+
+
+def copy_files(storage: Storage, names: dict[str, str]) -> dict[str, str]:
+    """
+    Copy files of the storage concurrently, using `settings.FILES_COPY_WORKERS`
+    threads.
+
+    Args:
+        - storage (Storage): the storage of the files
+        - names (dict[str, str]): the names of the copies, by name of the source
+
+    Returns:
+        - dict[str, str]: the names of the copies by name of the source, without the
+            sources that don't exist
+    """
+    if not names:
+        return {}
+    workers = min(settings.FILES_COPY_WORKERS, len(names))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        copies = executor.map(
+            lambda item: copy_file(storage, *item), list(names.items())
+        )
+        return {
+            source: copy
+            for source, copy in zip(names.keys(), copies)
+            if copy is not None
+        }
@@ -1,13 +1,18 @@
 import inspect
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from functools import cache
 
+from django.conf import settings
+from django.core.cache import cache as django_cache
 from django.db import models
+from django.db.models import F, Func, IntegerField, QuerySet, Subquery
 from drf_spectacular.utils import OpenApiParameter
 
 from apps.accounts.models import ProjectUser
+from apps.commons.cache import get_cache_versions, invalidate_cache_tag
 
 IGNORE_MODULES_FUNCTION = "IGNORE_MODULES_FUNCTION"
+CACHED_COUNT_MODULES_FUNCTION = "CACHED_COUNT_MODULES_FUNCTION"
 
 
 def ignore_method(method):
@@ -16,6 +21,51 @@ def ignore_method(method):
     return method
 
 
+def cached_count(method):
+    """
+    Mark an expensive module: its approximate count is cached until the instance
+    changes (see `invalidate_modules_count`) or the cache expires.
+    """
+    setattr(method, CACHED_COUNT_MODULES_FUNCTION, True)
+    return method
+
+
+def _get_count_tags(model: type[models.Model], pk: int) -> tuple[str, str]:
+    return f"modules_count.{model.__name__}", f"modules_count.{model.__name__}.{pk}"
+
+
+def invalidate_modules_count(
+    model: type[models.Model], pks: Iterable[int] | None = None
+):
+    """
+    Invalidate the cached module counts of the given instances, or of all the
+    instances of the model if no pks are given.
+    """
+    if not settings.ENABLE_CACHE:
+        return
+    if pks is None:
+        invalidate_cache_tag(_get_count_tags(model, 0)[0])
+        return
+    for pk in pks:
+        invalidate_cache_tag(_get_count_tags(model, pk)[1])
+
+
+def get_count_subquery(queryset: QuerySet) -> Subquery | None:
+    """
+    Return a subquery counting the rows of the queryset, or None if the queryset
+    can't be counted with a plain `COUNT` (distinct, sliced or combined queries).
+    """
+    query = queryset.query
+    if query.distinct or query.combinator or query.is_sliced:
+        return None
+    # `Func` isn't an aggregate, so no GROUP BY is added to the subquery
+    return Subquery(
+        queryset.order_by()
+        .annotate(_count=Func(F("pk"), function="COUNT", output_field=IntegerField()))
+        .values("_count")
+    )
+
+
 class AbstractModules:
     """abstract class for modules/queryset declarations"""
 
@@ -60,12 +110,70 @@ class AbstractModules:
         return tuple(modules_list)
 
     @ignore_method
-    def count(self, modules_keys: tuple[str] | None = None):
-        modules = {}
-        for name, method in type(self).modules(modules_keys):
+    def count(self, modules_keys: tuple[str] | None = None, exact: bool = True):
+        """
+        Return the number of elements of each module.
+
+        The modules that can be counted with a plain `COUNT` are folded in a single
+        query. When `exact` is False, the modules marked with `cached_count` are
+        read from the cache instead.
+
+        Args:
+            - modules_keys (tuple[str] | None): the modules to count, all if None
+            - exact (bool): whether to bypass the cache of the expensive modules
+
+        Returns:
+            - dict[str, int]: the count of each module
+        """
+        modules = type(self).modules(modules_keys)
+        cached = {}
+        if not exact and settings.ENABLE_CACHE:
+            cached = {
+                name: method
+                for name, method in modules
+                if getattr(method, CACHED_COUNT_MODULES_FUNCTION, False)
+            }
+        counts = self._count_cached(cached) if cached else {}
+
+        subqueries = {}
+        for name, method in modules:
+            if name in cached:
+                continue
             # method is one modules (class method and not instance method)
-            modules[name] = method(self).count()
-        return modules
+            queryset = method(self)
+            subquery = get_count_subquery(queryset)
+            if subquery is not None:
+                subqueries[f"_count_{name}"] = subquery
+            else:
+                counts[name] = queryset.count()
+        if subqueries:
+            row = (
+                type(self.instance)
+                .objects.filter(pk=self.instance.pk)
+                .annotate(**subqueries)
+                .values(*subqueries)
+                .first()
+            ) or {}
+            counts.update(
+                {key[len("_count_") :]: value or 0 for key, value in row.items()}
+            )
+        return {name: counts.get(name, 0) for name, _ in modules}
+
+    def _count_cached(self, modules: dict[str, Callable]) -> dict[str, int]:
+        model_tag, instance_tag = _get_count_tags(type(self.instance), self.instance.pk)
+        versions = ".".join(map(str, get_cache_versions(model_tag, instance_tag)))
+        # Anonymous users and internal admins both have no pk
+        user = f"{type(self.user).__name__}.{self.user.pk}"
+        keys = {name: f"{instance_tag}.{versions}.{user}.{name}" for name in modules}
+        counts = django_cache.get_many(keys.values())
+        missing = {}
+        for name, method in modules.items():
+            if keys[name] not in counts:
+                missing[keys[name]] = method(self).count()
+        if missing:
+            django_cache.set_many(missing, settings.CACHE_MODULES_COUNT_TTL)
+            counts.update(missing)
+        return {name: counts[key] for name, key in keys.items()}
 
     @classmethod
     @ignore_method
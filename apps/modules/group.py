@@ -11,16 +11,18 @@ from django.db.models import (
 from apps.accounts.models import PeopleGroup, PeopleGroupLocation, ProjectUser
 from apps.commons.models import GroupData
 from apps.files.models import PeopleGroupImage
-from apps.modules.base import AbstractModules, register_module
+from apps.modules.base import AbstractModules, cached_count, register_module
 from apps.newsfeed.models import Event, EventLocation, NewsLocation
 from apps.projects.models import Location, Project
 from services.crisalid.models import Document, DocumentTypeCentralized
+from services.mistral.models import GroupSimilarity
 
 
 @register_module(PeopleGroup)
 class PeopleGroupModules(AbstractModules):
     instance: PeopleGroup
 
+    @cached_count
     def members(self) -> QuerySet[ProjectUser]:
         return (
             self.user.get_user_queryset()
@@ -62,6 +64,7 @@ class PeopleGroupModules(AbstractModules):
             .distinct()
         )
 
+    @cached_count
     def featured_projects(self) -> QuerySet[Project]:
         group_projects = Project.objects.filter(
             groups__people_groups=self.instance
@@ -87,9 +90,11 @@ class PeopleGroupModules(AbstractModules):
             .prefetch_related("categories")
         )
 
+    @cached_count
     def similars(self) -> QuerySet[PeopleGroup]:
-        return self.instance.similars().filter(
-            pk__in=self.user.get_people_group_queryset()
+        return GroupSimilarity.get_similars(
+            self.instance,
+            PeopleGroup.objects.filter(pk__in=self.user.get_people_group_queryset()),
         )
 
     def subgroups(self) -> QuerySet[PeopleGroup]:
@@ -127,8 +132,10 @@ class PeopleGroupModules(AbstractModules):
             document_type__in=documents_type, contributors__user__in=members_qs
         ).distinct()
 
+    @cached_count
     def publications(self) -> QuerySet[Document]:
         return self._documents(DocumentTypeCentralized.publications)
 
+    @cached_count
     def conferences(self) -> QuerySet[Document]:
         return self._documents(DocumentTypeCentralized.conferences)
@@ -12,7 +12,7 @@ from apps.announcements.models import Announcement
 from apps.commons.models import GroupData
 from apps.feedbacks.models import Comment, Review
 from apps.files.models import AttachmentFile, AttachmentLink
-from apps.modules.base import AbstractModules, register_module
+from apps.modules.base import AbstractModules, cached_count, register_module
 from apps.projects.models import (
     BlogEntry,
     Goal,
@@ -21,12 +21,14 @@ from apps.projects.models import (
     ProjectMessage,
     ProjectTab,
 )
+from services.mistral.models import ProjectSimilarity
 
 
 @register_module(Project)
 class ProjectModules(AbstractModules):
     instance: Project
 
+    @cached_count
     def members(self) -> QuerySet[ProjectUser]:
         return (
             self.user.get_user_queryset()
@@ -65,6 +67,7 @@ class ProjectModules(AbstractModules):
             .distinct()
         )
 
+    @cached_count
     def groups(self) -> QuerySet[PeopleGroup]:
         return (
             self.user.get_people_group_queryset()
@@ -113,8 +116,12 @@ class ProjectModules(AbstractModules):
             project__in=self.user.get_project_queryset()
         )
 
+    @cached_count
     def similars(self) -> QuerySet[Project]:
-        return self.instance.similars().filter(pk__in=self.user.get_project_queryset())
+        return ProjectSimilarity.get_similars(
+            self.instance,
+            Project.objects.filter(pk__in=self.user.get_project_queryset()),
+        )
 
     def locations(self) -> QuerySet[Location]:
         return self.instance.locations.all()
@@ -27,7 +27,21 @@ class ModulesSerializers(serializers.ModelSerializer):
             )
         return self.context["modules_keys"]
 
+    @cached_property
+    def __modules_exact(self):
+        if "modules_exact" not in self.context:
+            request = self.context.get("request")
+            query = request.query_params if request else QueryDict()
+            # expensive modules are counted from the cache unless asked otherwise
+            self.context["modules_exact"] = query.get("modules_exact", "").lower() in (
+                "true",
+                "1",
+            )
+        return self.context["modules_exact"]
+
     def get_modules(self, instance):
         request = self.context.get("request")
 
-        return instance.modules_by_user(request.user).count(self.__modules_keys)
+        return instance.modules_by_user(request.user).count(
+            self.__modules_keys, exact=self.__modules_exact
+        )
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from apps.feedbacks.factories import CommentFactory
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import BlogEntryFactory, GoalFactory, ProjectFactory
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+class ModulesCountTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.project = ProjectFactory(organizations=[cls.organization])
+        cls.project.get_members().users.add(*UserFactory.create_batch(2))
+        BlogEntryFactory.create_batch(3, project=cls.project)
+        GoalFactory.create_batch(2, project=cls.project)
+        CommentFactory(project=cls.project)
+
+    def test_count_matches_modules(self):
+        modules = self.project.modules
+        counts = modules.count()
+        self.assertEqual(
+            counts,
+            {name: method(modules).count() for name, method in modules.modules()},
+        )
+        self.assertEqual(counts["blogs"], 3)
+        self.assertEqual(counts["goals"], 2)
+        self.assertEqual(counts["comments"], 1)
+
+    def test_cheap_modules_are_counted_in_one_query(self):
+        modules = self.project.modules
+        with self.assertNumQueries(1):
+            counts = modules.count(("blogs", "goals", "comments", "locations"))
+        self.assertEqual(
+            counts, {"blogs": 3, "comments": 1, "goals": 2, "locations": 0}
+        )
+
+    @override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES)
+    def test_approximate_count_is_invalidated(self):
+        cache.clear()
+        modules = self.project.modules
+        members = modules.count(("members",), exact=False)["members"]
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                modules.count(("members",), exact=False), {"members": members}
+            )
+        self.project.get_members().users.add(UserFactory())
+        self.assertEqual(
+            modules.count(("members",), exact=False), {"members": members + 1}
+        )
@@ -12,7 +12,7 @@ from apps.commons.serializers import (
     StringsImagesSerializer,
 )
 from apps.files.models import Image
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.organizations.models import Organization
 from apps.projects.serializers import ProjectLightSerializer
 from services.translator.serializers import auto_translated
@@ -68,6 +68,7 @@ class NewsSerializer(
 
     class Meta:
         model = News
+        list_serializer_class = ImageUrlsListSerializer
         fields = [
             "id",
             "title",
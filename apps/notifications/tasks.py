@@ -1,14 +1,19 @@
+import logging
+from collections.abc import Iterable
 from datetime import date, timedelta
+from itertools import batched, groupby
 from typing import Any
 
 from babel.dates import format_date
+from celery import group
+from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.accounts.models import PeopleGroup, ProjectUser
 from apps.announcements.models import Announcement
 from apps.commons.utils import clear_memory
-from apps.emailing.utils import render_message, send_email
+from apps.emailing.utils import queue_emails, render_message
 from apps.feedbacks.models import Comment, Review
 from apps.invitations.models import AccessRequest, Invitation
 from apps.newsfeed.models import Instruction
@@ -44,6 +49,8 @@ from .utils import (
     UpdateMembersNotificationManager,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @app.task(name="apps.notifications.tasks.notify_member_added")
 def notify_member_added(project_pk: str, user_pk: int, by_pk: int, role: str):
@@ -175,8 +182,43 @@ def notify_pending_access_requests():
 @app.task(name="apps.notifications.tasks.send_notifications_reminder")
 @clear_memory
 def send_notifications_reminder():
-    users = ProjectUser.objects.filter(notifications_received__to_send=True).distinct()
-    _send_notifications_reminder(users)
+    """
+    Split the users with pending notifications in ranges of ids, and send their
+    reminders in parallel subtasks.
+    """
+    return _send_notifications_reminder_chunks()
+
+
+@app.task(
+    name="apps.notifications.tasks.send_notifications_reminder_chunk",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+@clear_memory
+def send_notifications_reminder_chunk(self, start: int, end: int, index: int = 0):
+    """
+    Send the reminders of the users with an id between `start` and `end`.
+
+    The notifications are only marked as sent once the reminders of the whole
+    chunk are queued, and the task is acknowledged after it returns: if a worker
+    is restarted, the chunk is delivered again and only the users that still have
+    pending notifications are reminded.
+    """
+    if not self.request.called_directly:
+        self.update_state(
+            state="PROGRESS", meta={"chunk": index, "start": start, "end": end}
+        )
+    users = ProjectUser.objects.filter(id__gte=start, id__lte=end)
+    count = _send_notifications_reminder(users)
+    logger.info(
+        "Notifications reminder chunk %s (users %s to %s): %s reminders sent",
+        index,
+        start,
+        end,
+        count,
+    )
+    return count
 
 
 @app.task(name="apps.notifications.tasks.send_invitations_reminder")
@@ -400,26 +442,68 @@ def _notify_pending_access_requests():
             manager.create_and_send_notifications()
 
 
-def _send_notifications_reminder(users: dict):
-    for user in users:
-        notifications = Notification.objects.filter(
-            receiver=user, to_send=True
-        ).order_by("created")
-        for notification in notifications:
+def _send_notifications_reminder_chunks() -> str | None:
+    receivers = list(
+        Notification.objects.filter(to_send=True)
+        .order_by("receiver_id")
+        .values_list("receiver_id", flat=True)
+        .distinct()
+    )
+    chunks = [
+        (chunk[0], chunk[-1])
+        for chunk in batched(receivers, settings.NOTIFICATIONS_REMINDER_CHUNK_SIZE)
+    ]
+    if not chunks:
+        return None
+    result = group(
+        send_notifications_reminder_chunk.s(start, end, index)
+        for index, (start, end) in enumerate(chunks)
+    ).apply_async()
+    # Save the group so the progress of the run can be followed from its id
+    result.save()
+    logger.info(
+        "Notifications reminder %s: %s users in %s chunks",
+        result.id,
+        len(receivers),
+        len(chunks),
+    )
+    return result.id
+
+
+def _send_notifications_reminder(users: Iterable[ProjectUser]) -> int:
+    notifications = (
+        Notification.objects.filter(receiver__in=users, to_send=True)
+        .select_related("receiver", "project")
+        .order_by("receiver_id", "created")
+    )
+    emails = []
+    sent = []
+    for user, user_notifications in groupby(notifications, lambda n: n.receiver):
+        user_notifications = list(user_notifications)
+        for notification in user_notifications:
             notification.reminder_message = getattr(
                 notification, f"reminder_message_{user.language}"
             )
-        if len(notifications) > 0:
-            subject, _ = render_message("reminder/object", user.language)
-            subject = f"\N{SPARKLES} {subject} \N{SPARKLES}"
-            context = {
-                "dateOfTheDay": format_date(date.today(), locale=user.language),
-                "notifications": notifications,
-                "recipient": user,
+        subject, _ = render_message("reminder/object", user.language)
+        subject = f"\N{SPARKLES} {subject} \N{SPARKLES}"
+        context = {
+            "dateOfTheDay": format_date(date.today(), locale=user.language),
+            "notifications": user_notifications,
+            "recipient": user,
+        }
+        text, html = render_message("reminder/mail", user.language, **context)
+        emails.append(
+            {
+                "subject": subject,
+                "text_content": text,
+                "to": [user.email],
+                "html_content": html,
             }
-            text, html = render_message("reminder/mail", user.language, **context)
-            send_email(subject, text, [user.email], html_content=html)
-            notifications.update(to_send=False)
+        )
+        sent.extend(notification.pk for notification in user_notifications)
+    queue_emails(emails)
+    Notification.objects.filter(pk__in=sent).update(to_send=False)
+    return len(emails)
 
 
 def _send_invitations_reminder():
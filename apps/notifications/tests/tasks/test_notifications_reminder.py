@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import override_settings
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from apps.notifications.factories import NotificationFactory
+from apps.notifications.models import Notification
+from apps.notifications.tasks import (
+    _send_notifications_reminder_chunks,
+    send_notifications_reminder_chunk,
+)
+
+
+class NotificationsReminderTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.users = UserFactory.create_batch(3)
+        for user in cls.users:
+            NotificationFactory.create_batch(2, receiver=user, to_send=True)
+        cls.sent_notification = NotificationFactory(
+            receiver=cls.users[0], to_send=False
+        )
+
+    def test_send_notifications_reminder_chunk(self):
+        users = sorted(self.users, key=lambda user: user.id)
+        count = send_notifications_reminder_chunk(users[0].id, users[1].id)
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            {message.to[0] for message in mail.outbox},
+            {users[0].email, users[1].email},
+        )
+        self.assertFalse(
+            Notification.objects.filter(receiver__in=users[:2], to_send=True).exists()
+        )
+        self.assertEqual(
+            Notification.objects.filter(receiver=users[2], to_send=True).count(), 2
+        )
+
+        # The chunk can be delivered again without sending the reminders twice
+        count = send_notifications_reminder_chunk(users[0].id, users[1].id)
+        self.assertEqual(count, 0)
+        self.assertEqual(len(mail.outbox), 2)
+
+    @override_settings(NOTIFICATIONS_REMINDER_CHUNK_SIZE=2)
+    @patch("apps.notifications.tasks.group")
+    def test_send_notifications_reminder_chunks(self, mocked_group):
+        users = sorted(self.users, key=lambda user: user.id)
+        _send_notifications_reminder_chunks()
+        signatures = list(mocked_group.call_args.args[0])
+        self.assertEqual(
+            [signature.args for signature in signatures],
+            [(users[0].id, users[1].id, 0), (users[2].id, users[2].id, 1)],
+        )
+        mocked_group.return_value.apply_async.assert_called_once()
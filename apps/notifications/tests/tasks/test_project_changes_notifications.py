@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from faker import Faker
 from rest_framework import status
@@ -116,6 +118,32 @@ class ProjectChangesTestCase(JwtAPITestCase):
                 f"{sender.get_full_name()} edited the title.",
             )
 
+    def test_notification_task_queries(self):
+        def notify(followers_count: int) -> int:
+            project = ProjectFactory(
+                publication_status=Project.PublicationStatus.PUBLIC,
+                organizations=[self.organization],
+                categories=[self.category],
+            )
+            sender = UserFactory()
+            project.owners.add(sender, UserFactory())
+            for follower in UserFactory.create_batch(followers_count):
+                FollowFactory(follower=follower, project=project)
+            CategoryFollowFactory(follower=UserFactory(), category=self.category)
+            with CaptureQueriesContext(connection) as queries:
+                _notify_project_changes(
+                    project.pk, {"title": (project.title, faker.sentence())}, sender.pk
+                )
+            self.assertEqual(
+                Notification.objects.filter(project=project, to_send=True).count(),
+                followers_count + 2,
+            )
+            return len(queries)
+
+        notify(1)  # warm up the caches
+        # The number of queries doesn't depend on the number of recipients
+        self.assertEqual(notify(2), notify(6))
+
     def test_merged_notifications_task(self):
         project = ProjectFactory(
             publication_status=Project.PublicationStatus.PUBLIC,
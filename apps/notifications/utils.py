@@ -1,13 +1,14 @@
+import json
 from typing import Any
 
 from django.conf import settings
-from django.db.models import Q
-from django.utils import translation
+from django.db.models import Q, QuerySet
+from django.utils import timezone, translation
 from django.utils.translation import gettext_lazy as _
 
 from apps.accounts.models import ProjectUser
 from apps.commons.mixins import OrganizationRelated, ProjectRelated
-from apps.emailing.utils import render_message, send_email
+from apps.emailing.utils import queue_emails, render_message, send_email
 from apps.feedbacks.models import Follow
 from apps.organizations.models import CategoryFollow, Organization
 from apps.organizations.utils import get_above_categories_hierarchy_ids
@@ -56,6 +57,7 @@ class NotificationTaskManager:
         else:
             self.organization = None
         self.base_context = kwargs
+        self._reminders = {}
         self.template_context = {
             "project": self.project,
             "organization": self.organization,
@@ -79,9 +81,12 @@ class NotificationTaskManager:
         )
         return reminder
 
-    def send_email_to_recipient(self, recipient: ProjectUser, **context) -> None:
+    def get_email_for_recipient(
+        self, recipient: ProjectUser, **context
+    ) -> dict[str, Any]:
         """
-        Send the email to the receiver.
+        Return the email to send to the receiver, as the keyword arguments of
+        `send_email`.
         """
         recipient_context = self.format_context_for_template(
             {"recipient": recipient, **context}, recipient.language
@@ -94,7 +99,18 @@ class NotificationTaskManager:
         text, html = render_message(
             f"{self.template_dir}/mail", recipient.language, **recipient_context
         )
-        send_email(subject, text, [recipient.email], html_content=html)
+        return {
+            "subject": subject,
+            "text_content": text,
+            "to": [recipient.email],
+            "html_content": html,
+        }
+
+    def send_email_to_recipient(self, recipient: ProjectUser, **context) -> None:
+        """
+        Send the email to the receiver.
+        """
+        send_email(**self.get_email_for_recipient(recipient, **context))
 
     def format_context_for_template(
         self, context: dict[str, Any], language: str
@@ -119,120 +135,201 @@ class NotificationTaskManager:
             return list({v["id"]: v for v in current_value + new_value}.values())
         return list(set(current_value + new_value))
 
-    def recipient_must_receive(self, recipient: ProjectUser) -> bool:
+    def get_recipients_must_receive(self, recipients: list[ProjectUser]) -> set[int]:
         """
-        Return True if the notification should be sent to the recipient.
+        Return the ids of the recipients to whom the notification should be sent.
+
+        The memberships and the follows of all the recipients are resolved with a
+        constant number of queries.
         """
-        to_send = getattr(
-            recipient.notification_settings, self.member_setting_name, False
-        )
-        if self.project and self.notify_followers:
-            to_send &= self.project.get_all_members().filter(id=recipient.id).exists()
-            to_send |= (
-                getattr(
-                    recipient.notification_settings,
-                    self.follower_setting_name,
-                    False,
-                )
-                and Follow.objects.filter(
-                    project=self.project, follower=recipient
-                ).exists()
+        ids = [recipient.id for recipient in recipients]
+        check_followers = bool(self.project and self.notify_followers)
+        members, followers, category_followers = set(), set(), set()
+        if check_followers and ids:
+            members = set(
+                self.project.get_all_members()
+                .filter(id__in=ids)
+                .values_list("id", flat=True)
             )
-            to_send |= (
-                getattr(
-                    recipient.notification_settings,
-                    self.category_follower_setting_name,
-                    False,
-                )
-                and CategoryFollow.objects.filter(
+            followers = set(
+                Follow.objects.filter(
+                    project=self.project, follower__in=ids
+                ).values_list("follower_id", flat=True)
+            )
+            category_followers = set(
+                CategoryFollow.objects.filter(
                     category__id__in=get_above_categories_hierarchy_ids(
                         self.project.categories.all().values_list("id", flat=True)
                     ),
-                    follower=recipient,
-                ).exists()
+                    follower__in=ids,
+                ).values_list("follower_id", flat=True)
             )
-        return to_send
+        must_receive = set()
+        for recipient in recipients:
+            notification_settings = recipient.notification_settings
+            to_send = getattr(notification_settings, self.member_setting_name, False)
+            if check_followers:
+                to_send &= recipient.id in members
+                to_send |= (
+                    getattr(notification_settings, self.follower_setting_name, False)
+                    and recipient.id in followers
+                )
+                to_send |= (
+                    getattr(
+                        notification_settings,
+                        self.category_follower_setting_name,
+                        False,
+                    )
+                    and recipient.id in category_followers
+                )
+            if to_send:
+                must_receive.add(recipient.id)
+        return must_receive
 
-    def update_or_create_notification_for_recipient(
-        self, recipient: ProjectUser
-    ) -> Notification:
+    def recipient_must_receive(self, recipient: ProjectUser) -> bool:
+        """
+        Return True if the notification should be sent to the recipient.
+        """
+        return recipient.id in self.get_recipients_must_receive([recipient])
+
+    def get_translated_reminders(
+        self, count: int, context: dict[str, Any]
+    ) -> dict[str, str]:
+        """
+        Return the reminder message in each language, rendered once for each
+        count and context.
+        """
+        key = (count, json.dumps(context, sort_keys=True, default=str))
+        if key not in self._reminders:
+            self._reminders[key] = {
+                f"reminder_message_{lang}": self.get_translated_reminder(
+                    lang,
+                    count=count,
+                    **self.format_context_for_template(
+                        {**self.template_context, **context}, lang
+                    ),
+                )
+                for lang in settings.REQUIRED_LANGUAGES
+            }
+        return self._reminders[key]
+
+    def update_or_create_notifications(
+        self, recipients: list[ProjectUser], must_receive: set[int]
+    ) -> dict[int, tuple[Notification, dict[str, Any]]]:
+        """
+        Merge the notification with the existing notifications of the recipients,
+        or create it, with one query to fetch the existing notifications and one
+        query to create and update each.
+
+        Returns:
+            - dict[int, tuple[Notification, dict]]: the notification of each
+                recipient and the context of its email, by recipient id
+        """
         lookup = {
             "type": self.notification_type,
             "sender": self.sender,
-            "receiver": recipient,
             "project": self.project,
             "organization": self.organization,
-            "to_send": self.recipient_must_receive(recipient)
-            and not self.send_immediately,
-        }
-        defaults = {
-            f"reminder_message_{lang}": self.get_translated_reminder(
-                lang,
-                count=1,
-                **self.format_context_for_template(self.template_context, lang),
-            )
-            for lang in settings.REQUIRED_LANGUAGES
         }
         if self.send_immediately:
             lookup["is_viewed"] = False
-        else:
-            defaults["is_viewed"] = False
-        if self.merge:
-            existing_notification = Notification.objects.filter(**lookup)
-            if existing_notification.count() > 1:
-                # This handles a case where new notifications are merged with ones
-                # that were created before the merge feature was added
-                existing_notification.exclude(
-                    id=existing_notification.order_by("-created").first().id
-                ).delete()
-            notification, created = Notification.objects.update_or_create(
-                defaults, **lookup
-            )
-        else:
-            notification = Notification.objects.create(**defaults, **lookup)
-            created = True
-        context = self.base_context
-        if not created:
-            context = {
-                key: (
-                    value
-                    if not isinstance(value, list)
-                    else self.merge_context_lists(
-                        notification.context.get(key, []), value
-                    )
-                )
-                for key, value in context.items()
-            }
-            notification.count += 1
-            for lang in settings.REQUIRED_LANGUAGES:
-                setattr(
-                    notification,
-                    f"reminder_message_{lang}",
-                    self.get_translated_reminder(
-                        lang,
-                        count=notification.count,
-                        **self.format_context_for_template(
-                            {**self.template_context, **context}, lang
-                        ),
-                    ),
+        existing = {}
+        if self.merge and recipients:
+            duplicates = []
+            for notification in Notification.objects.filter(
+                receiver__in=[recipient.id for recipient in recipients], **lookup
+            ).order_by("-created"):
+                key = (notification.receiver_id, notification.to_send)
+                if key in existing:
+                    duplicates.append(notification.id)
+                else:
+                    existing[key] = notification
+            # This handles a case where new notifications are merged with ones
+            # that were created before the merge feature was added
+            if duplicates:
+                Notification.objects.filter(id__in=duplicates).delete()
+
+        now = timezone.now()
+        created, updated, notifications = [], [], {}
+        for recipient in recipients:
+            to_send = recipient.id in must_receive and not self.send_immediately
+            notification = existing.get((recipient.id, to_send))
+            if notification is None:
+                context = self.base_context
+                notification = Notification(
+                    receiver=recipient,
+                    to_send=to_send,
+                    is_viewed=False,
+                    context=context,
+                    **lookup,
+                    **self.get_translated_reminders(1, context),
                 )
-        notification.context = context
-        notification.save()
-        context = {
-            "count": notification.count,
-            **self.template_context,
-            **context,
-        }
-        return notification, context
+                created.append(notification)
+            else:
+                context = {
+                    key: (
+                        value
+                        if not isinstance(value, list)
+                        else self.merge_context_lists(
+                            notification.context.get(key, []), value
+                        )
+                    )
+                    for key, value in self.base_context.items()
+                }
+                notification.count += 1
+                notification.context = context
+                notification.is_viewed = False
+                notification.created = now
+                for field, value in self.get_translated_reminders(
+                    notification.count, context
+                ).items():
+                    setattr(notification, field, value)
+                updated.append(notification)
+            notifications[recipient.id] = (
+                notification,
+                {"count": notification.count, **self.template_context, **context},
+            )
+        Notification.objects.bulk_create(created)
+        Notification.objects.bulk_update(
+            updated,
+            [
+                "count",
+                "context",
+                "is_viewed",
+                "created",
+                *(f"reminder_message_{lang}" for lang in settings.REQUIRED_LANGUAGES),
+            ],
+        )
+        return notifications
+
+    def update_or_create_notification_for_recipient(
+        self, recipient: ProjectUser
+    ) -> tuple[Notification, dict[str, Any]]:
+        must_receive = self.get_recipients_must_receive([recipient])
+        return self.update_or_create_notifications([recipient], must_receive)[
+            recipient.id
+        ]
 
     def create_and_send_notifications(self) -> None:
         """
         Create and send notifications to the recipients.
         """
-        for recipient in self.get_recipients():
-            _, context = self.update_or_create_notification_for_recipient(recipient)
-            if self.recipient_must_receive(recipient) and self.send_immediately:
-                self.send_email_to_recipient(recipient, **context)
+        recipients = self.get_recipients()
+        if isinstance(recipients, QuerySet):
+            recipients = recipients.select_related("notification_settings")
+        recipients = list(
+            {recipient.id: recipient for recipient in recipients}.values()
+        )
+        must_receive = self.get_recipients_must_receive(recipients)
+        notifications = self.update_or_create_notifications(recipients, must_receive)
+        if self.send_immediately:
+            queue_emails(
+                self.get_email_for_recipient(
+                    recipient, **notifications[recipient.id][1]
+                )
+                for recipient in recipients
+                if recipient.id in must_receive
+            )
 
 
 class ProjectCreatedNotificationManager(NotificationTaskManager):
@@ -20,7 +20,7 @@ from apps.commons.serializers import (
     StringsImagesSerializer,
 )
 from apps.files.models import Image
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.projects.models import Project
 from apps.skills.models import TagClassification
 from apps.skills.serializers import (
@@ -262,6 +262,7 @@ class OrganizationSerializer(
 
     class Meta:
         model = Organization
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "created_at",
@@ -559,6 +560,7 @@ class ProjectCategoryHierarchySerializer(
 
     class Meta:
         model = ProjectCategory
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "slug",
@@ -633,6 +635,7 @@ class ProjectCategorySerializer(
 
     class Meta:
         model = ProjectCategory
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "slug",
             "organization",
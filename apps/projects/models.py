@@ -1,6 +1,9 @@
+import datetime
+import itertools
 import logging
 import math
 import os
+from collections.abc import Callable
 from functools import reduce
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -9,12 +12,13 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
-from django.core.cache import cache
 from django.db import models, transaction
-from django.db.models import QuerySet
+from django.db.models import Count, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce, Length
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords, HistoricForeignKey
+from simple_history.utils import bulk_create_with_history
 
 from apps.analytics.models import Stat
 from apps.commons.enums import SDG, Language
@@ -30,7 +34,7 @@ from apps.commons.mixins import (
 )
 from apps.commons.models import GroupData
 from apps.commons.queryset import MultipleIdsQuerySet
-from apps.commons.utils import get_write_permissions_from_subscopes
+from apps.commons.utils import get_write_permissions_from_subscopes, replace_many
 from services.translator.mixins import HasAutoTranslatedFields
 
 from .exceptions import WrongProjectOrganizationError
@@ -298,86 +302,61 @@ class Project(
         self.deleted_at = None
         self.save()
 
-    def set_cached_views(self, timeout: int = 60 * settings.CACHE_PROJECT_VIEWS):
-        if settings.ENABLE_CACHE:
-            key = f"project.{self.id}.views"
-            views_cache = {
-                organization.code: self.mixpanel_events.filter(
-                    organization=organization
-                ).count()
-                for organization in self.organizations.all()
-            }
-            views_cache["_total"] = self.mixpanel_events.count()
-            cache.set(key, views_cache, timeout)
-
-    def get_cached_views(self):
-        """Caches all views of the project."""
-        key = f"project.{self.id}.views"
-        if key not in cache.keys("*"):  # noqa: SIM118
-            self.set_cached_views()
-        return cache.get(key)
-
-    @classmethod
-    def get_queryset_cached_views(cls, projects: models.QuerySet["Project"]):
-        """Caches all views of the project."""
-        keys = [f"project.{project.id}.views" for project in projects]
-        cache_keys = cache.keys("*")
-        absent_projects = [
-            project
-            for project in projects
-            if f"project.{project.id}.views" not in cache_keys
-        ]
-        for project in absent_projects:
-            project.set_cached_views()
-        return cache.get_many(keys)
-
     @classmethod
-    def get_queryset_total_views(cls, projects: models.QuerySet["Project"]):
-        """Caches all views of the project."""
-        if settings.ENABLE_CACHE:
-            views = cls.get_queryset_cached_views(projects)
-            return {key.split(".")[1]: value["_total"] for key, value in views.items()}
-        return {project.id: project.mixpanel_events.count() for project in projects}
+    def get_queryset_total_views(
+        cls, projects: models.QuerySet["Project"]
+    ) -> dict[str, int]:
+        """Return the views of the projects on the whole platform in one query."""
+        return dict(
+            projects.order_by()
+            .annotate(views=Coalesce(Sum("view_counts__views"), 0))
+            .values_list("id", "views")
+        )
 
     @classmethod
     def get_queryset_organization_views(
         cls, projects: models.QuerySet["Project"], organization: "Organization"
-    ):
-        """Caches all views of the project."""
-        if settings.ENABLE_CACHE:
-            views = cls.get_queryset_cached_views(projects)
-            return {
-                key.split(".")[1]: value.get(organization.code, 0)
-                for key, value in views.items()
-            }
-        return {
-            project.id: project.mixpanel_events.filter(
-                organization=organization
-            ).count()
-            for project in projects
-        }
+    ) -> dict[str, int]:
+        """Return the views of the projects inside the organization in one query."""
+        return dict(
+            projects.order_by()
+            .annotate(
+                views=Coalesce(
+                    Sum(
+                        "view_counts__views",
+                        filter=Q(view_counts__organization=organization),
+                    ),
+                    0,
+                )
+            )
+            .values_list("id", "views")
+        )
 
     def get_views(self) -> int:
-        """Return the project's views on the whole platform."""
-        if settings.ENABLE_CACHE:
-            return self.get_cached_views().get("_total", 0)
-        return self.mixpanel_events.count()
+        """Return the project's views on the whole platform.
+
+        Prefetch `view_counts` to avoid any n+1 performance issue.
+        """
+        return sum(view_count.views for view_count in self.view_counts.all())
 
     def get_views_organizations(self, organizations: list["Organization"]) -> int:
         """Return the project's views inside the given organization.
 
         If you plan on using this method multiple time, prefetch `organizations`
-        to avoid any n+1 performance issue.
+        and `view_counts` to avoid any n+1 performance issue.
         """
-        if settings.ENABLE_CACHE:
-            if not organizations:
-                return self.get_views()
-            if not any(o in self.organizations.all() for o in organizations):
-                raise WrongProjectOrganizationError(
-                    self.title, [o.name for o in organizations]
-                )
-            return sum(self.get_cached_views().get(o.code, 0) for o in organizations)
-        return self.mixpanel_events.filter(organization__in=organizations).count()
+        if not organizations:
+            return self.get_views()
+        if not any(o in self.organizations.all() for o in organizations):
+            raise WrongProjectOrganizationError(
+                self.title, [o.name for o in organizations]
+            )
+        organizations_ids = {o.id for o in organizations}
+        return sum(
+            view_count.views
+            for view_count in self.view_counts.all()
+            if view_count.organization_id in organizations_ids
+        )
 
     def get_related_project(self) -> Optional["Project"]:
         """Return the project related to this model."""
@@ -569,49 +548,141 @@ class Project(
         return score
 
     @transaction.atomic
-    def duplicate(self, owner: Optional["ProjectUser"] = None) -> "Project":
-        header = self.header_image.duplicate(owner=owner) if self.header_image else None
+    def duplicate(
+        self,
+        owner: Optional["ProjectUser"] = None,
+        progress: Callable[[str, int, int], None] | None = None,
+    ) -> "Project":
+        """
+        Duplicate the project and its related objects in a new private project.
+
+        The related objects of each model are created with a single insert, the
+        images and the attachment files are copied concurrently in the storage, and
+        the urls of the images in the texts are rewritten in a single pass.
+
+        Args:
+            - owner (ProjectUser, optional): owner of the new project and its images
+            - progress (Callable[[str, int, int], None], optional): called after each
+                step with the name of the step, the number of steps done and the
+                total number of steps
+
+        Returns:
+            - Project: the new project
+        """
+        from apps.newsfeed.models import Newsfeed
+
+        steps = ["images", "project", "blog_entries", "related_objects", "files"]
+
+        def step_done(step: str):
+            if progress is not None:
+                progress(step, steps.index(step) + 1, len(steps))
+
+        images = list(self.images.all())
+        blog_entries = list(self.blog_entries.prefetch_related("images"))
+        blog_entries_images = {
+            blog_entry.pk: list(blog_entry.images.all()) for blog_entry in blog_entries
+        }
+        header = [self.header_image] if self.header_image else []
+        duplicated_images = self.images.model.bulk_duplicate(
+            [*header, *images, *itertools.chain(*blog_entries_images.values())],
+            owner=owner,
+        )
+        step_done("images")
+
         project = super().duplicate(
             slug=None,
             outdated_slugs=[],
-            header_image=header,
+            header_image=duplicated_images.get(self.header_image_id),
             publication_status=Project.PublicationStatus.PRIVATE,
             # TODO(remi): add this id (or fk) directly in DuplicateMixins
             duplicated_from=self.id,
         )
-
         project.categories.set(self.categories.all())
         project.organizations.set(self.organizations.all())
         project.tags.set(self.tags.all())
         project.setup_permissions(user=owner)
-
-        images_to_set = []
-        for image in self.images.all():
-            new_image = image.duplicate(owner=owner)
-            if new_image is not None:
-                images_to_set.append(new_image)
-                for identifier in [self.pk, self.slug]:
-                    project.description = project.description.replace(
-                        f"/v1/project/{identifier}/image/{image.pk}/",
-                        f"/v1/project/{project.pk}/image/{new_image.pk}/",
+        project.images.set(
+            [duplicated_images[i.pk] for i in images if i.pk in duplicated_images]
+        )
+        step_done("project")
+
+        urls = {}
+        for identifier in [self.pk, self.slug]:
+            for image in images:
+                if image.pk in duplicated_images:
+                    urls[f"/v1/project/{identifier}/image/{image.pk}/"] = (
+                        f"/v1/project/{project.pk}/image/"
+                        f"{duplicated_images[image.pk].pk}/"
                     )
-        project.images.set(images_to_set)
-
-        for blog_entry in self.blog_entries.all():
-            blog_entry.duplicate(project=project, initial_project=self, owner=owner)
-        for announcement in self.announcements.all():
-            announcement.duplicate(project=project)
-        for location in self.locations.all():
-            location.duplicate(project=project)
-        for goal in self.goals.all():
-            goal.duplicate(project=project)
-        for link in self.links.all():
-            link.duplicate(project=project)
-        for file in self.files.all():
-            file.duplicate(project=project)
-
-        Stat.objects.create(project=project)
+            for image in itertools.chain(*blog_entries_images.values()):
+                if image.pk in duplicated_images:
+                    urls[f"/v1/project/{identifier}/blog-entry-image/{image.pk}/"] = (
+                        f"/v1/project/{project.pk}/blog-entry-image/"
+                        f"{duplicated_images[image.pk].pk}/"
+                    )
+
+        def replace_urls(instance: models.Model, field: str):
+            for name in [
+                field,
+                *(f"{field}_{lang}" for lang in settings.REQUIRED_LANGUAGES),
+            ]:
+                setattr(instance, name, replace_many(getattr(instance, name), urls))
+
+        replace_urls(project, "description")
+        duplicated_blog_entries = {}
+        for blog_entry in blog_entries:
+            duplicated_blog_entry = blog_entry.clone(project=project)
+            replace_urls(duplicated_blog_entry, "content")
+            duplicated_blog_entries[blog_entry.pk] = duplicated_blog_entry
+        BlogEntry.objects.bulk_create(duplicated_blog_entries.values())
+        BlogEntry.copy_auto_translated_fields(duplicated_blog_entries)
+        BlogEntry.images.through.objects.bulk_create(
+            [
+                BlogEntry.images.through(
+                    blogentry=duplicated_blog_entries[pk],
+                    image=duplicated_images[image.pk],
+                )
+                for pk, blog_entry_images in blog_entries_images.items()
+                for image in blog_entry_images
+                if image.pk in duplicated_images
+            ]
+        )
+        step_done("blog_entries")
+
+        related_objects = {}
+        for related_name in ["announcements", "locations", "goals", "links"]:
+            related_manager = getattr(self, related_name)
+            model = related_manager.model
+            duplicates = {
+                item.pk: item.clone(project=project) for item in related_manager.all()
+            }
+            if hasattr(model, "history"):
+                bulk_create_with_history(list(duplicates.values()), model)
+            else:
+                model.objects.bulk_create(duplicates.values())
+            model.copy_auto_translated_fields(duplicates)
+            related_objects[related_name] = duplicates
+        Newsfeed.objects.bulk_create(
+            [
+                Newsfeed(
+                    announcement=announcement,
+                    type=Newsfeed.NewsfeedType.ANNOUNCEMENT,
+                )
+                for announcement in related_objects["announcements"].values()
+            ]
+        )
+        step_done("related_objects")
 
+        files = self.files.model.bulk_duplicate(self.files.all(), project)
+        step_done("files")
+
+        Stat.objects.create(
+            project=project,
+            links=len(related_objects["links"]),
+            files=len(files),
+            blog_entries=len(duplicated_blog_entries),
+            goals=len(related_objects["goals"]),
+        )
         project.save()
         return project
 
@@ -631,48 +702,78 @@ class ProjectScore(models.Model, ProjectRelated):
     def get_related_organizations(self) -> list["Organization"]:
         return self.project.get_related_organizations()
 
-    def get_completeness(self) -> float:
-        has_ressources = self.project.links.exists() or self.project.files.exists()
-        has_blogs = self.project.blog_entries.exists()
-        has_goals = self.project.goals.exists()
-        has_location = self.project.locations.exists()
-        has_rich_content = (
-            "<img" in self.project.description
-            or "<iframe" in self.project.description
-            or any(
-                "<img" in blog_entry.content or "<iframe" in blog_entry.content
-                for blog_entry in self.project.blog_entries.all()
-            )
-        )
-        description_length = len(self.project.description)
-        blog_entries_length = sum(
-            len(blog_entry.content) + len(blog_entry.title)
-            for blog_entry in self.project.blog_entries.all()
-        )
+    @staticmethod
+    def compute_completeness(
+        has_ressources: bool,
+        has_blogs: bool,
+        has_goals: bool,
+        has_location: bool,
+        has_rich_content: bool,
+        content_length: int,
+    ) -> float:
         return (
             int(has_ressources)
             + int(has_blogs)
             + int(has_goals)
             + int(has_location)
             + int(has_rich_content)
-            + math.log10(1 + description_length + blog_entries_length)
+            + math.log10(1 + content_length)
         )
 
-    def get_popularity(self) -> float:
-        follows_count = math.log(self.project.follows.count() + 1, 4)
-        views_count = math.log(self.project.get_views() + 1, 8)
-        comments_length = sum(
-            len(comment.content) for comment in self.project.comments.all()
+    @staticmethod
+    def compute_popularity(
+        comments_length: int, follows_count: int, views_count: int
+    ) -> float:
+        return (
+            math.log10(1 + comments_length)
+            + math.log(follows_count + 1, 4)
+            + math.log(views_count + 1, 8)
         )
-        return math.log10(1 + comments_length) + follows_count + views_count
 
-    def get_activity(self) -> float:
-        last_activity = self.project.updated_at
+    @staticmethod
+    def compute_activity(last_activity: datetime.datetime) -> float:
         weeks_since_last_activity = (
             timezone.localtime(timezone.now()) - last_activity
         ).days / 7
         return 10 / (1 + weeks_since_last_activity)
 
+    @staticmethod
+    def has_rich_content(content: str) -> bool:
+        return "<img" in content or "<iframe" in content
+
+    def get_completeness(self) -> float:
+        blog_entries = self.project.blog_entries.all()
+        return self.compute_completeness(
+            has_ressources=self.project.links.exists() or self.project.files.exists(),
+            has_blogs=self.project.blog_entries.exists(),
+            has_goals=self.project.goals.exists(),
+            has_location=self.project.locations.exists(),
+            has_rich_content=(
+                self.has_rich_content(self.project.description)
+                or any(
+                    self.has_rich_content(blog_entry.content)
+                    for blog_entry in blog_entries
+                )
+            ),
+            content_length=len(self.project.description)
+            + sum(
+                len(blog_entry.content) + len(blog_entry.title)
+                for blog_entry in blog_entries
+            ),
+        )
+
+    def get_popularity(self) -> float:
+        return self.compute_popularity(
+            comments_length=sum(
+                len(comment.content) for comment in self.project.comments.all()
+            ),
+            follows_count=self.project.follows.count(),
+            views_count=self.project.get_views(),
+        )
+
+    def get_activity(self) -> float:
+        return self.compute_activity(self.project.updated_at)
+
     def set_score(self) -> "ProjectScore":
         completeness = self.get_completeness()
         popularity = self.get_popularity()
@@ -684,6 +785,106 @@ class ProjectScore(models.Model, ProjectRelated):
         self.score = score
         return self
 
+    @classmethod
+    def calculate_scores(cls, projects: QuerySet["Project"] | None = None) -> int:
+        """
+        Calculate and save the scores of the given projects with a few grouped
+        aggregate queries for each chunk of `SCORES_CHUNK_SIZE` projects.
+
+        Args:
+            - projects (QuerySet[Project] | None): The projects to score, all the
+                projects if None.
+
+        Returns:
+            - int: The number of scores saved.
+        """
+        if projects is None:
+            projects = Project.objects.all()
+        rows = projects.values_list("id", "description", "updated_at", "score__id")
+        count = 0
+        for chunk in itertools.batched(
+            rows.iterator(chunk_size=settings.SCORES_CHUNK_SIZE),
+            settings.SCORES_CHUNK_SIZE,
+        ):
+            count += cls._calculate_chunk(chunk)
+        return count
+
+    @classmethod
+    def _calculate_chunk(cls, rows: list[tuple]) -> int:
+        ids = [row[0] for row in rows]
+
+        def related(name: str) -> QuerySet:
+            model = Project._meta.get_field(name).related_model
+            return model._default_manager.filter(project_id__in=ids)
+
+        def project_ids(name: str) -> set[int]:
+            return set(related(name).values_list("project_id", flat=True).distinct())
+
+        ressources = project_ids("links") | project_ids("files")
+        goals = project_ids("goals")
+        locations = project_ids("locations")
+        blogs = {
+            row["project_id"]: row
+            for row in related("blog_entries")
+            .values("project_id")
+            .annotate(
+                length=Coalesce(Sum(Length("content") + Length("title")), 0),
+                rich=Count(
+                    "id",
+                    filter=Q(content__contains="<img") | Q(content__contains="<iframe"),
+                ),
+            )
+        }
+        follows = dict(
+            related("follows")
+            .values("project_id")
+            .annotate(count=Count("id"))
+            .values_list("project_id", "count")
+        )
+        comments = dict(
+            related("comments")
+            .values("project_id")
+            .annotate(length=Coalesce(Sum(Length("content")), 0))
+            .values_list("project_id", "length")
+        )
+        views = dict(
+            related("view_counts")
+            .values("project_id")
+            .annotate(views=Sum("views"))
+            .values_list("project_id", "views")
+        )
+
+        created, updated = [], []
+        for project_id, description, updated_at, score_id in rows:
+            description = description or ""
+            blog = blogs.get(project_id, {"length": 0, "rich": 0})
+            score = cls(
+                id=score_id,
+                project_id=project_id,
+                completeness=cls.compute_completeness(
+                    has_ressources=project_id in ressources,
+                    has_blogs=project_id in blogs,
+                    has_goals=project_id in goals,
+                    has_location=project_id in locations,
+                    has_rich_content=cls.has_rich_content(description)
+                    or blog["rich"] > 0,
+                    content_length=len(description) + blog["length"],
+                ),
+                popularity=cls.compute_popularity(
+                    comments_length=comments.get(project_id, 0),
+                    follows_count=follows.get(project_id, 0),
+                    views_count=views.get(project_id, 0),
+                ),
+                activity=cls.compute_activity(updated_at),
+            )
+            score.score = score.completeness + score.popularity + score.activity
+            (updated if score_id else created).append(score)
+        cls.objects.bulk_create(created)
+        cls.objects.bulk_update(
+            updated, ["completeness", "popularity", "activity", "score"]
+        )
+        return len(rows)
+
 
 class LinkedProject(models.Model, ProjectRelated):
     """Store unidirectional link between projects.
@@ -775,27 +976,6 @@ class BlogEntry(HasAutoTranslatedFields, ProjectRelated, DuplicableModel, models
         """Return the organizations related to this model."""
         return self.project.get_related_organizations()
 
-    def duplicate(
-        self,
-        project: "Project",
-        initial_project: Optional["Project"] = None,
-        owner: Optional["ProjectUser"] = None,
-    ) -> "BlogEntry":
-        blog_entry = super().duplicate(project=project)
-        images_to_set = []
-        for image in self.images.all():
-            new_image = image.duplicate(owner=owner)
-            if new_image is not None:
-                images_to_set.append(new_image)
-                for identifier in [initial_project.pk, initial_project.slug]:
-                    blog_entry.content = blog_entry.content.replace(
-                        f"/v1/project/{identifier}/blog-entry-image/{image.pk}/",
-                        f"/v1/project/{project.pk}/blog-entry-image/{new_image.pk}/",
-                    )
-        blog_entry.images.set(images_to_set)
-        blog_entry.save()
-        return blog_entry
-
 
 class Goal(HasAutoTranslatedFields, ProjectRelated, DuplicableModel, models.Model):
     """Goal of a project.
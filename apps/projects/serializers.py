@@ -29,7 +29,7 @@ from apps.commons.serializers import (
 from apps.feedbacks.models import Comment, Follow
 from apps.feedbacks.serializers import CommentSerializer
 from apps.files.models import Image
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.modules.serializers import ModulesSerializers
 from apps.notifications.tasks import notify_new_project, notify_project_changes
 from apps.organizations.models import Organization, ProjectCategory, Template
@@ -243,6 +243,7 @@ class ProjectSerializer(
 
     class Meta:
         model = Project
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = ["is_locked", "slug"]
         fields = read_only_fields + [
             "id",
@@ -5,6 +5,7 @@ from django.conf import settings
 from django.db.models import Q
 from django.utils import timezone
 
+from apps.accounts.models import ProjectUser
 from apps.commons.utils import clear_memory
 from projects.celery import app
 
@@ -24,30 +25,28 @@ def remove_old_projects():
 @app.task(name="apps.projects.tasks.calculate_projects_scores")
 @clear_memory
 def calculate_projects_scores():
-    """calculate projects scores, get all projectsscore, calculate scores
-    next we update all user/score during a bulk_update
+    """calculate projects scores with grouped queries,
+    next we create or update all projects scores during bulk operations
     """
+    ProjectScore.calculate_scores()
 
-    bulk_update: list[ProjectScore] = []
-    bulk_create: list[ProjectScore] = []
 
-    for project in (
-        Project.objects.select_related("score")
-        .prefetch_related(
-            "links", "files", "blog_entries", "locations", "goals", "follows"
-        )
-        .all()
-    ):
-        project.calculate_score()
-        if project.score.pk:
-            bulk_update.append(project.score)
-        else:
-            bulk_create.append(project.score)
-
-    ProjectScore.objects.bulk_update(bulk_create)
-    ProjectScore.objects.bulk_update(
-        bulk_update, ["completeness", "popularity", "activity", "score"]
-    )
+@app.task(name="apps.projects.tasks.duplicate_project", bind=True)
+def duplicate_project(self, project_pk: str, owner_pk: int | None = None) -> str:
+    """Duplicate a project in the background, reporting the progress of each step
+    in the `PROGRESS` state of the task.
+    """
+
+    def progress(step: str, current: int, total: int):
+        if not self.request.called_directly:
+            self.update_state(
+                state="PROGRESS",
+                meta={"step": step, "current": current, "total": total},
+            )
+
+    project = Project.objects.get(pk=project_pk)
+    owner = ProjectUser.objects.filter(pk=owner_pk).first()
+    return project.duplicate(owner=owner, progress=progress).pk
 
 
 @app.task(name="apps.projects.tasks.remove_old_project_versions")
@@ -0,0 +1,43 @@
+from apps.commons.test import JwtAPITestCase
+from apps.feedbacks.factories import CommentFactory, FollowFactory
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import (
+    BlogEntryFactory,
+    GoalFactory,
+    LocationFactory,
+    ProjectFactory,
+)
+from apps.projects.models import ProjectScore
+from apps.projects.tasks import calculate_projects_scores
+
+
+class CalculateProjectsScoresTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.projects = ProjectFactory.create_batch(3, organizations=[cls.organization])
+        cls.empty_project = ProjectFactory(
+            organizations=[cls.organization], description=""
+        )
+        project = cls.projects[0]
+        BlogEntryFactory.create_batch(2, project=project)
+        BlogEntryFactory(project=project, content='<img src="image.png">')
+        GoalFactory(project=project)
+        LocationFactory(project=project)
+        CommentFactory.create_batch(2, project=project)
+        FollowFactory(project=project)
+        BlogEntryFactory(project=cls.projects[1])
+        FollowFactory(project=cls.projects[1])
+        # An outdated score is updated
+        ProjectScore.objects.create(project=cls.projects[2], score=-1)
+
+    def test_calculate_projects_scores(self):
+        calculate_projects_scores()
+        for project in [*self.projects, self.empty_project]:
+            score = ProjectScore.objects.get(project=project)
+            expected = ProjectScore(project=project).set_score()
+            self.assertAlmostEqual(score.completeness, expected.completeness)
+            self.assertAlmostEqual(score.popularity, expected.popularity)
+            self.assertAlmostEqual(score.activity, expected.activity)
+            self.assertAlmostEqual(score.score, expected.score)
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from apps.files import tasks as files_tasks
+from apps.files.factories import AttachmentFileFactory, AttachmentLinkFactory
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import BlogEntryFactory, GoalFactory, ProjectFactory
+from apps.projects.models import Goal, Project
+from apps.projects.tasks import duplicate_project
+from services.translator.models import AutoTranslatedField
+
+
+class DuplicateProjectTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.user = UserFactory()
+        cls.project = ProjectFactory(organizations=[cls.organization])
+        cls.image = cls.get_test_image()
+        cls.image.render_variations()
+        cls.project.images.add(cls.image)
+        cls.project.description = (
+            f'<img src="/v1/project/{cls.project.slug}/image/{cls.image.pk}/" />'
+        )
+        cls.project.save()
+        cls.blog_entry = BlogEntryFactory(project=cls.project)
+        cls.blog_entry_image = cls.get_test_image()
+        cls.blog_entry.images.add(cls.blog_entry_image)
+        cls.blog_entry.content = (
+            f'<img src="/v1/project/{cls.project.pk}/blog-entry-image/'
+            f'{cls.blog_entry_image.pk}/" />'
+        )
+        cls.blog_entry.save()
+        cls.goal = GoalFactory(project=cls.project)
+        AutoTranslatedField.objects.filter(
+            content_type=ContentType.objects.get_for_model(Goal),
+            object_id=str(cls.goal.pk),
+        ).update(up_to_date=True)
+        AttachmentLinkFactory(project=cls.project)
+        AttachmentFileFactory(project=cls.project)
+
+    def test_duplicate_project(self):
+        with patch.object(files_tasks.render_image_variations, "delay"):
+            pk = duplicate_project(self.project.pk, self.user.pk)
+        duplicated_project = Project.objects.get(pk=pk)
+        self.assertEqual(duplicated_project.duplicated_from, self.project.pk)
+
+        image = duplicated_project.images.get()
+        self.assertNotEqual(image.pk, self.image.pk)
+        self.assertEqual(image.owner, self.user)
+        self.assertFalse(image.variations_pending)
+        self.assertTrue(image.file.storage.exists(image.file.small.name))
+        self.assertEqual(
+            duplicated_project.description,
+            f'<img src="/v1/project/{duplicated_project.pk}/image/{image.pk}/" />',
+        )
+
+        blog_entry = duplicated_project.blog_entries.get()
+        blog_entry_image = blog_entry.images.get()
+        self.assertNotEqual(blog_entry_image.pk, self.blog_entry_image.pk)
+        self.assertEqual(
+            blog_entry.content,
+            f'<img src="/v1/project/{duplicated_project.pk}/blog-entry-image/'
+            f'{blog_entry_image.pk}/" />',
+        )
+
+        goal = duplicated_project.goals.get()
+        self.assertTrue(
+            AutoTranslatedField.objects.filter(
+                content_type=ContentType.objects.get_for_model(Goal),
+                object_id=str(goal.pk),
+                up_to_date=True,
+            ).exists()
+        )
+        link = duplicated_project.links.get()
+        self.assertEqual(link.history.count(), 1)
+        file = duplicated_project.files.get()
+        self.assertNotEqual(file.file.name, self.project.files.get().file.name)
+        self.assertEqual(duplicated_project.stat.links, 1)
+        self.assertEqual(duplicated_project.stat.files, 1)
+
+    def test_duplicate_project_progress(self):
+        steps = []
+        self.project.duplicate(
+            owner=self.user, progress=lambda *args: steps.append(args)
+        )
+        self.assertEqual(
+            steps,
+            [
+                ("images", 1, 5),
+                ("project", 2, 5),
+                ("blog_entries", 3, 5),
+                ("related_objects", 4, 5),
+                ("files", 5, 5),
+            ],
+        )
@@ -1,6 +1,7 @@
 import datetime
 import json
 import random
+from unittest.mock import MagicMock, patch
 
 from django.core import serializers
 from django.urls import reverse
@@ -29,6 +30,7 @@ from apps.projects.factories import (
     ProjectFactory,
 )
 from apps.projects.models import Project
+from apps.projects.tasks import duplicate_project
 from apps.skills.factories import TagFactory
 
 
@@ -587,6 +589,47 @@ class DuplicateProjectTestCase(JwtAPITestCase):
 
             self.check_duplicated_project(duplicate, self.project)
 
+    def get_duplicate_status(self, task_status, name=None, args=None, result=None):
+        task_result = MagicMock(status=task_status, args=args, result=result)
+        task_result.name = name
+        task_result.successful.return_value = task_status == "SUCCESS"
+        self.client.force_authenticate(UserFactory(groups=[get_superadmins_group()]))
+        with patch.object(duplicate_project, "AsyncResult", return_value=task_result):
+            return self.client.get(
+                reverse("Project-duplicate-status", args=(self.project.id, "task"))
+            )
+
+    def test_duplicate_status(self):
+        duplicate = ProjectFactory(
+            organizations=[self.organization], duplicated_from=self.project.id
+        )
+        response = self.get_duplicate_status(
+            "SUCCESS", duplicate_project.name, [self.project.id, None], duplicate.id
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.json()
+        self.assertEqual(content["status"], "SUCCESS")
+        self.assertEqual(content["project"]["id"], duplicate.id)
+
+    def test_duplicate_status_pending(self):
+        response = self.get_duplicate_status("PENDING")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"task_id": "task", "status": "PENDING"})
+
+    @parameterized.expand(
+        [
+            ("apps.projects.tasks.remove_old_projects", True, "result"),
+            ("apps.projects.tasks.duplicate_project", False, "result"),
+            ("apps.projects.tasks.duplicate_project", True, 1),
+        ]
+    )
+    def test_duplicate_status_other_task(self, name, same_project, result):
+        project_id = self.project.id if same_project else "other"
+        response = self.get_duplicate_status(
+            "SUCCESS", name, [project_id, None], result
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class LockUnlockProjectTestCase(JwtAPITestCase):
     @classmethod
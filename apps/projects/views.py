@@ -2,10 +2,10 @@ import uuid
 
 from django.apps import apps
 from django.conf import settings
-from django.core.cache import cache
 from django.db import transaction
 from django.db.models import QuerySet
-from django.shortcuts import redirect
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect
 from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, extend_schema
@@ -22,7 +22,11 @@ from simple_history.utils import update_change_reason
 from apps.accounts.models import ProjectUser
 from apps.accounts.permissions import HasBasePermission
 from apps.analytics.models import Stat
-from apps.commons.cache import clear_cache_with_key, redis_cache_view
+from apps.commons.cache import (
+    clear_cache_with_key,
+    invalidate_cache_tag,
+    redis_cache_view,
+)
 from apps.commons.permissions import IsOwner, ReadOnly
 from apps.commons.utils import map_action_to_permission
 from apps.commons.views import (
@@ -85,6 +89,7 @@ from .serializers import (
     ProjectVersionListSerializer,
     ProjectVersionSerializer,
 )
+from .tasks import duplicate_project
 
 
 class ProjectViewSet(
@@ -154,14 +159,14 @@ class ProjectViewSet(
             and changes.get("publication_status")
             and project.announcements.exists()
         ):
-            cache.delete_many(cache.keys("announcements_list_cache*"))
+            invalidate_cache_tag("announcements_list_cache")
         if changes.get("life_status", "") == Project.LifeStatus.TO_REVIEW:
             notify_ready_for_review.delay(project.pk, self.request.user.pk)
         return project
 
     def perform_destroy(self, instance):
         if settings.ENABLE_CACHE and instance.announcements.exists():
-            cache.delete_many(cache.keys("announcements_list_cache*"))
+            invalidate_cache_tag("announcements_list_cache")
         super().perform_destroy(instance)
 
     @extend_schema(
@@ -193,6 +198,12 @@ class ProjectViewSet(
     def duplicate(self, request, *args, **kwargs):
         """Duplicate a given project."""
         project = self.get_object()
+        if request.query_params.get("background", "false").lower() in ["true", "1"]:
+            task = duplicate_project.delay(project.pk, request.user.pk)
+            return Response(
+                {"task_id": task.id, "status": task.status},
+                status=status.HTTP_202_ACCEPTED,
+            )
         duplicated_project = project.duplicate(owner=request.user)
         context = {"request": request}
         return Response(
@@ -200,6 +211,58 @@ class ProjectViewSet(
             status=status.HTTP_201_CREATED,
         )
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "id",
+                location=OpenApiParameter.PATH,
+                description="ID of the duplicated project",
+            ),
+            OpenApiParameter(
+                "task_id",
+                location=OpenApiParameter.PATH,
+                description="ID of the background duplication",
+            ),
+        ],
+    )
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="duplicate/(?P<task_id>[^/]+)",
+        permission_classes=[
+            IsAuthenticated,
+            HasBasePermission("duplicate_project", "projects")
+            | HasOrganizationPermission("duplicate_project")
+            | HasProjectPermission("duplicate_project"),
+        ],
+    )
+    def duplicate_status(self, request, task_id: str, *args, **kwargs):
+        """Get the progress of a background duplication, and the new project once
+        it is done."""
+        project = self.get_object()
+        result = duplicate_project.AsyncResult(task_id)
+        # Unknown task ids are reported as pending by Celery, any other result must
+        # be a duplication of this project
+        if result.status != "PENDING" and (
+            result.name != duplicate_project.name
+            or not result.args
+            or str(result.args[0]) != str(project.pk)
+        ):
+            raise Http404
+        data = {"task_id": task_id, "status": result.status}
+        if result.status == "PROGRESS":
+            data.update(result.info)
+        elif result.successful():
+            if not isinstance(result.result, str):
+                raise Http404
+            duplicated_project = get_object_or_404(
+                Project, pk=result.result, duplicated_from=project.id
+            )
+            data["project"] = ProjectSerializer(
+                duplicated_project, context={"request": request}
+            ).data
+        return Response(data)
+
     @action(
         detail=True,
         methods=["DELETE"],
@@ -1,27 +1,35 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from datetime import date
+from typing import Any
 
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.core.exceptions import MultipleObjectsReturned
 from django.db import models
+from django.db.models import F, QuerySet
 from django.utils.html import strip_tags
 from django_opensearch_dsl import Document, fields
 from django_opensearch_dsl.registries import registry
+from opensearchpy.helpers.query import Q
 
-from apps.accounts.models import PeopleGroup, ProjectUser
-from apps.organizations.models import ProjectCategory
+from apps.accounts.models import PeopleGroup, PrivacySettings, ProjectUser
+from apps.commons.models import GroupData
+from apps.organizations.models import Organization, ProjectCategory
 from apps.projects.models import Project
 from apps.skills.models import Skill, Tag
 
 from .models import SearchObject
+from .utils import SearchPermissions
 
 
 class TranslatedDocument(Document):
     """
-    Base document with helper methods for translated fields.
+    Base document with helper methods for translated fields and bulk indexing.
     """
 
+    # Data computed by `prepare_bulk` for the current chunk, by name and instance pk
+    _bulk_data: dict[str, dict[Any, Any]] = {}
+
     def _get_field_translation(
         self,
         instance: models.Model,
@@ -57,6 +65,91 @@ class TranslatedDocument(Document):
             ]
         )
 
+    def prepare_suggestions(self, instance: models.Model, field_name: str) -> list[str]:
+        """
+        Return the distinct values of a field and of its translations, used by the
+        autocomplete. The first one is the original value, returned as title.
+        """
+        values = [
+            getattr(instance, field_name, "") or "",
+            *[
+                self._get_field_translation(instance, field_name, lang)
+                for lang in settings.REQUIRED_LANGUAGES
+            ],
+        ]
+        return list(dict.fromkeys(value for value in values if value))
+
+    @classmethod
+    def get_visibility_query(cls, permissions: SearchPermissions) -> Q:
+        """
+        Return the OpenSearch query restricting this index to the documents the
+        owner of the given permissions can see.
+        """
+        raise NotImplementedError()
+
+    def get_bulk_queryset(self) -> QuerySet:
+        """
+        Return the queryset indexed in bulk, with the relations used by the
+        preparers.
+        """
+        return self.get_queryset()
+
+    def prepare_bulk(self, instances: list[models.Model]) -> dict[str, dict[Any, Any]]:
+        """
+        Compute in a few queries the data used by the preparers for a chunk of
+        instances, by name and instance pk.
+        """
+        return {}
+
+    def get_bulk_data(self, name: str, instance: models.Model) -> Any | None:
+        """Return the data computed by `prepare_bulk` for the instance, if any."""
+        return self._bulk_data.get(name, {}).get(instance.pk)
+
+    @staticmethod
+    def group_by_related(
+        queryset: QuerySet,
+        related_field: str,
+        instances: list[models.Model],
+        **filters,
+    ) -> dict[Any, list[models.Model]]:
+        """
+        Return the objects of the queryset related to each instance through
+        `related_field`, by instance pk, in a single query.
+
+        The filters are applied in the same `filter` call as the relation, so
+        they apply to the same rows of multi-valued relations.
+        """
+        related = {instance.pk: [] for instance in instances}
+        queryset = (
+            queryset.filter(**{f"{related_field}__in": instances}, **filters)
+            .annotate(indexed_related_pk=F(related_field))
+            .distinct()
+        )
+        for obj in queryset:
+            related[obj.indexed_related_pk].append(obj)
+        return related
+
+    def get_bulk_actions(
+        self, chunk_size: int, pks: Iterable[Any] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream the indexing actions of all the documents, or only of the instances
+        with the given pks, one chunk of instances at a time.
+        """
+        queryset = self.get_bulk_queryset().order_by("pk")
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk[:chunk_size])
+            if not chunk:
+                break
+            self._bulk_data = self.prepare_bulk(chunk)
+            yield from self._get_actions(chunk, "index")
+            last_pk = chunk[-1].pk
+        self._bulk_data = {}
+
 
 @registry.register_document
 class UserDocument(TranslatedDocument):
@@ -66,7 +159,7 @@ class UserDocument(TranslatedDocument):
     class Django:
         model = ProjectUser
         fields = ["id", "given_name", "family_name", "email", "personal_email"]
-        related_models = [Tag, Skill]
+        related_models = [Tag, Skill, PrivacySettings]
 
     search_object_id = fields.IntegerField()
     last_update = fields.DateField()
@@ -75,8 +168,20 @@ class UserDocument(TranslatedDocument):
     skills = fields.TextField()
     people_groups = fields.TextField()
     projects = fields.TextField()
+    suggest = fields.SearchAsYouTypeField()
+    publication_status = fields.KeywordField()
+    organizations = fields.IntegerField(multi=True)
+    sdgs = fields.IntegerField(multi=True)
+    skill_tags = fields.IntegerField(multi=True)
+    mentor_skill_tags = fields.IntegerField(multi=True)
+    mentoree_skill_tags = fields.IntegerField(multi=True)
+    can_mentor = fields.BooleanField(multi=True)
+    needs_mentor = fields.BooleanField(multi=True)
 
     def prepare_search_object_id(self, instance: ProjectUser) -> int:
+        search_object_id = self.get_bulk_data("search_object_id", instance)
+        if search_object_id is not None:
+            return search_object_id
         try:
             search_object, _ = SearchObject.objects.update_or_create(
                 type=SearchObject.SearchObjectType.USER,
@@ -96,6 +201,9 @@ class UserDocument(TranslatedDocument):
     def prepare_job(self, instance: ProjectUser) -> str:
         return self.prepare_auto_translated_field(instance, "job")
 
+    def prepare_suggest(self, instance: ProjectUser) -> list[str]:
+        return [f"{instance.given_name} {instance.family_name}".strip()]
+
     def prepare_content(self, instance: ProjectUser) -> str:
         return " ".join(
             [
@@ -115,26 +223,107 @@ class UserDocument(TranslatedDocument):
         )
 
     def prepare_people_groups(self, instance: ProjectUser) -> str:
+        people_groups = self.get_bulk_data("people_groups", instance)
+        if people_groups is None:
+            people_groups = PeopleGroup.objects.filter(groups__users=instance)
         return " ".join(
             [
                 self.prepare_auto_translated_field(people_group, "name")
-                for people_group in PeopleGroup.objects.filter(groups__users=instance)
+                for people_group in people_groups
             ]
         )
 
     def prepare_projects(self, instance: ProjectUser) -> str:
+        projects = self.get_bulk_data("projects", instance)
+        if projects is None:
+            projects = Project.objects.filter(groups__users=instance)
         return " ".join(
             [
                 self.prepare_auto_translated_field(project, "title")
-                for project in Project.objects.filter(groups__users=instance)
+                for project in projects
             ]
         )
 
-    def get_instances_from_related(self, related: Tag | Skill) -> Iterable[ProjectUser]:
+    def prepare_publication_status(self, instance: ProjectUser) -> str:
+        try:
+            return instance.privacy_settings.publication_status
+        except ProjectUser.privacy_settings.RelatedObjectDoesNotExist:
+            return PrivacySettings.PrivacyChoices.HIDE
+
+    def prepare_organizations(self, instance: ProjectUser) -> list[int]:
+        organizations = self.get_bulk_data("organizations", instance)
+        if organizations is None:
+            organizations = Organization.objects.filter(
+                groups__users=instance
+            ).distinct()
+        return [organization.id for organization in organizations]
+
+    def prepare_sdgs(self, instance: ProjectUser) -> list[int]:
+        return instance.sdgs or []
+
+    def prepare_skill_tags(self, instance: ProjectUser) -> list[int]:
+        return list({skill.tag_id for skill in instance.skills.all()})
+
+    def prepare_mentor_skill_tags(self, instance: ProjectUser) -> list[int]:
+        return list(
+            {skill.tag_id for skill in instance.skills.all() if skill.can_mentor}
+        )
+
+    def prepare_mentoree_skill_tags(self, instance: ProjectUser) -> list[int]:
+        return list(
+            {skill.tag_id for skill in instance.skills.all() if skill.needs_mentor}
+        )
+
+    def prepare_can_mentor(self, instance: ProjectUser) -> list[bool]:
+        return list({skill.can_mentor for skill in instance.skills.all()})
+
+    def prepare_needs_mentor(self, instance: ProjectUser) -> list[bool]:
+        return list({skill.needs_mentor for skill in instance.skills.all()})
+
+    def get_bulk_queryset(self) -> QuerySet[ProjectUser]:
+        return (
+            self.get_queryset()
+            .select_related("privacy_settings")
+            .prefetch_related("skills__tag")
+        )
+
+    def prepare_bulk(self, instances: list[ProjectUser]) -> dict[str, dict[int, Any]]:
+        return {
+            "search_object_id": SearchObject.bulk_upsert(
+                SearchObject.SearchObjectType.USER, instances, "last_login"
+            ),
+            "people_groups": self.group_by_related(
+                PeopleGroup.objects.all(), "groups__users", instances
+            ),
+            "projects": self.group_by_related(
+                Project.objects.all(), "groups__users", instances
+            ),
+            "organizations": self.group_by_related(
+                Organization.objects.only("id"), "groups__users", instances
+            ),
+        }
+
+    @classmethod
+    def get_visibility_query(cls, permissions: SearchPermissions) -> Q:
+        query = Q("term", publication_status=PrivacySettings.PrivacyChoices.PUBLIC) | (
+            Q("term", publication_status=PrivacySettings.PrivacyChoices.ORGANIZATION)
+            & Q("terms", organizations=permissions.org_user_organizations)
+        )
+        if permissions.user_organizations:
+            query |= Q("terms", organizations=permissions.user_organizations)
+        if permissions.user_id is not None:
+            query |= Q("term", id=permissions.user_id)
+        return query
+
+    def get_instances_from_related(
+        self, related: Tag | Skill | PrivacySettings
+    ) -> Iterable[ProjectUser]:
         if isinstance(related, Tag):
             return ProjectUser.objects.filter(skills__tag=related).distinct()
         if isinstance(related, Skill):
             return related.user
+        if isinstance(related, PrivacySettings):
+            return related.user
         return []
 
 
@@ -153,8 +342,17 @@ class PeopleGroupDocument(TranslatedDocument):
     name = fields.TextField()
     content = fields.TextField()
     members = fields.TextField()
+    suggest = fields.SearchAsYouTypeField()
+    publication_status = fields.KeywordField()
+    is_root = fields.BooleanField()
+    organizations = fields.IntegerField(multi=True)
+    permission_groups = fields.IntegerField(multi=True)
+    sdgs = fields.IntegerField(multi=True)
 
     def prepare_search_object_id(self, instance: PeopleGroup) -> int:
+        search_object_id = self.get_bulk_data("search_object_id", instance)
+        if search_object_id is not None:
+            return search_object_id
         try:
             search_object, _ = SearchObject.objects.update_or_create(
                 type=SearchObject.SearchObjectType.PEOPLE_GROUP,
@@ -175,13 +373,58 @@ class PeopleGroupDocument(TranslatedDocument):
     def prepare_name(self, instance: PeopleGroup) -> str:
         return self.prepare_auto_translated_field(instance, "name")
 
+    def prepare_suggest(self, instance: PeopleGroup) -> list[str]:
+        return self.prepare_suggestions(instance, "name")
+
     def prepare_content(self, instance: PeopleGroup) -> str:
         return self.prepare_auto_translated_field(instance, "description", html=True)
 
     def prepare_members(self, instance: PeopleGroup) -> str:
-        return " ".join(
-            [member.get_full_name() for member in instance.get_all_members()]
+        members = self.get_bulk_data("members", instance)
+        if members is None:
+            members = instance.get_all_members()
+        return " ".join([member.get_full_name() for member in members])
+
+    def prepare_organizations(self, instance: PeopleGroup) -> list[int]:
+        return [instance.organization_id] if instance.organization_id else []
+
+    def prepare_permission_groups(self, instance: PeopleGroup) -> list[int]:
+        return [group.id for group in instance.groups.all()]
+
+    def prepare_sdgs(self, instance: PeopleGroup) -> list[int]:
+        return instance.sdgs or []
+
+    def get_bulk_queryset(self) -> QuerySet[PeopleGroup]:
+        return self.get_queryset().prefetch_related("groups")
+
+    def prepare_bulk(self, instances: list[PeopleGroup]) -> dict[str, dict[int, Any]]:
+        return {
+            "search_object_id": SearchObject.bulk_upsert(
+                SearchObject.SearchObjectType.PEOPLE_GROUP, instances, "updated_at"
+            ),
+            "members": self.group_by_related(
+                ProjectUser.objects.only("id", "given_name", "family_name"),
+                "groups__people_groups",
+                instances,
+                groups__data__role__in=[
+                    GroupData.Role.LEADERS,
+                    GroupData.Role.MANAGERS,
+                    GroupData.Role.MEMBERS,
+                ],
+            ),
+        }
+
+    @classmethod
+    def get_visibility_query(cls, permissions: SearchPermissions) -> Q:
+        query = Q("term", publication_status=PeopleGroup.PublicationStatus.PUBLIC) | (
+            Q("term", publication_status=PeopleGroup.PublicationStatus.ORG)
+            & Q("terms", organizations=permissions.org_people_group_organizations)
         )
+        if permissions.people_group_organizations:
+            query |= Q("terms", organizations=permissions.people_group_organizations)
+        if permissions.groups:
+            query |= Q("terms", permission_groups=permissions.groups)
+        return Q("term", is_root=False) & query
 
     def get_instances_from_related(self, related: Group) -> Iterable[PeopleGroup]:
         if isinstance(related, Group):
@@ -207,8 +450,20 @@ class ProjectDocument(TranslatedDocument):
     members = fields.TextField()
     categories = fields.TextField()
     tags = fields.TextField()
+    suggest = fields.SearchAsYouTypeField()
+    publication_status = fields.KeywordField()
+    organizations = fields.IntegerField(multi=True)
+    permission_groups = fields.IntegerField(multi=True)
+    sdgs = fields.IntegerField(multi=True)
+    language = fields.KeywordField()
+    category_ids = fields.IntegerField(multi=True)
+    tag_ids = fields.IntegerField(multi=True)
+    member_ids = fields.IntegerField(multi=True)
 
     def prepare_search_object_id(self, instance: Project) -> int:
+        search_object_id = self.get_bulk_data("search_object_id", instance)
+        if search_object_id is not None:
+            return search_object_id
         try:
             search_object, _ = SearchObject.objects.update_or_create(
                 type=SearchObject.SearchObjectType.PROJECT,
@@ -228,6 +483,9 @@ class ProjectDocument(TranslatedDocument):
     def prepare_title(self, instance: Project) -> str:
         return self.prepare_auto_translated_field(instance, "title")
 
+    def prepare_suggest(self, instance: Project) -> list[str]:
+        return self.prepare_suggestions(instance, "title")
+
     def prepare_purpose(self, instance: Project) -> str:
         return self.prepare_auto_translated_field(instance, "purpose")
 
@@ -244,9 +502,10 @@ class ProjectDocument(TranslatedDocument):
         )
 
     def prepare_members(self, instance: Project) -> str:
-        return " ".join(
-            [member.get_full_name() for member in instance.get_all_members()]
-        )
+        members = self.get_bulk_data("members", instance)
+        if members is None:
+            members = instance.get_all_members()
+        return " ".join([member.get_full_name() for member in members])
 
     def prepare_categories(self, instance: Project) -> str:
         return " ".join(
@@ -261,6 +520,67 @@ class ProjectDocument(TranslatedDocument):
             [self.prepare_translated_field(tag, "title") for tag in instance.tags.all()]
         )
 
+    def prepare_organizations(self, instance: Project) -> list[int]:
+        return [organization.id for organization in instance.organizations.all()]
+
+    def prepare_permission_groups(self, instance: Project) -> list[int]:
+        return [group.id for group in instance.groups.all()]
+
+    def prepare_sdgs(self, instance: Project) -> list[int]:
+        return instance.sdgs or []
+
+    def prepare_language(self, instance: Project) -> str:
+        return instance.language
+
+    def prepare_category_ids(self, instance: Project) -> list[int]:
+        return [category.id for category in instance.categories.all()]
+
+    def prepare_tag_ids(self, instance: Project) -> list[int]:
+        return [tag.id for tag in instance.tags.all()]
+
+    def prepare_member_ids(self, instance: Project) -> list[int]:
+        members = self.get_bulk_data("member_ids", instance)
+        if members is None:
+            members = ProjectUser.objects.filter(groups__projects=instance)
+        return list({member.id for member in members})
+
+    def get_bulk_queryset(self) -> QuerySet[Project]:
+        return self.get_queryset().prefetch_related(
+            "blog_entries", "categories", "tags", "organizations", "groups"
+        )
+
+    def prepare_bulk(self, instances: list[Project]) -> dict[str, dict[str, Any]]:
+        return {
+            "search_object_id": SearchObject.bulk_upsert(
+                SearchObject.SearchObjectType.PROJECT, instances, "updated_at"
+            ),
+            "members": self.group_by_related(
+                ProjectUser.objects.only("id", "given_name", "family_name"),
+                "groups__projects",
+                instances,
+                groups__data__role__in=[
+                    GroupData.Role.OWNERS,
+                    GroupData.Role.REVIEWERS,
+                    GroupData.Role.MEMBERS,
+                ],
+            ),
+            "member_ids": self.group_by_related(
+                ProjectUser.objects.only("id"), "groups__projects", instances
+            ),
+        }
+
+    @classmethod
+    def get_visibility_query(cls, permissions: SearchPermissions) -> Q:
+        query = Q("term", publication_status=Project.PublicationStatus.PUBLIC) | (
+            Q("term", publication_status=Project.PublicationStatus.ORG)
+            & Q("terms", organizations=permissions.org_project_organizations)
+        )
+        if permissions.project_organizations:
+            query |= Q("terms", organizations=permissions.project_organizations)
+        if permissions.groups:
+            query |= Q("terms", permission_groups=permissions.groups)
+        return query
+
     def get_instances_from_related(
         self, related: ProjectCategory | Tag | Group
     ) -> Iterable[Project]:
@@ -286,6 +606,7 @@ class TagDocument(TranslatedDocument):
     title = fields.TextField()
     content = fields.TextField()
     alternative_titles = fields.TextField()
+    suggest = fields.SearchAsYouTypeField()
 
     def prepare_title(self, instance: Tag) -> str:
         return self.prepare_translated_field(instance, "title")
@@ -295,3 +616,10 @@ class TagDocument(TranslatedDocument):
 
     def prepare_alternative_titles(self, instance: Tag) -> str:
         return self.prepare_translated_field(instance, "alternative_titles")
+
+    def prepare_suggest(self, instance: Tag) -> list[str]:
+        return self.prepare_suggestions(instance, "title")
+
+    @classmethod
+    def get_visibility_query(cls, permissions: SearchPermissions) -> Q:
+        return Q("match_all")
@@ -12,6 +12,7 @@ from django.db.models import (
 )
 from django_filters import rest_framework as filters
 from numpy import number
+from opensearchpy.helpers.query import Q as OpenSearchQ
 from opensearchpy.helpers.response import Response
 from rest_framework.filters import SearchFilter
 from rest_framework.settings import api_settings
@@ -19,6 +20,7 @@ from rest_framework.settings import api_settings
 from apps.accounts.models import PeopleGroup
 from apps.commons.filters import MultiValueCharFilter, UserMultipleIDFilter
 from apps.commons.utils import ArrayPosition
+from apps.organizations.models import Organization
 from apps.organizations.utils import get_below_hierarchy_codes
 from apps.projects.models import Project
 
@@ -147,25 +149,15 @@ class SearchObjectFilter(filters.FilterSet):
     members = UserMultipleIDFilter(method="filter_members")
     tags = MultiValueCharFilter(method="filter_tags")
 
-    exclude_projects = MultiValueCharFilter(method="filter_exclude_projects")
-    exclude_projects_in_project = filters.CharFilter(
-        method="filter_exclude_projects_in_project"
-    )
-    exclude_groups_in_project = filters.CharFilter(
-        method="filter_exclude_groups_in_project"
-    )
-    exclude_users_in_project = filters.CharFilter(
-        method="filter_exclude_users_in_project"
-    )
-
-    exclude_groups = MultiValueCharFilter(method="filter_exclude_groups")
-    exclude_projects_in_group = filters.CharFilter(
-        method="filter_exclude_projects_in_group"
-    )
-    exclude_groups_in_group = filters.CharFilter(
-        method="filter_exclude_groups_in_group"
-    )
-    exclude_users_in_group = filters.CharFilter(method="filter_exclude_users_in_group")
+    exclude_projects = MultiValueCharFilter(method="filter_exclusion")
+    exclude_projects_in_project = filters.CharFilter(method="filter_exclusion")
+    exclude_groups_in_project = filters.CharFilter(method="filter_exclusion")
+    exclude_users_in_project = filters.CharFilter(method="filter_exclusion")
+
+    exclude_groups = MultiValueCharFilter(method="filter_exclusion")
+    exclude_projects_in_group = filters.CharFilter(method="filter_exclusion")
+    exclude_groups_in_group = filters.CharFilter(method="filter_exclusion")
+    exclude_users_in_group = filters.CharFilter(method="filter_exclusion")
 
     def filter_organizations(self, queryset, name, value):
         return queryset.filter(
@@ -264,115 +256,136 @@ class SearchObjectFilter(filters.FilterSet):
             | Q(type__in=unaffected_types)
         ).distinct()
 
-    # this is for projects
-
-    def filter_exclude_projects(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PEOPLE_GROUP,
-            SearchObject.SearchObjectType.USER,
-        ]
-        projects = Project.objects.slug_or_ids(value)
-        return queryset.filter(
-            ~Q(project__in=projects) | Q(type__in=unaffected_types)
-        ).distinct()
-
-    def filter_exclude_projects_in_project(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PEOPLE_GROUP,
-            SearchObject.SearchObjectType.USER,
-        ]
-
-        project = Project.objects.slug_or_id(value).first()
-        if not project:
-            return queryset
-        linked = project.modules.linked_projects().values_list("project", flat=True)
-
-        return queryset.filter(
-            ~Q(project__in=linked) | Q(type__in=unaffected_types)
-        ).distinct()
-
-    def filter_exclude_groups_in_project(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PROJECT,
-            SearchObject.SearchObjectType.USER,
-        ]
-        project = Project.objects.slug_or_id(value).first()
-        if not project:
-            return queryset
-        groups = project.modules.groups()
-
-        return queryset.filter(
-            ~Q(people_group__in=groups) | Q(type__in=unaffected_types)
-        ).distinct()
-
-    def filter_exclude_users_in_project(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PROJECT,
-            SearchObject.SearchObjectType.PEOPLE_GROUP,
-        ]
-        project = Project.objects.slug_or_id(value).first()
-        if not project:
-            return queryset
-        users = project.modules.members()
-
-        return queryset.filter(
-            ~Q(user__in=users) | Q(type__in=unaffected_types)
-        ).distinct()
-
-    # this is for groups
-
-    def filter_exclude_groups(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PROJECT,
-            SearchObject.SearchObjectType.USER,
-        ]
-        groups = PeopleGroup.objects.slug_or_ids(value)
-        return queryset.filter(
-            ~Q(people_group__in=groups) | Q(type__in=unaffected_types)
-        ).distinct()
-
-    def filter_exclude_projects_in_group(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PEOPLE_GROUP,
-            SearchObject.SearchObjectType.USER,
-        ]
-
-        group = PeopleGroup.objects.slug_or_id(value).first()
-        if not group:
-            return queryset
-        featured_projects = group.modules.featured_projects()
-
-        return queryset.filter(
-            ~Q(project__in=featured_projects) | Q(type__in=unaffected_types)
-        ).distinct()
+    def get_excluded_objects(
+        self, name: str, value: str | list[str]
+    ) -> tuple[str, QuerySet] | None:
+        """
+        Return the type and the queryset of the objects excluded by an exclusion
+        filter, or None if the project or group of the filter does not exist.
+        """
+        if name == "exclude_projects":
+            return SearchObject.SearchObjectType.PROJECT, Project.objects.slug_or_ids(
+                value
+            )
+        if name == "exclude_groups":
+            return (
+                SearchObject.SearchObjectType.PEOPLE_GROUP,
+                PeopleGroup.objects.slug_or_ids(value),
+            )
+        if name.endswith("_in_project"):
+            instance = Project.objects.slug_or_id(value).first()
+        else:
+            instance = PeopleGroup.objects.slug_or_id(value).first()
+        if not instance:
+            return None
+        match name:
+            case "exclude_projects_in_project":
+                return (
+                    SearchObject.SearchObjectType.PROJECT,
+                    instance.modules.linked_projects().values_list(
+                        "project", flat=True
+                    ),
+                )
+            case "exclude_groups_in_project":
+                return (
+                    SearchObject.SearchObjectType.PEOPLE_GROUP,
+                    instance.modules.groups(),
+                )
+            case "exclude_users_in_project" | "exclude_users_in_group":
+                return SearchObject.SearchObjectType.USER, instance.modules.members()
+            case "exclude_projects_in_group":
+                return (
+                    SearchObject.SearchObjectType.PROJECT,
+                    instance.modules.featured_projects(),
+                )
+            case "exclude_groups_in_group":
+                return (
+                    SearchObject.SearchObjectType.PEOPLE_GROUP,
+                    instance.modules.subgroups(),
+                )
+        return None
 
-    def filter_exclude_groups_in_group(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PROJECT,
-            SearchObject.SearchObjectType.USER,
-        ]
-        group = PeopleGroup.objects.slug_or_id(value).first()
-        if not group:
+    def filter_exclusion(self, queryset, name, value):
+        excluded = self.get_excluded_objects(name, value)
+        if excluded is None:
             return queryset
-        groups = group.modules.subgroups()
-
+        search_object_type, objects = excluded
         return queryset.filter(
-            ~Q(people_group__in=groups) | Q(type__in=unaffected_types)
+            ~Q(**{f"{search_object_type}__in": objects}) | ~Q(type=search_object_type)
         ).distinct()
 
-    def filter_exclude_users_in_group(self, queryset, name, value):
-        unaffected_types = [
-            SearchObject.SearchObjectType.PROJECT,
-            SearchObject.SearchObjectType.PEOPLE_GROUP,
-        ]
-        group = PeopleGroup.objects.slug_or_id(value).first()
-        if not group:
-            return queryset
-        users = group.modules.members()
-
-        return queryset.filter(
-            ~Q(user__in=users) | Q(type__in=unaffected_types)
-        ).distinct()
+    def get_opensearch_filters(self) -> dict[str, list[OpenSearchQ]]:
+        """
+        Return the OpenSearch queries applying the filters to each type of search
+        object, on the fields indexed in the documents. The `types` filter is
+        ignored because it is handled by the searched indices.
+
+        The filterset must be validated first.
+        """
+        data = {
+            name: value
+            for name, value in self.form.cleaned_data.items()
+            if name != "types" and value not in (None, "", [])
+        }
+        queries = {
+            search_object_type: []
+            for search_object_type in SearchObject.SearchObjectType.values
+        }
+        project = queries[SearchObject.SearchObjectType.PROJECT]
+        people_group = queries[SearchObject.SearchObjectType.PEOPLE_GROUP]
+        user = queries[SearchObject.SearchObjectType.USER]
+        if "organizations" in data:
+            organizations = list(
+                Organization.objects.filter(code__in=data["organizations"]).values_list(
+                    "id", flat=True
+                )
+            )
+            project.append(
+                OpenSearchQ(
+                    "terms",
+                    organizations=list(
+                        Organization.objects.filter(
+                            code__in=get_below_hierarchy_codes(data["organizations"])
+                        ).values_list("id", flat=True)
+                    ),
+                )
+            )
+            people_group.append(OpenSearchQ("terms", organizations=organizations))
+            user.append(OpenSearchQ("terms", organizations=organizations))
+        if "sdgs" in data:
+            for type_queries in queries.values():
+                type_queries.append(OpenSearchQ("terms", sdgs=data["sdgs"]))
+        for name, field in [
+            ("languages", "language"),
+            ("categories", "category_ids"),
+            ("members", "member_ids"),
+            ("tags", "tag_ids"),
+        ]:
+            if name in data:
+                project.append(OpenSearchQ("terms", **{field: data[name]}))
+        for name, field in [
+            ("skills", "skill_tags"),
+            ("can_mentor_on", "mentor_skill_tags"),
+            ("needs_mentor_on", "mentoree_skill_tags"),
+        ]:
+            if name in data:
+                user.append(OpenSearchQ("terms", **{field: data[name]}))
+        for name in ["can_mentor", "needs_mentor"]:
+            if name in data:
+                user.append(OpenSearchQ("term", **{name: data[name]}))
+        for name, value in data.items():
+            if name.startswith("exclude_"):
+                excluded = self.get_excluded_objects(name, value)
+                if excluded is not None:
+                    search_object_type, objects = excluded
+                    search_objects = SearchObject.objects.filter(
+                        type=search_object_type,
+                        **{f"{search_object_type}__in": objects},
+                    ).values_list("id", flat=True)
+                    queries[search_object_type].append(
+                        ~OpenSearchQ("terms", search_object_id=list(search_objects))
+                    )
+        return queries
 
     class Meta:
         model = SearchObject
@@ -1,4 +1,10 @@
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from django_opensearch_dsl import Document
 from opensearchpy import Search
+from opensearchpy.helpers import parallel_bulk, streaming_bulk
 from opensearchpy.helpers.query import Q
 from opensearchpy.helpers.response import Response
 
@@ -23,6 +29,7 @@ class OpenSearchService:
         prefix_length: int = 1,
         max_expansions: int = 10,
         fuzzy_transpositions: bool = True,
+        visibility: Q | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -57,6 +64,8 @@ class OpenSearchService:
                 The maximum number of variations if the search term
             - fuzzy_transpositions: bool = True
                 Whether transpositions ("ab" -> "ba") are treated as a single edit
+            - visibility: Q | None = None
+                Query restricting the results to the documents the user can see
             - **kwargs
                 filters to apply to the search
 
@@ -77,6 +86,8 @@ class OpenSearchService:
             )
             .params(size=limit, from_=offset)
         )
+        if visibility is not None:
+            request = request.filter(visibility)
         if kwargs:
             request = request.filter("terms", **kwargs)
         if highlight:
@@ -98,6 +109,8 @@ class OpenSearchService:
         prefix_length: int = 3,
         max_expansions: int = 10,
         fuzzy_transpositions: bool = True,
+        visibility: Q | None = None,
+        filters: Q | None = None,
         **kwargs,
     ) -> Response:
         """
@@ -132,6 +145,11 @@ class OpenSearchService:
                 The maximum number of variations if the search term
             - fuzzy_transpositions: bool = True
                 Whether transpositions ("ab" -> "ba") are treated as a single edit
+            - visibility: Q | None = None
+                Query restricting the results to the documents the user can see
+            - filters: Q | None = None
+                Query restricting the results to the documents matching the filters
+                of the request
             - **kwargs
                 filters to apply to the search
 
@@ -170,8 +188,101 @@ class OpenSearchService:
             )
             .params(size=limit, from_=offset)
         )
+        if visibility is not None:
+            request = request.filter(visibility)
+        if filters is not None:
+            request = request.filter(filters)
         if kwargs:
             request = request.filter("terms", **kwargs)
         if highlight:
             request = request.highlight(*highlight, fragment_size=highlight_size)
         return request.execute()
+
+    @classmethod
+    def autocomplete(
+        cls,
+        indices: list[str],
+        query: str,
+        limit: int = 5,
+        timeout: float = 0.5,
+        visibility: Q | None = None,
+    ) -> Response:
+        """
+        Search for the documents whose `suggest` field starts with the query, for
+        search-as-you-type suggestions.
+
+        Args:
+            - indices: list[str]
+                The indices to search in
+            - query: str
+                The query to search for
+            - limit: int = 5
+                The maximum number of results to return
+            - timeout: float = 0.5
+                The maximum duration of the request in seconds
+            - visibility: Q | None = None
+                Query restricting the results to the documents the user can see
+
+        Returns:
+            opensearchpy.helpers.response.Response
+        """
+        request = (
+            Search(using="default", index=indices)
+            .query(
+                "multi_match",
+                type="bool_prefix",
+                query=query,
+                fields=["suggest", "suggest._2gram", "suggest._3gram"],
+            )
+            .source(["id", "suggest"])
+            .extra(size=limit, timeout=f"{int(timeout * 1000)}ms")
+            .params(request_timeout=timeout)
+        )
+        if visibility is not None:
+            request = request.filter(visibility)
+        return request.execute()
+
+    @classmethod
+    def bulk_index(
+        cls,
+        document: type[Document],
+        chunk_size: int = 500,
+        parallel: bool = False,
+        thread_count: int = 4,
+        pks: Iterable[Any] | None = None,
+    ) -> tuple[int, float]:
+        """
+        Index all the instances of a document with the bulk API, streaming the
+        instances from the database one chunk at a time.
+
+        Args:
+            - document: type[Document]
+                The document to index
+            - chunk_size: int = 500
+                The number of instances fetched and indexed per request
+            - parallel: bool = False
+                Whether to send the bulk requests from a pool of threads
+            - thread_count: int = 4
+                The number of threads to use if `parallel` is True
+            - pks: Iterable[Any] | None = None
+                Only index the instances with these pks if given
+
+        Returns:
+            tuple[int, float]
+                The number of indexed documents and the duration in seconds
+        """
+        instance = document()
+        connection = instance._get_connection()
+        actions = instance.get_bulk_actions(chunk_size, pks)
+        if parallel:
+            results = parallel_bulk(
+                connection,
+                actions,
+                thread_count=thread_count,
+                chunk_size=chunk_size,
+            )
+        else:
+            results = streaming_bulk(connection, actions, chunk_size=chunk_size)
+        start = time.perf_counter()
+        count = sum(1 for success, _ in results if success)
+        return count, time.perf_counter() - start
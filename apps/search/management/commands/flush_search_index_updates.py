@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.signals import count_dirty_instances
+from apps.search.tasks import flush_search_index_updates
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        """
+        Update the search indices with the pending changes without waiting for the
+        end of the debounce window.
+        """
+        self.stdout.write(f"{count_dirty_instances()} pending changes")
+        count = flush_search_index_updates()
+        self.stdout.write(f"Updated {count} documents")
@@ -1,17 +1,34 @@
-import subprocess  # nosec B404
-
 from django.core.management.base import BaseCommand
 from django_opensearch_dsl.registries import registry
 from opensearchpy.exceptions import NotFoundError
 
+from apps.search.interface import OpenSearchService
+
 
 class Command(BaseCommand):
-    def subprocess_call_command(self, *args):
-        return subprocess.run(["python", "manage.py", *args])  # nosec B603, B607
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of instances fetched and indexed per bulk request.",
+        )
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Send the bulk requests from a pool of threads.",
+        )
+        parser.add_argument(
+            "--thread-count",
+            type=int,
+            default=4,
+            help="Number of threads used with --parallel.",
+        )
 
     def handle(self, *args, **options):
         """
-        Update or create the indices and mappings for all registered models.
+        Update or create the indices and mappings for all registered models, then
+        index all the documents with the bulk API.
         """
         indices = registry.get_indices()
         for index in indices:
@@ -21,6 +38,15 @@ class Command(BaseCommand):
             except NotFoundError:
                 index.create()
                 self.stdout.write(f"Created index {index._name}")
-        self.subprocess_call_command(
-            "opensearch", "document", "index", "--force", "--refresh"
-        )
+        for document in registry.get_documents():
+            count, duration = OpenSearchService.bulk_index(
+                document,
+                chunk_size=options["chunk_size"],
+                parallel=options["parallel"],
+                thread_count=options["thread_count"],
+            )
+            document._index.refresh()
+            self.stdout.write(
+                f"Indexed {count} {document.django.model.__name__} documents in "
+                f"{duration:.2f}s ({count / max(duration, 1e-6):.0f} documents/s)"
+            )
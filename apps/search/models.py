@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db import models
 
 
@@ -60,3 +62,54 @@ class SearchObject(models.Model):
 
     def __str__(self):
         return f"{self.type} - {self.item}"
+
+    @classmethod
+    def bulk_upsert(
+        cls,
+        search_object_type: SearchObjectType,
+        instances: list[models.Model],
+        last_update_field: str,
+    ) -> dict[Any, int]:
+        """
+        Create or update the SearchObjects of the given instances with one query to
+        fetch the existing ones, one to update them and one to create the others.
+        Duplicates are left to the `clean_duplicate_search_objects` task.
+
+        The type of the SearchObject is also the name of the related field.
+
+        Returns:
+        -------
+            dict[Any, int]
+                The ids of the SearchObjects by pk of the related instance.
+        """
+        related_id_field = f"{search_object_type}_id"
+        search_objects = {}
+        for search_object in cls.objects.filter(
+            type=search_object_type, **{f"{search_object_type}__in": instances}
+        ).order_by("id"):
+            search_objects.setdefault(
+                getattr(search_object, related_id_field), search_object
+            )
+        search_objects_to_create = []
+        search_objects_to_update = []
+        for instance in instances:
+            last_update = getattr(instance, last_update_field)
+            search_object = search_objects.get(instance.pk)
+            if search_object is None:
+                search_objects_to_create.append(
+                    cls(
+                        type=search_object_type,
+                        last_update=last_update,
+                        **{search_object_type: instance},
+                    )
+                )
+            elif search_object.last_update != last_update:
+                search_object.last_update = last_update
+                search_objects_to_update.append(search_object)
+        cls.objects.bulk_update(search_objects_to_update, ["last_update"])
+        for search_object in cls.objects.bulk_create(search_objects_to_create):
+            search_objects[getattr(search_object, related_id_field)] = search_object
+        return {
+            related_id: search_object.id
+            for related_id, search_object in search_objects.items()
+        }
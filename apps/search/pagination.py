@@ -1,20 +1,23 @@
+from rest_framework.request import Request
+
 from apps.commons.pagination import PageInfoLimitOffsetPagination
 
 
-def SearchPagination(count: int = 0):  # noqa: N802
-    class _SearchPagination(PageInfoLimitOffsetPagination):
-        def get_count(self, queryset):
-            return count
+class SearchPagination(PageInfoLimitOffsetPagination):
+    """
+    Pagination of results already paginated by OpenSearchService.
+
+    The limit and offset are read with `init_page` before the search so that only
+    the requested page is fetched, and the count is set from the total number of
+    hits once the search is done.
+    """
 
-        def paginate_queryset(self, queryset, request, view=None):
-            """
-            Queryset is already paginated by OpenSearchService.
-            We need to set the count, offset and limit manually.
-            """
-            self.request = request
-            self.count = self.get_count(queryset)
-            self.offset = self.get_offset(request)
-            self.limit = self.get_limit(request)
-            return queryset
+    def init_page(self, request: Request) -> tuple[int, int]:
+        self.request = request
+        self.count = 0
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        return self.limit, self.offset
 
-    return _SearchPagination
+    def paginate_queryset(self, queryset, request, view=None):
+        return list(queryset)
@@ -7,7 +7,7 @@ from apps.accounts.serializers import (
     UserLighterSerializer,
 )
 from apps.feedbacks.models import Follow
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 from apps.organizations.serializers import ProjectCategoryLightSerializer
 from apps.projects.models import Project
 from services.translator.serializers import auto_translated
@@ -23,6 +23,7 @@ class ProjectSearchSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
+        list_serializer_class = ImageUrlsListSerializer
         fields = [
             "id",
             "title",
@@ -56,6 +57,7 @@ class SearchObjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SearchObject
+        list_serializer_class = ImageUrlsListSerializer
         read_only_fields = [
             "id",
             "type",
@@ -65,3 +67,9 @@ class SearchObjectSerializer(serializers.ModelSerializer):
             "last_update",
         ]
         fields = read_only_fields
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    id = serializers.CharField(read_only=True)
+    type = serializers.CharField(read_only=True)
+    title = serializers.CharField(read_only=True)
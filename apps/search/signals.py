@@ -0,0 +1,122 @@
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+from django.db import models, transaction
+from django_opensearch_dsl.apps import DODConfig
+from django_opensearch_dsl.signals import CelerySignalProcessor
+from django_redis import get_redis_connection
+from prometheus_client import Gauge, Histogram
+from redis.exceptions import ResponseError
+
+DIRTY_INSTANCES_KEY = "search_index.dirty"
+FLUSH_SCHEDULED_KEY = "search_index.flush_scheduled"
+
+search_index_update_lag = Histogram(
+    "projects_search_index_update_lag_seconds",
+    "Time between the change of an instance and the update of its documents.",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+search_index_pending_updates = Gauge(
+    "projects_search_index_pending_updates",
+    "Number of changed instances waiting for a search index update.",
+)
+
+
+def _get_dirty_key(instance: models.Model) -> str:
+    return f"{instance._meta.label}:{instance.pk}"
+
+
+def mark_instances_dirty(instances: Iterable[models.Model]):
+    """
+    Record that the documents of the given instances must be updated, and schedule
+    a flush at the end of the debounce window if none is pending.
+
+    Only the time of the first change is kept, so that the lag metric measures the
+    oldest pending change of each instance.
+    """
+    connection = get_redis_connection("default")
+    now = time.time()
+    pipeline = connection.pipeline()
+    for instance in instances:
+        pipeline.hsetnx(DIRTY_INSTANCES_KEY, _get_dirty_key(instance), now)
+    pipeline.hlen(DIRTY_INSTANCES_KEY)
+    search_index_pending_updates.set(pipeline.execute()[-1])
+    window = settings.OPENSEARCH_DSL_DEBOUNCE_WINDOW
+    if connection.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=window):
+        from .tasks import flush_search_index_updates
+
+        flush_search_index_updates.apply_async(countdown=window)
+
+
+def count_dirty_instances() -> int:
+    """Return the number of instances waiting for a search index update."""
+    return get_redis_connection("default").hlen(DIRTY_INSTANCES_KEY)
+
+
+def pop_dirty_instances() -> dict[str, dict[str, float]]:
+    """
+    Atomically take the pending changes, by model label and pk.
+
+    The values are the times of the first change of each instance.
+    """
+    connection = get_redis_connection("default")
+    connection.delete(FLUSH_SCHEDULED_KEY)
+    flushing_key = f"search_index.flushing.{uuid.uuid4()}"
+    try:
+        connection.rename(DIRTY_INSTANCES_KEY, flushing_key)
+    except ResponseError:
+        # No pending change
+        return {}
+    entries = connection.hgetall(flushing_key)
+    connection.delete(flushing_key)
+    search_index_pending_updates.set(0)
+    dirty = defaultdict(dict)
+    for key, timestamp in entries.items():
+        label, pk = key.decode().split(":", 1)
+        dirty[label][pk] = float(timestamp)
+    return dirty
+
+
+def restore_dirty_instances(dirty: dict[str, dict[str, float]]):
+    """Put back pending changes that could not be flushed."""
+    connection = get_redis_connection("default")
+    pipeline = connection.pipeline()
+    for label, timestamps in dirty.items():
+        for pk, timestamp in timestamps.items():
+            pipeline.hsetnx(DIRTY_INSTANCES_KEY, f"{label}:{pk}", timestamp)
+    pipeline.execute()
+
+
+class DebouncedSignalProcessor(CelerySignalProcessor):
+    """
+    Signal processor recording the changed instances instead of enqueuing one
+    update task per save.
+
+    The changes are coalesced during `OPENSEARCH_DSL_DEBOUNCE_WINDOW` seconds, then
+    the `flush_search_index_updates` task updates the documents of the changed
+    instances and of their related instances with the bulk API. Deletions are
+    still handled immediately by the Celery signal processor.
+    """
+
+    def handle_save(
+        self, sender: type[models.Model], instance: models.Model, **kwargs: Any
+    ):
+        if DODConfig.autosync_enabled() and self.instance_requires_update(instance):
+            transaction.on_commit(partial(mark_instances_dirty, [instance]))
+
+    def handle_m2m_changed(
+        self,
+        sender: type[models.Model],
+        instance: models.Model,
+        action: str,
+        **kwargs: Any,
+    ):
+        # The documents are rebuilt from the database, so there is no need to
+        # remove the instance from the index before the relation is removed.
+        if action in ("post_add", "post_remove", "post_clear"):
+            self.handle_save(sender, instance)
@@ -1,10 +1,25 @@
-from django.db.models import Count
+import time
+from collections import defaultdict
+from typing import Any
+
+from django.apps import apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from django.db.models import Count, QuerySet
+from django_opensearch_dsl.registries import registry
 
 from apps.accounts.models import PeopleGroup, ProjectUser
 from apps.commons.utils import clear_memory
 from apps.projects.models import Project
 from projects.celery import app
 
+from .interface import OpenSearchService
+from .signals import (
+    pop_dirty_instances,
+    restore_dirty_instances,
+    search_index_update_lag,
+)
+
 
 @app.task(name="apps.search.tasks.clean_duplicate_search_objects")
 @clear_memory
@@ -25,3 +40,62 @@ def clean_duplicate_search_objects():
     ).filter(search_objects__gt=1)
     for project in project_duplicates:
         project.search_object.exclude(id=project.search_object.first().id).delete()
+
+
+def _get_related_pks(related: Any) -> list[Any]:
+    if related is None:
+        return []
+    if isinstance(related, QuerySet):
+        return list(related.values_list("pk", flat=True))
+    if isinstance(related, models.Model):
+        return [related.pk]
+    return [instance.pk for instance in related]
+
+
+@app.task(name="apps.search.tasks.flush_search_index_updates")
+@clear_memory
+def flush_search_index_updates() -> int:
+    """
+    Update in bulk the documents of the instances changed since the last flush,
+    and of the instances related to them.
+
+    Returns:
+        int
+            The number of updated documents
+    """
+    dirty = pop_dirty_instances()
+    if not dirty:
+        return 0
+    try:
+        # Time of the first change of each instance to index, by model and pk
+        to_index = defaultdict(dict)
+        for label, timestamps in dirty.items():
+            model = apps.get_model(label)
+            if model in registry.get_models():
+                to_index[model].update(timestamps)
+            for instance in model.objects.filter(pk__in=timestamps.keys()):
+                timestamp = timestamps[str(instance.pk)]
+                for document in registry._get_related_doc(instance):
+                    try:
+                        related = document().get_instances_from_related(instance)
+                    except ObjectDoesNotExist:
+                        related = None
+                    for pk in _get_related_pks(related):
+                        to_index[document.django.model].setdefault(str(pk), timestamp)
+        count = 0
+        for model, timestamps in to_index.items():
+            pks = list(timestamps.keys())
+            for document in registry.get_documents([model]):
+                if document.django.ignore_signals:
+                    continue
+                indexed, _ = OpenSearchService.bulk_index(document, pks=pks)
+                if document.django.auto_refresh:
+                    document._index.refresh()
+                count += indexed
+            now = time.time()
+            for timestamp in timestamps.values():
+                search_index_update_lag.observe(now - timestamp)
+    except Exception:
+        restore_dirty_instances(dirty)
+        raise
+    return count
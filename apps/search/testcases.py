@@ -1,3 +1,7 @@
+from typing import Any
+
+from django.conf import settings
+
 from apps.search.models import SearchObject
 from apps.skills.models import Tag
 
@@ -49,6 +53,18 @@ class MockedSearchObjectHit:
         )
 
 
+class MockedAutocompleteHitMeta:
+    def __init__(self, index: str):
+        self.index = index
+
+
+class MockedAutocompleteHit:
+    def __init__(self, index: str, pk: Any, title: str):
+        self.id = pk
+        self.suggest = [title]
+        self.meta = MockedAutocompleteHitMeta(index=index)
+
+
 class MockedHitsTotal:
     def __init__(self, hits: list[MockedSearchObjectHit | MockedTagHit]):
         self.value = len(hits)
@@ -75,6 +91,17 @@ class SearchTestCaseMixin:
         hits = [MockedTagHit(tag=tag, query=query) for tag in tags]
         return MockedResponse(hits=hits)
 
+    def opensearch_autocomplete_mocked_return(
+        self, instances: list[tuple[str, Any, str]]
+    ) -> MockedResponse:
+        hits = [
+            MockedAutocompleteHit(
+                index=f"{settings.OPENSEARCH_INDEX_PREFIX}-{index}", pk=pk, title=title
+            )
+            for index, pk, title in instances
+        ]
+        return MockedResponse(hits=hits)
+
     def opensearch_search_objects_mocked_return(
         self, search_objects: list[SearchObject], query: str
     ) -> list[MockedSearchObjectHit]:
@@ -0,0 +1,60 @@
+from django_opensearch_dsl.registries import registry
+from parameterized import parameterized
+
+from apps.accounts.factories import PeopleGroupFactory, UserFactory
+from apps.accounts.models import PeopleGroup, ProjectUser
+from apps.commons.test import JwtAPITestCase
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+from apps.search.models import SearchObject
+
+
+class BulkIndexTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.projects = ProjectFactory.create_batch(3, organizations=[cls.organization])
+        cls.people_groups = PeopleGroupFactory.create_batch(
+            3, organization=cls.organization
+        )
+        cls.users = UserFactory.create_batch(3)
+        for project, people_group, user in zip(
+            cls.projects, cls.people_groups, cls.users
+        ):
+            project.members.add(user)
+            people_group.members.add(user)
+            cls.organization.users.add(user)
+
+    @parameterized.expand([(Project,), (PeopleGroup,), (ProjectUser,)])
+    def test_bulk_actions_match_prepare(self, model):
+        (document,) = registry.get_documents([model])
+        instance = document()
+        bulk_actions = {
+            action["_id"]: action["_source"]
+            for action in instance.get_bulk_actions(chunk_size=2)
+        }
+        instance = document()
+        expected = {
+            action["_id"]: action["_source"]
+            for action in instance._get_actions(
+                instance.get_queryset().order_by("pk"), "index"
+            )
+        }
+        self.assertEqual(bulk_actions, expected)
+
+    def test_bulk_upsert_reuses_existing_search_objects(self):
+        project_type = SearchObject.SearchObjectType.PROJECT
+        existing = SearchObject.objects.create(
+            type=project_type, project=self.projects[0]
+        )
+        search_objects = SearchObject.bulk_upsert(
+            project_type, self.projects, "updated_at"
+        )
+        self.assertEqual(search_objects[self.projects[0].pk], existing.id)
+        self.assertEqual(
+            SearchObject.objects.filter(type=project_type).count(), len(self.projects)
+        )
+        existing.refresh_from_db()
+        self.assertEqual(existing.last_update, self.projects[0].updated_at)
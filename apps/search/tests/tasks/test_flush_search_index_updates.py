@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import ProjectFactory
+from apps.search.documents import ProjectDocument, TagDocument, UserDocument
+from apps.search.tasks import flush_search_index_updates
+from apps.skills.factories import TagFactory
+from apps.skills.models import Tag
+
+
+class FlushSearchIndexUpdatesTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.tag = TagFactory(organization=cls.organization, type=Tag.TagType.CUSTOM)
+        cls.projects = ProjectFactory.create_batch(2, organizations=[cls.organization])
+        for project in cls.projects:
+            project.tags.add(cls.tag)
+        cls.user = UserFactory()
+
+    @patch("apps.search.tasks.restore_dirty_instances")
+    @patch("apps.search.tasks.OpenSearchService.bulk_index")
+    @patch("apps.search.tasks.pop_dirty_instances")
+    def test_flush_coalesces_related_instances(
+        self, mocked_pop, mocked_bulk_index, mocked_restore
+    ):
+        mocked_pop.return_value = {
+            "skills.Tag": {str(self.tag.pk): 0.0},
+            "projects.Project": {str(self.projects[0].pk): 0.0},
+            "accounts.ProjectUser": {str(self.user.pk): 0.0},
+        }
+        mocked_bulk_index.return_value = (1, 0.0)
+        flush_search_index_updates()
+        indexed = {
+            call.args[0]: set(call.kwargs["pks"])
+            for call in mocked_bulk_index.call_args_list
+        }
+        self.assertEqual(
+            indexed,
+            {
+                TagDocument: {str(self.tag.pk)},
+                ProjectDocument: {str(project.pk) for project in self.projects},
+                UserDocument: {str(self.user.pk)},
+            },
+        )
+        mocked_restore.assert_not_called()
+
+    @patch("apps.search.tasks.restore_dirty_instances")
+    @patch("apps.search.tasks.OpenSearchService.bulk_index")
+    @patch("apps.search.tasks.pop_dirty_instances")
+    def test_flush_restores_changes_on_error(
+        self, mocked_pop, mocked_bulk_index, mocked_restore
+    ):
+        dirty = {"projects.Project": {str(self.projects[0].pk): 0.0}}
+        mocked_pop.return_value = dirty
+        mocked_bulk_index.side_effect = ConnectionError()
+        with self.assertRaises(ConnectionError):
+            flush_search_index_updates()
+        mocked_restore.assert_called_once_with(dirty)
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.urls import reverse
+from opensearchpy.exceptions import ConnectionTimeout
+from parameterized import parameterized
+from rest_framework import status
+
+from apps.accounts.factories import UserFactory
+from apps.accounts.utils import get_superadmins_group
+from apps.commons.test import JwtAPITestCase
+from apps.search.testcases import SearchTestCaseMixin
+
+
+class AutocompleteTestCase(JwtAPITestCase, SearchTestCaseMixin):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.superadmin = UserFactory(groups=[get_superadmins_group()])
+
+    @patch("apps.search.interface.OpenSearchService.autocomplete")
+    def test_autocomplete(self, mocked_autocomplete):
+        mocked_autocomplete.return_value = self.opensearch_autocomplete_mocked_return(
+            [("project", "abc", "Project"), ("tag", 1, "Tag")]
+        )
+        response = self.client.get(
+            reverse("Autocomplete-list") + "?search=pro&types=project&types=tag"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.json(),
+            [
+                {"id": "abc", "type": "project", "title": "Project"},
+                {"id": "1", "type": "tag", "title": "Tag"},
+            ],
+        )
+        kwargs = mocked_autocomplete.call_args.kwargs
+        self.assertListEqual(
+            kwargs["indices"],
+            [
+                f"{settings.OPENSEARCH_INDEX_PREFIX}-project",
+                f"{settings.OPENSEARCH_INDEX_PREFIX}-tag",
+            ],
+        )
+        self.assertEqual(kwargs["timeout"], settings.OPENSEARCH_AUTOCOMPLETE_TIMEOUT)
+        self.assertIsNotNone(kwargs["visibility"])
+
+    @patch("apps.search.interface.OpenSearchService.autocomplete")
+    def test_autocomplete_superadmin(self, mocked_autocomplete):
+        mocked_autocomplete.return_value = self.opensearch_autocomplete_mocked_return(
+            []
+        )
+        self.client.force_authenticate(self.superadmin)
+        response = self.client.get(reverse("Autocomplete-list") + "?search=pro")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(mocked_autocomplete.call_args.kwargs["visibility"])
+
+    @patch("apps.search.interface.OpenSearchService.autocomplete")
+    def test_autocomplete_timeout(self, mocked_autocomplete):
+        mocked_autocomplete.side_effect = ConnectionTimeout("TIMEOUT", "", None)
+        response = self.client.get(reverse("Autocomplete-list") + "?search=pro")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.json(), [])
+
+    @patch("apps.search.interface.OpenSearchService.autocomplete")
+    def test_autocomplete_empty_query(self, mocked_autocomplete):
+        response = self.client.get(reverse("Autocomplete-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.json(), [])
+        mocked_autocomplete.assert_not_called()
+
+    @parameterized.expand([("3", 3), ("100", 20), ("0", 1), ("-5", 1), ("invalid", 5)])
+    @patch("apps.search.interface.OpenSearchService.autocomplete")
+    def test_autocomplete_limit(self, limit, expected_limit, mocked_autocomplete):
+        mocked_autocomplete.return_value = self.opensearch_autocomplete_mocked_return(
+            []
+        )
+        response = self.client.get(
+            reverse("Autocomplete-list") + f"?search=pro&limit={limit}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mocked_autocomplete.call_args.kwargs["limit"], expected_limit)
@@ -177,3 +177,28 @@ class MixedSearchTestCase(JwtAPITestCase, SearchTestCaseMixin):
                 ),
             ],
         )
+
+    def test_search_mixed_index_no_query_paginated(self):
+        response = self.client.get(
+            reverse("Search-list")
+            + f"?organizations={self.organization.code}&limit=2&offset=1"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.json()
+        self.assertEqual(content["count"], 6)
+        self.assertListEqual(
+            [
+                (
+                    search_object["type"],
+                    self.get_object_id_from_search_object(search_object),
+                )
+                for search_object in content["results"]
+            ],
+            [
+                (
+                    SearchObject.SearchObjectType.PEOPLE_GROUP,
+                    self.people_group_2.pk,
+                ),
+                (SearchObject.SearchObjectType.USER, self.user_2.pk),
+            ],
+        )
@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
+from django.conf import settings
 from django.urls import reverse
+from opensearchpy.helpers.query import Q as OpenSearchQ
 from parameterized import parameterized
 from rest_framework import status
 
@@ -297,3 +299,64 @@ class ProjectSearchTestCase(JwtAPITestCase, SearchTestCaseMixin):
             {project["project"]["id"] for project in content},
             {self.public_project_2.id},
         )
+
+    @patch("apps.search.interface.OpenSearchService.multi_match_prefix_search")
+    def test_visibility_filtered_in_opensearch(self, mocked_search):
+        mocked_search.return_value = self.opensearch_search_objects_mocked_return(
+            search_objects=[self.search_objects["public_1"]],
+            query="opensearch",
+        )
+        response = self.client.get(
+            reverse("Search-search", args=("opensearch",)) + "?types=project"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        kwargs = mocked_search.call_args.kwargs
+        self.assertIsNotNone(kwargs["visibility"])
+        self.assertIsNone(kwargs["filters"])
+        self.assertNotIn("search_object_id", kwargs)
+
+    @patch("apps.search.interface.OpenSearchService.multi_match_prefix_search")
+    def test_superadmin_filters_sent_to_opensearch(self, mocked_search):
+        mocked_search.return_value = self.opensearch_search_objects_mocked_return(
+            search_objects=[self.search_objects["public_2"]],
+            query="opensearch",
+        )
+        self.client.force_authenticate(self.superadmin)
+        response = self.client.get(
+            reverse("Search-search", args=("opensearch",))
+            + "?types=project"
+            + f"&organizations={self.organization_2.code}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        kwargs = mocked_search.call_args.kwargs
+        self.assertIsNone(kwargs["visibility"])
+        self.assertNotIn("search_object_id", kwargs)
+        self.assertEqual(
+            kwargs["filters"],
+            OpenSearchQ("term", _index=f"{settings.OPENSEARCH_INDEX_PREFIX}-project")
+            & OpenSearchQ("terms", organizations=[self.organization_2.id]),
+        )
+
+    @patch("apps.search.interface.OpenSearchService.multi_match_prefix_search")
+    def test_only_page_is_hydrated_in_hits_order(self, mocked_search):
+        mocked_search.return_value = self.opensearch_search_objects_mocked_return(
+            search_objects=[
+                self.search_objects["public_2"],
+                self.search_objects["public_1"],
+            ],
+            query="opensearch",
+        )
+        response = self.client.get(
+            reverse("Search-search", args=("opensearch",))
+            + "?types=project&limit=2&offset=4"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        kwargs = mocked_search.call_args.kwargs
+        self.assertEqual(kwargs["limit"], 2)
+        self.assertEqual(kwargs["offset"], 4)
+        content = response.json()
+        self.assertEqual(content["count"], 2)
+        self.assertListEqual(
+            [result["project"]["id"] for result in content["results"]],
+            [self.public_project_2.id, self.public_project_1.id],
+        )
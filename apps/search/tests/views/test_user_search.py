@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
+from django.conf import settings
 from django.urls import reverse
+from opensearchpy.helpers.query import Q as OpenSearchQ
 from parameterized import parameterized
 from rest_framework import status
 
@@ -221,6 +223,11 @@ class UserSearchTestCase(JwtAPITestCase, SearchTestCaseMixin):
             {user["user"]["id"] for user in content},
             {self.public_user_1.id, self.public_user_2.id},
         )
+        self.assertEqual(
+            mocked_search.call_args.kwargs["filters"],
+            OpenSearchQ("term", _index=f"{settings.OPENSEARCH_INDEX_PREFIX}-user")
+            & OpenSearchQ("term", can_mentor=True),
+        )
 
     @patch("apps.search.interface.OpenSearchService.multi_match_prefix_search")
     def test_filter_needs_mentor(self, mocked_search):
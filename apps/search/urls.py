@@ -1,7 +1,8 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import SearchViewSet
+from .views import AutocompleteViewSet, SearchViewSet
 
 router = DefaultRouter()
 
 router.register(r"search", SearchViewSet, basename="Search")
+router.register(r"autocomplete", AutocompleteViewSet, basename="Autocomplete")
@@ -0,0 +1,52 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from apps.accounts.models import ProjectUser
+
+
+class SearchPermissions:
+    """
+    Permission set of a user, used to filter the search indices on the visibility
+    fields of the documents instead of sending every visible id to OpenSearch.
+
+    Attributes:
+    ----------
+        user_id: int | None
+            The id of the user, None for anonymous users.
+        groups: list[int]
+            The ids of the permission groups of the user.
+        org_project_organizations: list[int]
+            The organizations in which the user can see projects with an `org`
+            publication status.
+        project_organizations: list[int]
+            The organizations in which the user can see all the projects.
+        org_user_organizations: list[int]
+            The organizations in which the user can see users with an `org`
+            privacy setting.
+        user_organizations: list[int]
+            The organizations in which the user can see all the users.
+        org_people_group_organizations: list[int]
+            The organizations in which the user can see groups with an `org`
+            publication status.
+        people_group_organizations: list[int]
+            The organizations in which the user can see all the groups.
+    """
+
+    def __init__(self, user: "ProjectUser"):
+        visibility = {}
+        if not user.is_anonymous:
+            visibility = {
+                key: list(value) for key, value in user.get_visibility().items()
+            }
+        self.user_id = user.id
+        self.groups = visibility.get("groups", [])
+        self.org_project_organizations = visibility.get("org_project_organizations", [])
+        self.project_organizations = visibility.get("project_organizations", [])
+        self.org_user_organizations = visibility.get("org_user_organizations", [])
+        self.user_organizations = visibility.get("user_organizations", [])
+        self.org_people_group_organizations = visibility.get(
+            "org_people_group_organizations", []
+        )
+        self.people_group_organizations = visibility.get(
+            "people_group_organizations", []
+        )
@@ -1,21 +1,60 @@
+from functools import reduce
+from operator import and_, or_
+
 from django.conf import settings
 from django.db.models import F, Q, QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from opensearchpy.exceptions import ConnectionTimeout
+from opensearchpy.helpers.query import Q as OpenSearchQ
+from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter
-from rest_framework.settings import api_settings
+from rest_framework.response import Response
 
 from apps.commons.views import ListViewSet
 
+from .documents import (
+    PeopleGroupDocument,
+    ProjectDocument,
+    TagDocument,
+    UserDocument,
+)
 from .filters import SearchObjectFilter
 from .interface import OpenSearchService
 from .models import SearchObject
 from .pagination import SearchPagination
-from .serializers import SearchObjectSerializer
+from .serializers import AutocompleteSerializer, SearchObjectSerializer
+from .utils import SearchPermissions
+
 
+class SearchVisibilityMixin:
+    def get_visibility_query(self, indices: list[str]) -> OpenSearchQ | None:
+        """
+        Build the OpenSearch query restricting each index to the documents the user
+        can see, based on the visibility fields stored in the documents.
+        """
+        if self.request.user.is_superuser:
+            return None
+        permissions = SearchPermissions(self.request.user)
+        queries = [
+            OpenSearchQ("term", _index=document._index._name)
+            & document.get_visibility_query(permissions)
+            for document in [
+                ProjectDocument,
+                UserDocument,
+                PeopleGroupDocument,
+                TagDocument,
+            ]
+            if document._index._name in indices
+        ]
+        if not queries:
+            return None
+        return reduce(or_, queries)
 
-class SearchViewSet(ListViewSet):
+
+class SearchViewSet(SearchVisibilityMixin, ListViewSet):
     filterset_class = SearchObjectFilter
     serializer_class = SearchObjectSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -45,6 +84,31 @@ class SearchViewSet(ListViewSet):
             return queryset.order_by(F("last_update").desc(nulls_last=True))
         return queryset
 
+    def get_filters_query(self, indices: list[str]) -> OpenSearchQ | None:
+        """
+        Build the OpenSearch query applying the filters of the request to each
+        index, on the fields indexed in the documents, or None if no filter is
+        applied.
+        """
+        filterset = self.filterset_class(
+            self.request.query_params,
+            queryset=SearchObject.objects.none(),
+            request=self.request,
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        filters = filterset.get_opensearch_filters()
+        if not any(filters.values()):
+            return None
+        queries = []
+        for search_type, type_filters in filters.items():
+            index = f"{settings.OPENSEARCH_INDEX_PREFIX}-{search_type}"
+            if index in indices:
+                queries.append(
+                    reduce(and_, [OpenSearchQ("term", _index=index), *type_filters])
+                )
+        return reduce(or_, queries) if queries else None
+
     @extend_schema(
         responses=SearchObjectSerializer(many=True),
         filters=[SearchObjectFilter],
@@ -83,14 +147,13 @@ class SearchViewSet(ListViewSet):
             ),
         ],
     )
-    @action(detail=False, methods=["GET"], url_path="(?P<search>.+)")
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="(?P<search>.+)",
+        pagination_class=SearchPagination,
+    )
     def search(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        search_objects = list(queryset)
-
-        # generate ids for opensearch
-        search_objects_ids = [sobj.id for sobj in search_objects]
-
         query = self.kwargs.get("search", "")
         indices = [
             f"{settings.OPENSEARCH_INDEX_PREFIX}-{index}"
@@ -99,8 +162,7 @@ class SearchViewSet(ListViewSet):
                 or ["project", "user", "people_group"]
             )
         ]
-        limit = request.query_params.get("limit", api_settings.PAGE_SIZE)
-        offset = request.query_params.get("offset", 0)
+        limit, offset = self.paginator.init_page(request)
         search_type = request.query_params.get("search_type", "most_fields")
         fuzziness = request.query_params.get("fuzziness", 1)
         response = OpenSearchService.multi_match_prefix_search(
@@ -133,21 +195,101 @@ class SearchViewSet(ListViewSet):
             limit=limit,
             offset=offset,
             fuzziness=fuzziness,
-            search_object_id=search_objects_ids,
+            visibility=self.get_visibility_query(indices),
+            filters=self.get_filters_query(indices),
         )
+        self.paginator.count = response.hits.total.value
         search_objects_ids = [hit.search_object_id for hit in response.hits]
 
-        # remove search id not hits in opensearch
-        filtered_search_object = [
-            obj for obj in search_objects if obj.id in search_objects_ids
+        # Only the returned page is fetched, in the order of the hits. The
+        # visibility check is kept as a safety net in case the index is not up to
+        # date.
+        search_objects = {
+            search_object.id: search_object
+            for search_object in self.get_queryset(order=False).filter(
+                id__in=search_objects_ids
+            )
+        }
+        page = [
+            search_objects[search_object_id]
+            for search_object_id in search_objects_ids
+            if search_object_id in search_objects
         ]
-        # sort filtered_search_object by hits index
-        ordered_search_objs = sorted(
-            filtered_search_object,
-            key=lambda obj: search_objects_ids.index(obj.id),
-        )
-
-        self.pagination_class = SearchPagination(response.hits.total.value)
-        page = self.paginate_queryset(ordered_search_objs)
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
+
+
+class AutocompleteViewSet(SearchVisibilityMixin, viewsets.ViewSet):
+    """
+    Lightweight search-as-you-type suggestions, to use while the user is typing
+    before running the full search.
+    """
+
+    types = ["project", "user", "people_group", "tag"]
+    max_limit = 20
+
+    @extend_schema(
+        responses=AutocompleteSerializer(many=True),
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                description="The beginning of the text to search.",
+                required=True,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="Number of suggestions to return (default is 5).",
+                required=False,
+                type=int,
+            ),
+            OpenApiParameter(
+                name="types",
+                description="The type of data to search",
+                required=False,
+                many=True,
+                type=str,
+                enum=types,
+            ),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get("search", "").strip()
+        if not query:
+            return Response([])
+        types = [
+            search_type
+            for search_type in request.query_params.getlist("types")
+            if search_type in self.types
+        ] or self.types
+        indices = {
+            f"{settings.OPENSEARCH_INDEX_PREFIX}-{search_type}": search_type
+            for search_type in types
+        }
+        try:
+            limit = max(
+                1, min(int(request.query_params.get("limit", 5)), self.max_limit)
+            )
+        except ValueError:
+            limit = 5
+        try:
+            response = OpenSearchService.autocomplete(
+                indices=list(indices.keys()),
+                query=query,
+                limit=limit,
+                timeout=settings.OPENSEARCH_AUTOCOMPLETE_TIMEOUT,
+                visibility=self.get_visibility_query(list(indices.keys())),
+            )
+        except ConnectionTimeout:
+            # Suggestions are not worth waiting for, the full search is still
+            # available when the user submits
+            return Response([])
+        data = [
+            {
+                "id": hit.id,
+                "type": indices[hit.meta.index],
+                "title": hit.suggest[0] if hit.suggest else "",
+            }
+            for hit in response.hits
+        ]
+        return Response(AutocompleteSerializer(data, many=True).data)
@@ -0,0 +1,201 @@
+"""
+Self-contained load tests against a local stack, without Keycloak.
+
+The tested organization is seeded with `python manage.py seed_load_testing` using
+the `projects.settings.loadtest` settings, and the tokens are signed with the
+`LOADTEST_JWT_SECRET` shared with the backend.
+
+At the end of the run, the p50/p95/p99 latencies and the SQL query counts of each
+endpoint are written to `LOADTEST_REPORT` so that runs can be compared.
+"""
+
+import json
+import os
+import random
+import re
+import time
+import uuid
+from collections import defaultdict
+
+import jwt
+from locust import HttpUser, between, events, task  # type: ignore
+
+FIXTURE = os.getenv("LOADTEST_FIXTURE", "fixture.json")
+REPORT = os.getenv("LOADTEST_REPORT", "report.json")
+JWT_SECRET = os.environ["LOADTEST_JWT_SECRET"]
+TOKEN_LIFETIME = 60 * 60
+
+with open(FIXTURE) as f:
+    fixture = json.load(f)
+
+ORGANIZATION_CODE = fixture["organization"]
+
+# Number of SQL queries of each request, by endpoint name, read from the
+# `Server-Timing` header set by the query count middleware when it is enabled.
+query_counts = defaultdict(list)
+SQL_QUERIES_PATTERN = re.compile(r'sql;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def mint_token(keycloak_id: str) -> str:
+    now = int(time.time())
+    payload = {
+        "sub": keycloak_id,
+        "typ": "Bearer",
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + TOKEN_LIFETIME,
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
+
+@events.request.add_listener
+def record_query_count(name, response, exception, **kwargs):
+    if exception or response is None:
+        return
+    match = SQL_QUERIES_PATTERN.search(response.headers.get("Server-Timing", ""))
+    if match:
+        query_counts[name].append(int(match.group(1)))
+
+
+@events.quitting.add_listener
+def write_report(environment, **kwargs):
+    report = {}
+    for (name, method), stats in environment.stats.entries.items():
+        counts = query_counts.get(name, [])
+        report[f"{method} {name}"] = {
+            "requests": stats.num_requests,
+            "failures": stats.num_failures,
+            "p50": stats.get_response_time_percentile(0.5),
+            "p95": stats.get_response_time_percentile(0.95),
+            "p99": stats.get_response_time_percentile(0.99),
+            "queries_mean": sum(counts) / len(counts) if counts else None,
+            "queries_max": max(counts) if counts else None,
+        }
+    with open(REPORT, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+class AnonymousUser(HttpUser):
+    """Visitor browsing the public pages of the organization."""
+
+    weight = 1
+    wait_time = between(1, 3)
+
+    def get(self, path: str, name: str):
+        self.client.get(path, name=name)
+
+    @task(3)
+    def get_organization(self):
+        self.get(f"/v1/organization/{ORGANIZATION_CODE}/", "organization")
+
+    @task(5)
+    def get_newsfeed(self):
+        self.get(f"/v1/organization/{ORGANIZATION_CODE}/newsfeed/?limit=15", "newsfeed")
+
+    @task(5)
+    def list_projects(self):
+        self.get(
+            f"/v1/project/?organizations={ORGANIZATION_CODE}&limit=30", "project list"
+        )
+
+    @task(5)
+    def get_project(self):
+        slug = random.choice(fixture["projects"])  # nosec B311
+        self.get(f"/v1/project/{slug}/", "project")
+
+    @task(3)
+    def list_users(self):
+        self.get(f"/v1/user/?organizations={ORGANIZATION_CODE}&limit=30", "user list")
+
+    @task(3)
+    def get_user(self):
+        users = random.choice(list(fixture["users"].values()))  # nosec B311
+        user = random.choice(users)  # nosec B311
+        self.get(f"/v1/user/{user['id']}/", "user")
+
+    @task(3)
+    def get_people_group(self):
+        slug = random.choice(fixture["people_groups"])  # nosec B311
+        self.get(
+            f"/v1/organization/{ORGANIZATION_CODE}/people-group/{slug}/",
+            "people group",
+        )
+
+    @task(2)
+    def get_people_group_members(self):
+        slug = random.choice(fixture["people_groups"])  # nosec B311
+        self.get(
+            f"/v1/organization/{ORGANIZATION_CODE}/people-group/{slug}/member/"
+            "?limit=30",
+            "people group members",
+        )
+
+    @task(2)
+    def get_people_group_projects(self):
+        slug = random.choice(fixture["people_groups"])  # nosec B311
+        self.get(
+            f"/v1/organization/{ORGANIZATION_CODE}/people-group/{slug}/project/",
+            "people group projects",
+        )
+
+    @task(4)
+    def search(self):
+        term = random.choice(fixture["search_terms"])  # nosec B311
+        self.get(f"/v1/search/{term}/?limit=20", "search")
+
+    @task(2)
+    def search_projects(self):
+        term = random.choice(fixture["search_terms"])  # nosec B311
+        self.get(f"/v1/search/{term}/?types=project&limit=20", "search projects")
+
+    @task(6)
+    def autocomplete(self):
+        term = random.choice(fixture["search_terms"])  # nosec B311
+        prefix = term[: random.randint(2, len(term))]  # nosec B311
+        self.get(f"/v1/autocomplete/?search={prefix}", "autocomplete")
+
+
+class AuthenticatedUser(AnonymousUser):
+    """Member of the organization, whose role is drawn from the seeded users."""
+
+    weight = 3
+    roles = {"user": 90, "facilitator": 8, "admin": 2}
+
+    def on_start(self):
+        role = random.choices(  # nosec B311
+            list(self.roles.keys()), weights=list(self.roles.values())
+        )[0]
+        self.user = random.choice(fixture["users"][role])  # nosec B311
+        self.token_expiration = 0
+        self.refresh_token()
+
+    def refresh_token(self):
+        if time.time() > self.token_expiration - 60:
+            token = mint_token(self.user["keycloak_id"])
+            self.client.headers["Authorization"] = f"Bearer {token}"
+            self.token_expiration = time.time() + TOKEN_LIFETIME
+
+    def get(self, path: str, name: str):
+        self.refresh_token()
+        super().get(path, name)
+
+    @task(2)
+    def get_recommended_projects(self):
+        self.get(
+            f"/v1/organization/{ORGANIZATION_CODE}/recommended-project/user/",
+            "recommended projects",
+        )
+
+    @task(2)
+    def get_recommended_users(self):
+        self.get(
+            f"/v1/organization/{ORGANIZATION_CODE}/recommended-user/user/",
+            "recommended users",
+        )
+
+    @task(1)
+    def get_notifications(self):
+        self.get(
+            f"/v1/organization/{ORGANIZATION_CODE}/notification/?limit=10",
+            "notifications",
+        )
@@ -1,5 +1,35 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from prometheus_client import Counter as PrometheusCounter
+from prometheus_client import Histogram
+
 from apps.commons.utils import clear_memory
 
+logger = logging.getLogger(__name__)
+
+request_sql_queries = Histogram(
+    "projects_request_sql_queries",
+    "Number of SQL queries per request.",
+    ["method", "view"],
+    buckets=(1, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+request_sql_duration = Histogram(
+    "projects_request_sql_duration_seconds",
+    "Total duration of the SQL queries per request.",
+    ["method", "view"],
+)
+request_duplicate_sql_queries = PrometheusCounter(
+    "projects_request_duplicate_sql_queries",
+    "Number of SQL queries repeating a previous query of the same request.",
+    ["method", "view"],
+)
+
 
 class PerRequestClearMiddleware:
     """Middleware used to ensure per-request caches are cleared."""
@@ -9,3 +39,118 @@ class PerRequestClearMiddleware:
 
     def __call__(self, request):
         return clear_memory(self.get_response)(request)
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording the statement and duration of each query.
+    """
+
+    # Lists of placeholders of variable length, e.g. for `IN` lookups
+    PLACEHOLDERS_LIST = re.compile(r"%s(, %s)+")
+
+    def __init__(self):
+        self.queries: list[tuple[str, float]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def duration(self) -> float:
+        return sum(duration for _, duration in self.queries)
+
+    def get_slowest(self, count: int) -> list[tuple[str, float]]:
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:count]
+
+    def get_duplicates(self) -> dict[str, int]:
+        """
+        Return the number of executions of the statements executed several times,
+        by fingerprint. Repeated statements usually come from N+1 patterns.
+        """
+        fingerprints = Counter(
+            self.PLACEHOLDERS_LIST.sub("%s, ...", sql) for sql, _ in self.queries
+        )
+        return {sql: count for sql, count in fingerprints.items() if count > 1}
+
+
+class QueryCountMiddleware:
+    """
+    Record the SQL queries of each request, enabled with `QUERY_COUNT_ENABLED`.
+
+    The number of queries and their total duration are sent in the `Server-Timing`
+    header, logged with the slowest statements and the repeated ones, and exported
+    as Prometheus metrics by view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        view = resolver_match.view_name if resolver_match else "unresolved"
+        count = len(recorder.queries)
+        duration = recorder.duration
+        duplicates = recorder.get_duplicates()
+        duplicates_count = sum(duplicates.values()) - len(duplicates)
+
+        response.headers["Server-Timing"] = ", ".join(
+            filter(
+                None,
+                [
+                    response.headers.get("Server-Timing"),
+                    f'sql;dur={duration * 1000:.1f};desc="{count} queries"',
+                    f'sql-duplicates;desc="{duplicates_count} duplicates"',
+                ],
+            )
+        )
+
+        labels = {"method": request.method, "view": view}
+        request_sql_queries.labels(**labels).observe(count)
+        request_sql_duration.labels(**labels).observe(duration)
+        request_duplicate_sql_queries.labels(**labels).inc(duplicates_count)
+
+        level = (
+            logging.WARNING
+            if count >= settings.QUERY_COUNT_WARNING_THRESHOLD
+            else logging.INFO
+        )
+        logger.log(
+            level,
+            "%s %s: %s queries in %.1fms",
+            request.method,
+            view,
+            count,
+            duration * 1000,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "status_code": response.status_code,
+                "query_count": count,
+                "query_duration_ms": round(duration * 1000, 1),
+                "duplicate_query_count": duplicates_count,
+                "slowest_queries": [
+                    {"sql": sql[:500], "duration_ms": round(query_duration * 1000, 1)}
+                    for sql, query_duration in recorder.get_slowest(
+                        settings.QUERY_COUNT_SLOWEST_QUERIES
+                    )
+                ],
+                "duplicate_queries": [
+                    {"sql": sql[:500], "count": executions}
+                    for sql, executions in sorted(
+                        duplicates.items(), key=lambda item: item[1], reverse=True
+                    )
+                ],
+            },
+        )
+        return response
@@ -179,6 +179,13 @@ MIDDLEWARE = [
     "django_prometheus.middleware.PrometheusAfterMiddleware",
 ]
 
+# Record the SQL queries of each request, see `projects.middlewares.QueryCountMiddleware`
+QUERY_COUNT_ENABLED = os.getenv("QUERY_COUNT_ENABLED", "False") == "True"
+QUERY_COUNT_SLOWEST_QUERIES = int(os.getenv("QUERY_COUNT_SLOWEST_QUERIES", 3))
+QUERY_COUNT_WARNING_THRESHOLD = int(os.getenv("QUERY_COUNT_WARNING_THRESHOLD", 50))
+if QUERY_COUNT_ENABLED:
+    MIDDLEWARE.insert(1, "projects.middlewares.QueryCountMiddleware")
+
 if DEBUG and DEBUG_TOOLBAR_INSTALLED:
     # Insert dubug toolbar middleware after whitenoise middleware
     MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
@@ -416,6 +423,8 @@ CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
+# Store the name and arguments of the tasks with their results
+CELERY_RESULT_EXTENDED = True
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_MAX_TASKS_PER_CHILD = os.getenv("CELERY_MAX_TASKS_PER_CHILD", None)
 CELERY_BEAT_SCHEDULE = {
@@ -479,6 +488,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.translations.tasks.automatic_translations",
         "schedule": crontab(minute="*/5", hour="*"),
     },
+    "prune_translation_memory": {
+        "task": "apps.translations.tasks.prune_translation_memory",
+        "schedule": crontab(minute=0, hour=2),
+    },
     "send_instruction_notification": {
         "task": "apps.notifications.tasks.notify_new_instructions",
         "schedule": crontab(minute=0, hour="*"),
@@ -487,6 +500,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.search.tasks.clean_duplicate_search_objects",
         "schedule": crontab(minute=10, hour="*"),
     },
+    "flush_search_index_updates": {
+        "task": "apps.search.tasks.flush_search_index_updates",
+        "schedule": crontab(minute="*", hour="*"),
+    },
 }
 
 # Cache settings
@@ -511,12 +528,15 @@ CACHE_LOCATIONS_LIST_TTL = 60 * int(
     os.getenv("CACHE_LOCATIONS_LIST_TTL", CACHE_DEFAULT_TTL)
 )
 CACHE_RECOMMENDATION_POOL_TTL = 86400  # 1 day
-CACHE_PROJECT_VIEWS = 86400  # 1 day
+CACHE_USER_VISIBILITY_TTL = 60 * int(os.getenv("CACHE_USER_VISIBILITY_TTL", 60))
+CACHE_MODULES_COUNT_TTL = 60 * int(os.getenv("CACHE_MODULES_COUNT_TTL", 60))
 
 # Memory usage settings
 
 FORCE_CLEAN_DB_CACHE = os.getenv("FORCE_CLEAN_DB_CACHE", "False") == "True"
 FORCE_GARBAGE_COLLECT = os.getenv("FORCE_GARBAGE_COLLECT", "False") == "True"
+# Number of projects or users whose scores are calculated at once
+SCORES_CHUNK_SIZE = int(os.getenv("SCORES_CHUNK_SIZE", 1000))
 
 #############
 #   Emails  #
@@ -527,6 +547,16 @@ EMAIL_PORT = int(os.getenv("EMAIL_PORT", "1025"))
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "projects@mg.lp-i.dev")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", False)
+# Emails sent over a single SMTP connection, and retries of the batches whose
+# connection failed, with an exponential backoff starting at the given delay in
+# seconds
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 100))
+EMAIL_BATCH_MAX_RETRIES = int(os.getenv("EMAIL_BATCH_MAX_RETRIES", 5))
+EMAIL_BATCH_RETRY_DELAY = int(os.getenv("EMAIL_BATCH_RETRY_DELAY", 60))
+# Users reminded of their pending notifications by each subtask of the daily reminder
+NOTIFICATIONS_REMINDER_CHUNK_SIZE = int(
+    os.getenv("NOTIFICATIONS_REMINDER_CHUNK_SIZE", 500)
+)
 
 EMAIL_CONTACT_SENDER = os.getenv(
     "EMAIL_CONTACT_SENDER", "contact.projects@learningplanetinstitute.org"
@@ -546,6 +576,12 @@ EMAIL_REPORT_RECIPIENTS = os.getenv(
 IMAGE_ORPHAN_THRESHOLD_SECONDS = 86400  # 1 day
 TAG_ORPHAN_THRESHOLD_SECONDS = 86400  # 1 day
 
+# Formats in which the image variations are rendered in addition to the original
+# format, if supported by Pillow.
+IMAGE_VARIATIONS_FORMATS = ["WEBP", "AVIF"]
+# Number of files copied concurrently in the storage, e.g. when duplicating a project
+FILES_COPY_WORKERS = int(os.getenv("FILES_COPY_WORKERS", 8))
+
 # MJML
 MJML_BACKEND_MODE = "httpserver"
 MJML_HTTPSERVERS = [
@@ -621,9 +657,15 @@ OPENSEARCH_DSL_AUTOSYNC = os.getenv("OPENSEARCH_DSL_AUTOSYNC", False) == "True"
 OPENSEARCH_DSL_PARALLEL = True
 OPENSEARCH_DSL_SIGNAL_PROCESSOR = os.getenv(
     "OPENSEARCH_DSL_SIGNAL_PROCESSOR",
-    "django_opensearch_dsl.signals.CelerySignalProcessor",
+    "apps.search.signals.DebouncedSignalProcessor",
 )
+# Seconds during which changes are coalesced before updating the search indices
+OPENSEARCH_DSL_DEBOUNCE_WINDOW = int(os.getenv("OPENSEARCH_DSL_DEBOUNCE_WINDOW", 10))
 OPENSEARCH_INDEX_PREFIX = os.getenv("OPENSEARCH_INDEX_PREFIX", "proj-local")
+# Maximum duration in seconds of an autocomplete request
+OPENSEARCH_AUTOCOMPLETE_TIMEOUT = float(
+    os.getenv("OPENSEARCH_AUTOCOMPLETE_TIMEOUT", 0.5)
+)
 
 
 #####################
@@ -678,6 +720,37 @@ GOOGLE_DEFAULT_ORG_UNIT = "/CRI/Admin Staff"
 
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY", "")
 
+# Rate-limited calls are retried with an exponential backoff
+MISTRAL_MAX_RETRIES = int(os.getenv("MISTRAL_MAX_RETRIES", 5))
+MISTRAL_MAX_RETRY_DELAY = int(os.getenv("MISTRAL_MAX_RETRY_DELAY", 60))
+
+# Batch vectorization: inputs sent in a single embeddings call, and concurrent
+# chat completions used to summarize the prompts
+MISTRAL_EMBEDDING_BATCH_SIZE = int(os.getenv("MISTRAL_EMBEDDING_BATCH_SIZE", 32))
+MISTRAL_EMBEDDING_BATCH_MAX_LENGTH = int(
+    os.getenv("MISTRAL_EMBEDDING_BATCH_MAX_LENGTH", 40000)
+)
+MISTRAL_SUMMARY_WORKERS = int(os.getenv("MISTRAL_SUMMARY_WORKERS", 4))
+MISTRAL_VECTORIZATION_CHUNK_SIZE = int(
+    os.getenv("MISTRAL_VECTORIZATION_CHUNK_SIZE", 500)
+)
+
+# Vector searches first select this number of candidates among the filtered items
+# with the approximate indexes
+VECTOR_SEARCH_CANDIDATES = int(os.getenv("VECTOR_SEARCH_CANDIDATES", 100))
+# Size of the candidate lists explored by the HNSW indexes, at least the number of
+# candidates, and number of lists probed by the IVFFlat indexes
+VECTOR_SEARCH_EF_SEARCH = int(os.getenv("VECTOR_SEARCH_EF_SEARCH", 100))
+VECTOR_SEARCH_PROBES = int(os.getenv("VECTOR_SEARCH_PROBES", 10))
+# The indexes are scanned further when too few of the nearest rows match the
+# filters of the search (pgvector >= 0.8), "off" or "relaxed_order"
+VECTOR_SEARCH_ITERATIVE_SCAN = os.getenv(
+    "VECTOR_SEARCH_ITERATIVE_SCAN", "relaxed_order"
+)
+
+# Number of nearest neighbours stored for each project and people group
+SIMILAR_ITEMS_COUNT = int(os.getenv("SIMILAR_ITEMS_COUNT", 50))
+
 
 ##############
 #    ESCO    #
@@ -695,6 +768,16 @@ AZURE_TRANSLATOR_REGION = os.getenv("AZURE_TRANSLATOR_REGION", "francecentral")
 AZURE_TRANSLATOR_ENDPOINT = os.getenv(
     "AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com"
 )
+TRANSLATION_MEMORY_ENABLED = os.getenv("TRANSLATION_MEMORY_ENABLED", "True") == "True"
+# Translated chunks are kept in the translation memory until they are unused for the
+# given number of days, and the least recently used ones are pruned above the
+# maximum number of entries
+TRANSLATION_MEMORY_RETENTION_DAYS = int(
+    os.getenv("TRANSLATION_MEMORY_RETENTION_DAYS", 90)
+)
+TRANSLATION_MEMORY_MAX_ENTRIES = int(
+    os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", 500000)
+)
 
 ##############
 # ADMIN #
@@ -0,0 +1,49 @@
+import os
+
+from projects.settings.base import *  # noqa: F401, F403
+
+# Settings used to run load tests against a local stack, see `load-testing/README.md`.
+# Never use them on a deployed environment: anyone knowing the secret can forge a
+# token for any user.
+
+ENVIRONMENT = "loadtest"
+FRONTEND_URL = "http://localhost:8080"
+
+
+##############
+#  STORAGES  #
+##############
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+MEDIA_ROOT = BASE_DIR / "load-testing" / "media"  # noqa: F405
+
+
+##############
+#    AUTH    #
+##############
+
+# Tokens are minted locally by locust instead of Keycloak
+SIMPLE_JWT["ALGORITHM"] = "HS256"  # noqa: F405
+SIMPLE_JWT["SIGNING_KEY"] = os.getenv("LOADTEST_JWT_SECRET", SECRET_KEY)  # noqa: F405
+
+
+##############
+#  QUERIES   #
+##############
+
+if "projects.middlewares.QueryCountMiddleware" not in MIDDLEWARE:  # noqa: F405
+    MIDDLEWARE.insert(1, "projects.middlewares.QueryCountMiddleware")  # noqa: F405
+
+
+##############
+# OpenSearch #
+##############
+
+OPENSEARCH_INDEX_PREFIX = os.getenv("OPENSEARCH_INDEX_PREFIX", "proj-loadtest")
+
+ENABLE_CRISALID_BUS = False
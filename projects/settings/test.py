@@ -36,6 +36,13 @@ CACHES = {
 ENABLE_CACHE = False
 
 
+##############
+# TRANSLATOR #
+##############
+
+TRANSLATION_MEMORY_ENABLED = False
+
+
 ##############
 #    AUTH    #
 ##############
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.files.serializers import ImageSerializer
+from apps.files.serializers import ImageSerializer, ImageUrlsListSerializer
 
 from .models import IdentityProvider
 
@@ -10,4 +10,5 @@ class IdentityProviderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = IdentityProvider
+        list_serializer_class = ImageUrlsListSerializer
         fields = ("id", "alias", "logo", "enabled")
@@ -1,4 +1,7 @@
 import json
+import random
+import time
+from collections.abc import Callable, Iterator
 from typing import Any
 
 from django.conf import settings
@@ -8,6 +11,42 @@ from mistralai.client import Mistral
 class MistralService:
     service = Mistral(api_key=settings.MISTRAL_API_KEY)
 
+    @staticmethod
+    def _get_retry_delay(error: Exception, attempt: int) -> float | None:
+        """
+        Return the delay before retrying a call that failed with `error`, or None
+        if the call should not be retried.
+
+        Only rate-limited calls are retried, after the delay requested by the API
+        if any, or with an exponential backoff and jitter.
+        """
+        if getattr(error, "status_code", None) != 429:
+            return None
+        if attempt >= settings.MISTRAL_MAX_RETRIES:
+            return None
+        headers = getattr(getattr(error, "raw_response", None), "headers", None) or {}
+        try:
+            delay = float(headers.get("retry-after", ""))
+        except ValueError:
+            delay = 2**attempt * random.uniform(0.5, 1)  # nosec B311
+        return min(delay, settings.MISTRAL_MAX_RETRY_DELAY)
+
+    @classmethod
+    def _call(cls, method: Callable, **kwargs) -> Any:
+        """
+        Call a method of the Mistral client, retrying rate-limited calls.
+        """
+        attempt = 0
+        while True:
+            try:
+                return method(**kwargs)
+            except Exception as e:  # noqa: PIE786
+                delay = cls._get_retry_delay(e, attempt)
+                if delay is None:
+                    raise e
+                time.sleep(delay)
+                attempt += 1
+
     @classmethod
     def get_chat_response(cls, system: list[str], prompt: list[str], **kwargs) -> str:
         """
@@ -17,8 +56,11 @@ class MistralService:
             *[{"content": message, "role": "system"} for message in system],
             *[{"content": message, "role": "user"} for message in prompt],
         ]
-        response = cls.service.chat.complete(
-            model="mistral-small", messages=messages, **kwargs
+        response = cls._call(
+            cls.service.chat.complete,
+            model="mistral-small",
+            messages=messages,
+            **kwargs,
         )
         return "\n".join([choice.message.content for choice in response.choices])
 
@@ -30,7 +72,8 @@ class MistralService:
             *[{"content": message, "role": "system"} for message in system],
             *[{"content": message, "role": "user"} for message in prompt],
         ]
-        response = cls.service.chat.complete(
+        response = cls._call(
+            cls.service.chat.complete,
             model="mistral-small",
             messages=messages,
             response_format={"type": "json_object"},
@@ -43,5 +86,51 @@ class MistralService:
         """
         Get the prompt's vector in 1024 dimensions from Mistral API.
         """
-        response = cls.service.embeddings.create(model="mistral-embed", inputs=[prompt])
-        return response.data[0].embedding
+        return cls.get_embeddings([prompt])[0]
+
+    @classmethod
+    def get_embeddings(cls, prompts: list[str]) -> list[list[float]]:
+        """
+        Get the vectors of several prompts in 1024 dimensions with a single call to
+        Mistral API.
+
+        Args:
+            - prompts (list[str]): The prompts to embed.
+
+        Returns:
+            - The vectors, in the order of the prompts.
+        """
+        response = cls._call(
+            cls.service.embeddings.create, model="mistral-embed", inputs=prompts
+        )
+        return [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+
+    @staticmethod
+    def batch_prompts(prompts: list[Any], get_text: Callable) -> Iterator[list[Any]]:
+        """
+        Split prompts in batches that can be sent in a single embeddings call.
+
+        The batches are limited by `MISTRAL_EMBEDDING_BATCH_SIZE` inputs and by
+        `MISTRAL_EMBEDDING_BATCH_MAX_LENGTH` characters, to stay under the token
+        limit of the API.
+
+        Args:
+            - prompts (list[Any]): The objects to batch.
+            - get_text (Callable): Return the text to embed for an object.
+
+        Returns:
+            - An iterator over the batches.
+        """
+        batch, length = [], 0
+        for prompt in prompts:
+            text_length = len(get_text(prompt))
+            if batch and (
+                len(batch) >= settings.MISTRAL_EMBEDDING_BATCH_SIZE
+                or length + text_length > settings.MISTRAL_EMBEDDING_BATCH_MAX_LENGTH
+            ):
+                yield batch
+                batch, length = [], 0
+            batch.append(prompt)
+            length += text_length
+        if batch:
+            yield batch
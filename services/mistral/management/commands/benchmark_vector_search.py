@@ -0,0 +1,161 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from services.mistral.utils import set_vector_search_options
+
+
+def to_vector(array: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.6f}" for value in array) + "]"
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Compare the recall and the latency of an approximate vector index with the "
+        "exact search, on a synthetic dataset stored in a temporary table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, default=10000, help="Number of vectors to index."
+        )
+        parser.add_argument(
+            "--dimensions", type=int, default=1024, help="Dimensions of the vectors."
+        )
+        parser.add_argument(
+            "--clusters",
+            type=int,
+            default=100,
+            help="Number of clusters around which the vectors are generated.",
+        )
+        parser.add_argument(
+            "--queries", type=int, default=100, help="Number of searches to run."
+        )
+        parser.add_argument(
+            "--k", type=int, default=10, help="Number of neighbours to search."
+        )
+        parser.add_argument(
+            "--index", choices=["hnsw", "ivfflat"], default="hnsw", help="Index type."
+        )
+        parser.add_argument("--m", type=int, default=16, help="HNSW `m` parameter.")
+        parser.add_argument(
+            "--ef-construction",
+            type=int,
+            default=64,
+            help="HNSW `ef_construction` parameter.",
+        )
+        parser.add_argument(
+            "--lists", type=int, default=100, help="IVFFlat `lists` parameter."
+        )
+        parser.add_argument(
+            "--ef-search",
+            type=int,
+            nargs="+",
+            default=[40, 100, 200],
+            help="HNSW `ef_search` values to benchmark.",
+        )
+        parser.add_argument(
+            "--probes",
+            type=int,
+            nargs="+",
+            default=[1, 10, 20],
+            help="IVFFlat `probes` values to benchmark.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the random generator."
+        )
+
+    def generate_vectors(
+        self, generator: np.random.Generator, centers: np.ndarray, count: int
+    ) -> np.ndarray:
+        clusters = generator.integers(len(centers), size=count)
+        noise = generator.normal(scale=0.5, size=(count, centers.shape[1]))
+        return centers[clusters] + noise
+
+    def search(self, cursor, queries: list[str], k: int) -> tuple[list[set], list]:
+        results, latencies = [], []
+        for query in queries:
+            start = time.perf_counter()
+            cursor.execute(
+                "SELECT id FROM vector_benchmark "
+                "ORDER BY embedding <=> %s::vector LIMIT %s",
+                [query, k],
+            )
+            results.append({row[0] for row in cursor.fetchall()})
+            latencies.append((time.perf_counter() - start) * 1000)
+        return results, latencies
+
+    def report(self, name: str, latencies: list[float], recall: float | None = None):
+        p50, p95 = np.percentile(latencies, [50, 95])
+        recall = f"{recall:.3f}" if recall is not None else "-"
+        self.stdout.write(f"{name:<20} {recall:>8} {p50:>10.2f} {p95:>10.2f}")
+
+    def handle(self, *args, **options):
+        generator = np.random.default_rng(options["seed"])
+        centers = generator.normal(size=(options["clusters"], options["dimensions"]))
+        vectors = self.generate_vectors(generator, centers, options["size"])
+        queries = [
+            to_vector(vector)
+            for vector in self.generate_vectors(generator, centers, options["queries"])
+        ]
+        k = options["k"]
+
+        # The temporary table is dropped at the end of the transaction
+        with transaction.atomic(), connection.cursor() as cursor:
+            # The interpolated values are integers parsed by the arguments parser
+            cursor.execute(  # nosec B608
+                "CREATE TEMPORARY TABLE vector_benchmark "
+                f"(id integer PRIMARY KEY, embedding vector({options['dimensions']})) "
+                "ON COMMIT DROP"
+            )
+            cursor.executemany(
+                "INSERT INTO vector_benchmark VALUES (%s, %s::vector)",
+                [(i, to_vector(vector)) for i, vector in enumerate(vectors)],
+            )
+            exact_results, latencies = self.search(cursor, queries, k)
+            self.stdout.write(
+                f"{'search':<20} {'recall':>8} {'p50 (ms)':>10} {'p95 (ms)':>10}"
+            )
+            self.report("exact", latencies)
+
+            start = time.perf_counter()
+            if options["index"] == "hnsw":
+                cursor.execute(  # nosec B608
+                    "CREATE INDEX ON vector_benchmark USING hnsw "
+                    "(embedding vector_cosine_ops) "
+                    f"WITH (m = {options['m']}, "
+                    f"ef_construction = {options['ef_construction']})"
+                )
+                search_options = [
+                    {"ef_search": value} for value in options["ef_search"]
+                ]
+            else:
+                cursor.execute(  # nosec B608
+                    "CREATE INDEX ON vector_benchmark USING ivfflat "
+                    f"(embedding vector_cosine_ops) WITH (lists = {options['lists']})"
+                )
+                search_options = [{"probes": value} for value in options["probes"]]
+            cursor.execute("ANALYZE vector_benchmark")
+            build_time = time.perf_counter() - start
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for setting in search_options:
+                set_vector_search_options(connection, **setting, is_local=True)
+                results, latencies = self.search(cursor, queries, k)
+                recall = np.mean(
+                    [
+                        len(result & exact) / len(exact)
+                        for result, exact in zip(results, exact_results)
+                    ]
+                )
+                name, value = next(iter(setting.items()))
+                self.report(f"{options['index']} {name}={value}", latencies, recall)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{options['index']} index built in {build_time:.2f}s for "
+                f"{options['size']} vectors of {options['dimensions']} dimensions."
+            )
+        )
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.4 on 2026-10-16 10:12
+
+import django.contrib.postgres.operations
+import pgvector.django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The indexes are built concurrently to not lock the tables against writes
+    atomic = False
+
+    dependencies = [
+        ("mistral", "0005_groupembedding"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="projectembedding",
+            index=pgvector.django.HnswIndex(
+                condition=models.Q(("is_visible", True)),
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="mistral_project_hnsw_idx",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="userembedding",
+            index=pgvector.django.HnswIndex(
+                condition=models.Q(("is_visible", True)),
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="mistral_user_hnsw_idx",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="documentembedding",
+            index=pgvector.django.HnswIndex(
+                condition=models.Q(("is_visible", True)),
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="mistral_document_hnsw_idx",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="groupembedding",
+            index=pgvector.django.HnswIndex(
+                condition=models.Q(("is_visible", True)),
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="mistral_group_hnsw_idx",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
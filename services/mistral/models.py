@@ -1,15 +1,22 @@
 import hashlib
 import itertools
 import traceback
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import Group
 from django.db import models, transaction
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 from django.utils.html import strip_tags
-from pgvector.django import CosineDistance, VectorField
+from pgvector.django import CosineDistance, HnswIndex, VectorField
 
 from apps.commons.models import GroupData
-from apps.projects.models import Project
+from apps.projects.models import Project, ProjectScore
 
 from .exceptions import VectorSearchWrongQuerysetError
 from .interface import MistralService
@@ -19,6 +26,47 @@ if TYPE_CHECKING:
     from apps.skills.models import Tag
 
 
+def weighted_average(
+    vectors: list[list[float]], weights: list[float]
+) -> np.ndarray | None:
+    """
+    Return the average of the vectors weighted by `weights`, or None if there is
+    no vector or if the weights sum to zero.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if not weights.size or not weights.sum():
+        return None
+    return np.average(np.asarray(vectors, dtype=np.float64), axis=0, weights=weights)
+
+
+def vector_index(name: str) -> HnswIndex:
+    """
+    Return an approximate index for the cosine distance searches on the visible
+    embeddings of a table.
+    """
+    return HnswIndex(
+        name=name,
+        fields=["embedding"],
+        m=16,
+        ef_construction=64,
+        opclasses=["vector_cosine_ops"],
+        condition=Q(is_visible=True),
+    )
+
+
+def get_user_ids_chunks(queryset: QuerySet | None = None) -> Iterator[list[int]]:
+    """
+    Iterate over the ids of the given users, or of all the users, by chunks of
+    `MISTRAL_VECTORIZATION_CHUNK_SIZE` ids.
+    """
+    if queryset is None:
+        queryset = UserEmbedding.item.field.related_model.objects.all()
+    chunk_size = settings.MISTRAL_VECTORIZATION_CHUNK_SIZE
+    user_ids = queryset.values_list("id", flat=True).iterator(chunk_size=chunk_size)
+    for chunk in itertools.batched(user_ids, chunk_size):
+        yield list(chunk)
+
+
 class HasWeight:
     """
     Abstract class for models that have a weight in an average vector.
@@ -80,6 +128,29 @@ class Embedding(models.Model):
             self.save(update_fields=["is_visible"])
         return is_visible
 
+    def save_error(self, error: Exception) -> EmbeddingError:
+        return EmbeddingError.objects.create(
+            item_type=self.item.__class__.__name__,
+            item_id=self.item.id,
+            error=error.__class__.__name__,
+            traceback="".join(traceback.format_exception(error)),
+        )
+
+    @classmethod
+    def bulk_save(cls, embeddings: Iterable["Embedding"], fields: list[str]):
+        """
+        Create the new embeddings and update the given fields of the existing ones
+        with two queries.
+        """
+        now = timezone.now()
+        created, existing = [], []
+        for embedding in embeddings:
+            embedding.last_update = now
+            (created if embedding._state.adding else existing).append(embedding)
+        with transaction.atomic():
+            cls.objects.bulk_create(created)
+            cls.objects.bulk_update(existing, [*fields, "last_update"])
+
     def vectorize(self, *args, **kwargs) -> "Embedding":
         try:
             with transaction.atomic():
@@ -89,12 +160,7 @@ class Embedding(models.Model):
                     self.embedding = None
                     self.save()
         except Exception as e:  # noqa: PIE786
-            EmbeddingError.objects.create(
-                item_type=self.item.__class__.__name__,
-                item_id=self.item.id,
-                error=e.__class__.__name__,
-                traceback=traceback.format_exc(),
-            )
+            self.save_error(e)
         return self
 
     @classmethod
@@ -103,8 +169,20 @@ class Embedding(models.Model):
         embedding: list[float],
         queryset: QuerySet | None = None,
         thresold: float | None = None,
+        limit: int | None = None,
     ) -> QuerySet:
-        queryset = queryset or cls.item.field.related_model.objects
+        """
+        Return the items of the queryset ordered by the cosine distance between
+        their embedding and the given one.
+
+        If `limit` is set, only the `limit` nearest visible embeddings of the items
+        of the queryset are selected with the approximate index. The index scan is
+        iterative (see `VECTOR_SEARCH_ITERATIVE_SCAN`), so it goes on until enough
+        items of the queryset are found, instead of filtering the nearest items of
+        the whole table.
+        """
+        if queryset is None:
+            queryset = cls.item.field.related_model.objects.all()
         if not queryset.model == cls.item.field.related_model:
             raise VectorSearchWrongQuerysetError
         related_name = cls.item.field.related_query_name()
@@ -114,6 +192,13 @@ class Embedding(models.Model):
             .annotate(cosine=CosineDistance(f"{related_name}__embedding", embedding))
             .order_by("cosine")
         )
+        if limit is not None:
+            candidates = (
+                cls.objects.filter(is_visible=True, item__in=queryset.values("pk"))
+                .order_by(CosineDistance("embedding", embedding))
+                .values("item_id")[:limit]
+            )
+            qs = qs.filter(pk__in=candidates)
 
         if thresold is not None:
             return qs.filter(cosine__lte=thresold)
@@ -128,6 +213,8 @@ class MistralEmbedding(Embedding):
     To set it up, you need to define the following attributes:
         - item: a OneToOneField to the model that will be embedded, it is advised
             to set an explicit related_name
+        - summarize_prompt: whether the prompt is summarized by a chat completion
+            before being embedded, otherwise its lines are embedded as is
         - temperature: the temperature to use for the chat prompt (API default is 0.7)
         - max_tokens: the maximum number of tokens to use for the chat prompt
 
@@ -138,8 +225,11 @@ class MistralEmbedding(Embedding):
             for the chat prompt
         - get_summary_chat_prompt: a method that returns the user messages for the
             chat prompt
+        - get_prompt: a method that returns the prompt to embed, if it is not the
+            chat prompt
     """
 
+    summarize_prompt: bool = True
     temperature: float | None = None
     max_tokens: int | None = None
     summary = models.TextField(blank=True)
@@ -155,20 +245,31 @@ class MistralEmbedding(Embedding):
     def get_summary_chat_prompt(self) -> list[str]:
         raise NotImplementedError()
 
+    def get_prompt(self) -> list[str]:
+        return self.get_summary_chat_prompt()
+
+    def get_embedding_input(self, prompt: list[str]) -> str:
+        return "\n\n".join(prompt)
+
     def set_embedding(
         self, summary: str | None = None, *args, **kwargs
     ) -> "MistralEmbedding":
-        if self.prompt_hashcode != self.hash_prompt():
-            prompt = self.get_summary_chat_prompt()
-            summary = summary or self.get_summary(prompt=prompt)
-            self.summary = summary
-            self.embedding = MistralService.get_embedding(summary) or None
-            self.prompt_hashcode = self.hash_prompt(prompt)
+        prompt = self.get_prompt()
+        prompt_hashcode = self.hash_prompt(prompt)
+        if self.prompt_hashcode != prompt_hashcode:
+            if self.summarize_prompt:
+                self.summary = summary or self.get_summary(prompt=prompt)
+                self.embedding = MistralService.get_embedding(self.summary) or None
+            else:
+                self.embedding = MistralService.get_embedding(
+                    self.get_embedding_input(prompt)
+                )
+            self.prompt_hashcode = prompt_hashcode
             self.save()
         return self
 
     def hash_prompt(self, prompt: list[str] | None = None) -> str:
-        prompt = prompt or self.get_summary_chat_prompt()
+        prompt = prompt or self.get_prompt()
         prompt = "\n".join(prompt)
         return hashlib.sha256(prompt.encode()).hexdigest()
 
@@ -187,12 +288,108 @@ class MistralEmbedding(Embedding):
         }
         return MistralService.get_chat_response(system, prompt, **kwargs)
 
+    @classmethod
+    def vectorize_batch(cls, queryset: QuerySet | None = None) -> int:
+        """
+        Vectorize the given items, or all the items of the related model, with
+        batched calls to the Mistral API.
+
+        Only the items whose prompt changed since their last vectorization are sent
+        to the API. Their prompts are summarized concurrently, then embedded with
+        several inputs per call, and the embeddings are written back in bulk every
+        `MISTRAL_VECTORIZATION_CHUNK_SIZE` items.
+
+        Args:
+            - queryset (QuerySet | None): The items to vectorize.
+
+        Returns:
+            - The number of updated embeddings.
+        """
+        related_name = cls.item.field.related_query_name()
+        if queryset is None:
+            queryset = cls.item.field.related_model.objects.all()
+        chunk_size = settings.MISTRAL_VECTORIZATION_CHUNK_SIZE
+        items = queryset.select_related(related_name).iterator(chunk_size=chunk_size)
+        updated = 0
+        for chunk in itertools.batched(items, chunk_size):
+            embeddings = [
+                getattr(item, related_name, None) or cls(item=item) for item in chunk
+            ]
+            updated += cls._vectorize_chunk(embeddings)
+        return updated
+
+    @classmethod
+    def _vectorize_chunk(cls, embeddings: list["MistralEmbedding"]) -> int:
+        updated = []
+        pending = []
+        for embedding in embeddings:
+            try:
+                is_visible = embedding.get_is_visible()
+                if is_visible:
+                    prompt = embedding.get_prompt()
+                    prompt_hashcode = embedding.hash_prompt(prompt)
+                    if embedding.prompt_hashcode != prompt_hashcode:
+                        pending.append((embedding, prompt, prompt_hashcode))
+                        continue
+            except Exception as e:  # noqa: PIE786
+                embedding.save_error(e)
+                continue
+            if embedding.is_visible != is_visible or (
+                not is_visible and embedding.embedding is not None
+            ):
+                embedding.is_visible = is_visible
+                if not is_visible:
+                    embedding.embedding = None
+                updated.append(embedding)
+
+        inputs = []
+        if cls.summarize_prompt:
+            system = cls.get_summary_chat_system()
+            with ThreadPoolExecutor(settings.MISTRAL_SUMMARY_WORKERS) as executor:
+                futures = [
+                    executor.submit(embedding.get_summary, system, prompt)
+                    for embedding, prompt, _ in pending
+                ]
+            for (embedding, _, prompt_hashcode), future in zip(pending, futures):
+                try:
+                    inputs.append((embedding, future.result(), prompt_hashcode))
+                except Exception as e:  # noqa: PIE786
+                    embedding.save_error(e)
+        else:
+            inputs = [
+                (embedding, embedding.get_embedding_input(prompt), prompt_hashcode)
+                for embedding, prompt, prompt_hashcode in pending
+            ]
+
+        for batch in MistralService.batch_prompts(inputs, lambda i: i[1]):
+            try:
+                vectors = MistralService.get_embeddings([text for _, text, _ in batch])
+            except Exception as e:  # noqa: PIE786
+                for embedding, _, _ in batch:
+                    embedding.save_error(e)
+                continue
+            for (embedding, text, prompt_hashcode), vector in zip(batch, vectors):
+                if cls.summarize_prompt:
+                    embedding.summary = text
+                embedding.embedding = vector or None
+                embedding.prompt_hashcode = prompt_hashcode
+                embedding.is_visible = True
+                updated.append(embedding)
+
+        cls.bulk_save(
+            updated, ["is_visible", "embedding", "summary", "prompt_hashcode"]
+        )
+        return len(updated)
+
 
 class ProjectEmbedding(MistralEmbedding, HasWeight):
     item = models.OneToOneField(
         "projects.Project", on_delete=models.CASCADE, related_name="embedding"
     )
 
+    class Meta:
+        indexes = [vector_index("mistral_project_hnsw_idx")]
+
     def get_weight(self) -> float:
         return self.item.get_or_create_score().score
 
@@ -298,6 +495,15 @@ class UserProfileEmbedding(MistralEmbedding, HasWeight):
 
 
 class UserProjectsEmbedding(Embedding, HasWeight):
+    role_weights = {
+        GroupData.Role.MEMBERS: 1,
+        GroupData.Role.OWNERS: 2,
+        GroupData.Role.REVIEWERS: 1,
+        GroupData.Role.MEMBER_GROUPS: 1,
+        GroupData.Role.OWNER_GROUPS: 2,
+        GroupData.Role.REVIEWER_GROUPS: 1,
+    }
+
     item = models.OneToOneField(
         "accounts.ProjectUser",
         on_delete=models.CASCADE,
@@ -308,17 +514,73 @@ class UserProjectsEmbedding(Embedding, HasWeight):
     def user(self) -> "ProjectUser":
         return self.item
 
-    def get_weight(self) -> float:
-        return sum(
-            p.get_or_create_score().score
-            for p in Project.objects.filter(
-                groups__users=self.user,
-                deleted_at__isnull=True,
-                embedding__isnull=False,
-                embedding__is_visible=True,
-                embedding__embedding__isnull=False,
-            ).distinct()
+    @classmethod
+    def get_users_projects(
+        cls, user_ids: list[int]
+    ) -> dict[int, list[tuple[np.ndarray, float, float]]]:
+        """
+        Get the embeddings and scores of the visible projects of the given users
+        with a single query.
+
+        Args:
+            - user_ids (list[int]): The ids of the users.
+
+        Returns:
+            - The projects of each user, as tuples of the project's embedding, the
+                weight of the user's roles in the project and the project's score.
+        """
+        rows = Group.objects.filter(
+            users__in=user_ids,
+            projects__isnull=False,
+            projects__deleted_at__isnull=True,
+            projects__embedding__is_visible=True,
+            projects__embedding__embedding__isnull=False,
+        ).values_list(
+            "users",
+            "name",
+            "projects",
+            "projects__embedding__embedding",
+            "projects__score__score",
         )
+        vectors, weights, scores = {}, defaultdict(int), {}
+        for user_id, name, project_id, vector, score in rows:
+            vectors[project_id] = vector
+            scores[project_id] = score
+            weights[user_id, project_id] += sum(
+                weight for role, weight in cls.role_weights.items() if role in name
+            )
+        missing_scores = [pk for pk, score in scores.items() if score is None]
+        if missing_scores:
+            ProjectScore.calculate_scores(Project.objects.filter(pk__in=missing_scores))
+            scores.update(
+                ProjectScore.objects.filter(project_id__in=missing_scores).values_list(
+                    "project_id", "score"
+                )
+            )
+        users_projects = defaultdict(list)
+        for (user_id, project_id), weight in weights.items():
+            users_projects[user_id].append(
+                (vectors[project_id], weight, scores[project_id])
+            )
+        return users_projects
+
+    @staticmethod
+    def aggregate(
+        projects: list[tuple[np.ndarray, float, float]],
+    ) -> tuple[np.ndarray | None, float]:
+        """
+        Return the average of the projects embeddings, weighted by the roles and
+        the scores, and the weight of this average in the user's embedding.
+        """
+        if not projects:
+            return None, 0
+        vectors, role_weights, scores = zip(*projects)
+        weights = np.array(role_weights) * np.array(scores)
+        return weighted_average(vectors, weights), sum(scores)
+
+    def get_weight(self) -> float:
+        projects = self.get_users_projects([self.user.id]).get(self.user.id, [])
+        return self.aggregate(projects)[1]
 
     def get_is_visible(self) -> bool:
         return self.user.groups.filter(
@@ -330,41 +592,57 @@ class UserProjectsEmbedding(Embedding, HasWeight):
         ).exists()
 
     def set_embedding(self, *args, **kwargs) -> "UserProjectsEmbedding":
-        data = [
-            [
-                {"project": group.projects.get(), "weight": weight}
-                for group in self.user.groups.filter(
-                    projects__isnull=False,
-                    projects__deleted_at__isnull=True,
-                    projects__embedding__isnull=False,
-                    projects__embedding__is_visible=True,
-                    projects__embedding__embedding__isnull=False,
-                    name__contains=role,
-                )
-            ]
-            for role, weight in [
-                (GroupData.Role.MEMBERS, 1),
-                (GroupData.Role.OWNERS, 2),
-                (GroupData.Role.REVIEWERS, 1),
-                (GroupData.Role.MEMBER_GROUPS, 1),
-                (GroupData.Role.OWNER_GROUPS, 2),
-                (GroupData.Role.REVIEWER_GROUPS, 1),
-            ]
-        ]
-        data = [
-            {
-                "vector": d["project"].embedding.embedding,
-                "weight": d["weight"] * d["project"].get_or_create_score().score,
-            }
-            for d in list(itertools.chain.from_iterable(data))
-            if d["project"].embedding and d["project"].embedding.embedding is not None
-        ]
-        total_weight = sum(d["weight"] for d in data)
-        vectors = [[i * d["weight"] for i in d["vector"]] for d in data]
-        self.embedding = [sum(row) / total_weight for row in zip(*vectors)] or None
+        projects = self.get_users_projects([self.user.id]).get(self.user.id, [])
+        self.embedding = self.aggregate(projects)[0]
         self.save()
         return self
 
+    @classmethod
+    def vectorize_users(
+        cls, user_ids: list[int]
+    ) -> dict[int, tuple[np.ndarray | None, float]]:
+        """
+        Compute and save the embeddings of the given users with a constant number
+        of queries.
+
+        Args:
+            - user_ids (list[int]): The ids of the users.
+
+        Returns:
+            - The embedding of each user and its weight in the user's embedding.
+        """
+        users_projects = cls.get_users_projects(user_ids)
+        embeddings = {
+            embedding.item_id: embedding
+            for embedding in cls.objects.filter(item_id__in=user_ids).defer("embedding")
+        }
+        results = {}
+        for user_id in user_ids:
+            vector, weight = cls.aggregate(users_projects.get(user_id, []))
+            results[user_id] = (vector, weight)
+            if vector is not None or user_id in embeddings:
+                embedding = embeddings.get(user_id, cls(item_id=user_id))
+                embedding.embedding = vector
+                embedding.is_visible = vector is not None
+                embeddings[user_id] = embedding
+        cls.bulk_save(embeddings.values(), ["embedding", "is_visible"])
+        return results
+
+    @classmethod
+    def vectorize_bulk(cls, queryset: QuerySet | None = None) -> int:
+        """
+        Recompute the embeddings of the given users, or of all the users, from the
+        current project embeddings.
+
+        Returns:
+            - The number of processed users.
+        """
+        count = 0
+        for user_ids in get_user_ids_chunks(queryset):
+            cls.vectorize_users(user_ids)
+            count += len(user_ids)
+        return count
+
 
 class UserEmbedding(Embedding):
     item = models.OneToOneField(
@@ -373,6 +651,9 @@ class UserEmbedding(Embedding):
         related_name="embedding",
     )
 
+    class Meta:
+        indexes = [vector_index("mistral_user_hnsw_idx")]
+
     @property
     def user(self) -> "ProjectUser":
         return self.item
@@ -394,26 +675,91 @@ class UserEmbedding(Embedding):
             item=self.user
         )
         embeddings = [
-            profile_embedding.vectorize(),
-            projects_embedding.vectorize(),
+            embedding
+            for embedding in (
+                profile_embedding.vectorize(),
+                projects_embedding.vectorize(),
+            )
+            if embedding.embedding is not None
         ]
-
-        total_score = 0
-        results = []
-        for embedding in embeddings:
-            if embedding.embedding is not None:
-                score = embedding.get_weight()
-                results.append([e * score for e in embedding.embedding])
-                total_score += score
-        try:
-            self.embedding = [sum(row) / total_score for row in zip(*results)] or None
-        except ZeroDivisionError:
-            self.embedding = None
+        self.embedding = weighted_average(
+            [embedding.embedding for embedding in embeddings],
+            [embedding.get_weight() for embedding in embeddings],
+        )
         self.save()
         return self
 
+    @classmethod
+    def vectorize_users(cls, user_ids: list[int]):
+        """
+        Compute and save the embeddings of the given users with a constant number
+        of queries.
+
+        The profile embeddings are not vectorized again, they must be up to date,
+        e.g. by calling `UserProfileEmbedding.vectorize_batch` first.
+
+        Args:
+            - user_ids (list[int]): The ids of the users.
+        """
+        projects = UserProjectsEmbedding.vectorize_users(user_ids)
+        profiles = {
+            user_id: [vector, score]
+            for user_id, vector, score in UserProfileEmbedding.objects.filter(
+                item_id__in=user_ids, is_visible=True
+            ).values_list("item_id", "embedding", "item__score__score")
+        }
+        missing_scores = [pk for pk, (_, score) in profiles.items() if score is None]
+        if missing_scores:
+            user_model = cls.item.field.related_model
+            score_model = user_model._meta.get_field("score").related_model
+            score_model.calculate_scores(
+                user_model.objects.filter(pk__in=missing_scores)
+            )
+            for user_id, score in score_model.objects.filter(
+                user_id__in=missing_scores
+            ).values_list("user_id", "score"):
+                profiles[user_id][1] = score
+        embeddings = {
+            embedding.item_id: embedding
+            for embedding in cls.objects.filter(item_id__in=user_ids).defer("embedding")
+        }
+        for user_id in user_ids:
+            vectors, weights = [], []
+            profile_vector, profile_score = profiles.get(user_id, (None, 0))
+            if profile_vector is not None:
+                vectors.append(profile_vector)
+                weights.append(2 * profile_score)
+            projects_vector, projects_weight = projects[user_id]
+            if projects_vector is not None:
+                vectors.append(projects_vector)
+                weights.append(projects_weight)
+            is_visible = user_id in profiles or projects_vector is not None
+            if is_visible or user_id in embeddings:
+                embedding = embeddings.get(user_id, cls(item_id=user_id))
+                embedding.embedding = weighted_average(vectors, weights)
+                embedding.is_visible = is_visible
+                embeddings[user_id] = embedding
+        cls.bulk_save(embeddings.values(), ["embedding", "is_visible"])
+
+    @classmethod
+    def vectorize_bulk(cls, queryset: QuerySet | None = None) -> int:
+        """
+        Recompute the embeddings of the given users, or of all the users, from the
+        current profile and project embeddings.
+
+        Returns:
+            - The number of processed users.
+        """
+        count = 0
+        for user_ids in get_user_ids_chunks(queryset):
+            cls.vectorize_users(user_ids)
+            count += len(user_ids)
+        return count
+
 
 class TagEmbedding(MistralEmbedding):
+    summarize_prompt = False
+
     item = models.OneToOneField(
         "skills.Tag", on_delete=models.CASCADE, related_name="embedding"
     )
@@ -425,47 +771,43 @@ class TagEmbedding(MistralEmbedding):
     def get_is_visible(self) -> bool:
         return bool(self.tag.description) or bool(self.tag.title)
 
-    def set_embedding(self, *args, **kwargs) -> "TagEmbedding":
-        prompt = [self.tag.title, self.tag.description]
-        prompt_hashcode = self.hash_prompt(prompt)
-        if self.prompt_hashcode != prompt_hashcode:
-            prompt = "\n\n".join(prompt)
-            self.embedding = MistralService.get_embedding(prompt)
-            self.prompt_hashcode = prompt_hashcode
-            self.save()
-        return self
+    def get_prompt(self) -> list[str]:
+        return [self.tag.title, self.tag.description]
 
 
 class DocumentEmbedding(MistralEmbedding):
+    summarize_prompt = False
+
     item = models.OneToOneField(
         "crisalid.Document", on_delete=models.CASCADE, related_name="embedding"
     )
 
+    class Meta:
+        indexes = [vector_index("mistral_document_hnsw_idx")]
+
     def get_is_visible(self) -> bool:
         return any((self.item.title, self.item.description, self.item.document_type))
 
-    def set_embedding(self, *args, **kwargs) -> "DocumentEmbedding":
-        prompt = [
+    def get_prompt(self) -> list[str]:
+        return [
             self.item.title,
             self.item.description,
             self.item.document_type,
         ]
-        prompt_hashcode = self.hash_prompt(prompt)
-        if self.prompt_hashcode != prompt_hashcode:
-            prompt = "\n\n".join(prompt)
-            self.embedding = MistralService.get_embedding(prompt)
-            self.prompt_hashcode = prompt_hashcode
-            self.save()
-        return self
 
 
 class GroupEmbedding(MistralEmbedding):
+    summarize_prompt = False
+
     item = models.OneToOneField(
         "accounts.PeopleGroup",
         on_delete=models.CASCADE,
         related_name="embedding",
     )
 
+    class Meta:
+        indexes = [vector_index("mistral_group_hnsw_idx")]
+
     def get_fields(self) -> list[str]:
         # TODO(remi): add more fields
         return (self.item.name, self.item.description)
@@ -473,12 +815,121 @@ class GroupEmbedding(MistralEmbedding):
     def get_is_visible(self) -> bool:
         return any(self.get_fields())
 
-    def set_embedding(self, *args, **kwargs) -> "DocumentEmbedding":
-        prompt = self.get_fields()
-        prompt_hashcode = self.hash_prompt(prompt)
-        if self.prompt_hashcode != prompt_hashcode:
-            prompt = "\n\n".join(prompt)
-            self.embedding = MistralService.get_embedding(prompt)
-            self.prompt_hashcode = prompt_hashcode
-            self.save()
-        return self
+    def get_prompt(self) -> list[str]:
+        return list(self.get_fields())
+
+
+class Similarity(models.Model):
+    """
+    Abstract class for models that store the nearest neighbours of the items of an
+    embedding model, so that the similar items are read with an indexed lookup
+    instead of a vector search.
+
+    To set it up, you need to define the following attributes:
+        - embedding_model: the embedding model of the items
+        - item: a ForeignKey to the embedded model
+        - similar: a ForeignKey to the embedded model, it is advised to set an
+            explicit related_name
+    """
+
+    embedding_model: type[Embedding]
+    item: models.ForeignKey
+    similar: models.ForeignKey
+
+    distance = models.FloatField()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def refresh(cls, count: int | None = None) -> int:
+        """
+        Recompute the `count` nearest neighbours of every visible item.
+
+        Returns:
+            - The number of stored neighbours.
+        """
+        count = count or settings.SIMILAR_ITEMS_COUNT
+        embeddings = cls.embedding_model.objects.filter(
+            is_visible=True, embedding__isnull=False
+        )
+        chunk_size = settings.MISTRAL_VECTORIZATION_CHUNK_SIZE
+        vectors = embeddings.values_list("item_id", "embedding").iterator(
+            chunk_size=chunk_size
+        )
+        stored = 0
+        for chunk in itertools.batched(vectors, chunk_size):
+            similarities = [
+                cls(item_id=item_id, similar_id=similar_id, distance=distance)
+                for item_id, vector in chunk
+                for similar_id, distance in embeddings.exclude(item_id=item_id)
+                .annotate(distance=CosineDistance("embedding", vector))
+                .order_by("distance")
+                .values_list("item_id", "distance")[:count]
+            ]
+            with transaction.atomic():
+                cls.objects.filter(
+                    item_id__in=[item_id for item_id, _ in chunk]
+                ).delete()
+                cls.objects.bulk_create(similarities)
+            stored += len(similarities)
+        related_name = cls.embedding_model.item.field.related_query_name()
+        cls.objects.exclude(**{f"item__{related_name}__is_visible": True}).delete()
+        return stored
+
+    @classmethod
+    def get_similars(
+        cls, item: models.Model, queryset: QuerySet, threshold: float = 0.15
+    ) -> QuerySet:
+        """
+        Return the items of the queryset that are among the stored neighbours of
+        `item`, from the nearest to the farthest.
+        """
+        related_name = cls.similar.field.related_query_name()
+        return queryset.filter(
+            **{
+                f"{related_name}__item": item,
+                f"{related_name}__distance__lte": threshold,
+            }
+        ).order_by(f"{related_name}__distance")
+
+
+class ProjectSimilarity(Similarity):
+    embedding_model = ProjectEmbedding
+
+    # Covered by the index on the item and the distance
+    item = models.ForeignKey(
+        "projects.Project", on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    similar = models.ForeignKey(
+        "projects.Project", on_delete=models.CASCADE, related_name="similar_to"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["item", "distance"], name="mistral_project_similarity_idx"
+            )
+        ]
+
+
+class GroupSimilarity(Similarity):
+    embedding_model = GroupEmbedding
+
+    # Covered by the index on the item and the distance
+    item = models.ForeignKey(
+        "accounts.PeopleGroup",
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,
+    )
+    similar = models.ForeignKey(
+        "accounts.PeopleGroup", on_delete=models.CASCADE, related_name="similar_to"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["item", "distance"], name="mistral_group_similarity_idx"
+            )
+        ]
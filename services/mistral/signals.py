@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .utils import set_vector_search_options
+
+
+@receiver(connection_created)
+def on_connection_created(sender, connection: BaseDatabaseWrapper, **kwargs):
+    # The HNSW indexes return at most `ef_search` rows, so the candidates of the
+    # vector searches would be truncated if it were lower.
+    if connection.vendor == "postgresql":
+        set_vector_search_options(
+            connection,
+            ef_search=max(
+                settings.VECTOR_SEARCH_EF_SEARCH, settings.VECTOR_SEARCH_CANDIDATES
+            ),
+            probes=settings.VECTOR_SEARCH_PROBES,
+            iterative_scan=settings.VECTOR_SEARCH_ITERATIVE_SCAN,
+        )
@@ -1,14 +1,18 @@
 import logging
 
 from apps.commons.utils import clear_memory
+from apps.modules.base import invalidate_modules_count
 from projects.celery import app
 
 from .models import (
     DocumentEmbedding,
     GroupEmbedding,
+    GroupSimilarity,
     MistralEmbedding,
     ProjectEmbedding,
+    ProjectSimilarity,
     UserEmbedding,
+    UserProfileEmbedding,
 )
 
 logger = logging.getLogger(__name__)
@@ -17,25 +21,40 @@ logger = logging.getLogger(__name__)
 @app.task(name="services.mistral.tasks.vectorize_updated_objects")
 def vectorize_updated_objects():
     _vectorize_updated_objects()
+    # The similar items are computed from the updated embeddings
+    _refresh_similar_items()
+
+
+@app.task(name="services.mistral.tasks.refresh_similar_items")
+def refresh_similar_items():
+    _refresh_similar_items()
 
 
 @clear_memory
-def _vectorize_objects(model_embedding: MistralEmbedding):
-    related_model = model_embedding.item.field.related_model
-    related_query_name = model_embedding.item.field.related_query_name()
+def _vectorize_batch(model_embedding: type[MistralEmbedding]):
+    updated = model_embedding.vectorize_batch()
+    logger.info("%s: %s embeddings updated", model_embedding.__name__, updated)
 
-    for obj in (
-        related_model.objects.select_related(related_query_name).all().iterator()
-    ):
-        embedding = getattr(obj, related_query_name, None)
-        # embedding not exists
-        if embedding is None:
-            embedding = model_embedding(item=obj)
-        embedding.vectorize()
+
+@clear_memory
+def _vectorize_users():
+    count = UserEmbedding.vectorize_bulk()
+    logger.info("UserEmbedding: %s users processed", count)
 
 
 def _vectorize_updated_objects():
-    _vectorize_objects(ProjectEmbedding)
-    _vectorize_objects(UserEmbedding)
-    _vectorize_objects(DocumentEmbedding)
-    _vectorize_objects(GroupEmbedding)
+    _vectorize_batch(ProjectEmbedding)
+    # The user embeddings aggregate the profile embeddings and the embeddings of
+    # the projects, so they are computed once both are up to date.
+    _vectorize_batch(UserProfileEmbedding)
+    _vectorize_users()
+    _vectorize_batch(DocumentEmbedding)
+    _vectorize_batch(GroupEmbedding)
+
+
+@clear_memory
+def _refresh_similar_items():
+    for model in (ProjectSimilarity, GroupSimilarity):
+        stored = model.refresh()
+        invalidate_modules_count(model.item.field.related_model)
+        logger.info("%s: %s similar items stored", model.__name__, stored)
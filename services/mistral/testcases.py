@@ -1,4 +1,8 @@
+import hashlib
+import random
+import threading
 from datetime import datetime
+from types import SimpleNamespace
 
 from faker import Faker
 from mistralai.client.models import (
@@ -49,3 +53,84 @@ class MistralTestCaseMixin:
                 completion_tokens=faker.pyint(min_value=100, max_value=200),
             ),
         )
+
+
+class MistralRateLimitError(Exception):
+    status_code = 429
+
+
+class MistralClientStub(MistralTestCaseMixin):
+    """
+    Local stand-in for the Mistral client, to be patched on `MistralService.service`.
+
+    The summaries and vectors are derived from the inputs so that the results are
+    deterministic, and the calls are recorded to check how the API is used.
+
+    Attributes:
+    ----------
+        rate_limited_calls: int
+            Number of calls rejected with a rate limit error before succeeding.
+        failing_inputs: set[str]
+            Inputs for which the API returns an error.
+        chat_calls: list[list[dict]]
+            Messages of each chat completion call.
+        embedding_calls: list[list[str]]
+            Inputs of each embeddings call.
+    """
+
+    def __init__(
+        self, rate_limited_calls: int = 0, failing_inputs: frozenset[str] = frozenset()
+    ):
+        self.rate_limited_calls = rate_limited_calls
+        self.failing_inputs = set(failing_inputs)
+        self.chat_calls = []
+        self.embedding_calls = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(complete=self.complete)
+        self.embeddings = SimpleNamespace(create=self.create)
+
+    def _check_call(self, inputs: list[str]):
+        with self.lock:
+            if self.rate_limited_calls > 0:
+                self.rate_limited_calls -= 1
+                raise MistralRateLimitError()
+        if self.failing_inputs.intersection(inputs):
+            raise ValueError("Invalid input")
+
+    @staticmethod
+    def get_summary(messages: list[dict]) -> str:
+        prompt = "\n".join(m["content"] for m in messages if m["role"] == "user")
+        return f"Summary of {hashlib.sha256(prompt.encode()).hexdigest()}"
+
+    @staticmethod
+    def get_vector(text: str) -> list[float]:
+        generator = random.Random(text)  # nosec B311
+        return [generator.random() for _ in range(1024)]
+
+    def complete(self, model: str, messages: list[dict], **kwargs):
+        self._check_call([m["content"] for m in messages])
+        with self.lock:
+            self.chat_calls.append(messages)
+        return self.chat_response_mocked_return([self.get_summary(messages)])
+
+    def create(self, model: str, inputs: list[str]):
+        self._check_call(inputs)
+        with self.lock:
+            self.embedding_calls.append(inputs)
+        return EmbeddingResponse(
+            id=faker.pystr(min_chars=32, max_chars=32),
+            object="list",
+            model="mistral-embed",
+            # The order of the data is not guaranteed by the API
+            data=[
+                EmbeddingResponseData(
+                    object="embedding", embedding=self.get_vector(text), index=index
+                )
+                for index, text in reversed(list(enumerate(inputs)))
+            ],
+            usage=UsageInfo(
+                prompt_tokens=faker.pyint(min_value=1000, max_value=2000),
+                total_tokens=faker.pyint(min_value=1000, max_value=2000),
+                completion_tokens=faker.pyint(min_value=100, max_value=200),
+            ),
+        )
@@ -5,8 +5,10 @@ from faker import Faker
 from apps.commons.test import JwtAPITestCase
 from apps.organizations.factories import OrganizationFactory
 from apps.projects.factories import BlogEntryFactory, ProjectFactory
+from apps.projects.models import Project
 from apps.skills.factories import TagFactory
 from services.mistral.factories import ProjectEmbeddingFactory
+from services.mistral.models import ProjectEmbedding
 from services.mistral.testcases import MistralTestCaseMixin
 
 faker = Faker()
@@ -128,3 +130,31 @@ class ProjectEmbeddingMiscTestCase(JwtAPITestCase, MistralTestCaseMixin):
         prompt_hashcode = embedding.hash_prompt()
         for _ in range(10):
             self.assertEqual(embedding.hash_prompt(), prompt_hashcode)
+
+
+class ProjectEmbeddingVectorSearchTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.projects = ProjectFactory.create_batch(4, organizations=[cls.organization])
+        for i, project in enumerate(cls.projects):
+            ProjectEmbeddingFactory(
+                item=project, is_visible=True, embedding=[1, i] + 1022 * [0]
+            )
+
+    def test_vector_search(self):
+        queryset = Project.objects.filter(id__in=[p.id for p in self.projects])
+        results = ProjectEmbedding.vector_search([1] + 1023 * [0], queryset)
+        self.assertEqual(list(results), self.projects)
+
+    def test_vector_search_with_limit(self):
+        queryset = Project.objects.filter(id__in=[p.id for p in self.projects[1:]])
+        results = ProjectEmbedding.vector_search([1] + 1023 * [0], queryset, limit=2)
+        self.assertEqual(list(results), self.projects[1:3])
+
+    def test_vector_search_with_limit_filtered_candidates(self):
+        # The nearest items are not part of the queryset
+        queryset = Project.objects.filter(id__in=[p.id for p in self.projects[2:]])
+        results = ProjectEmbedding.vector_search([1] + 1023 * [0], queryset, limit=2)
+        self.assertEqual(list(results), self.projects[2:])
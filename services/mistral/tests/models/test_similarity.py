@@ -0,0 +1,59 @@
+from django.test import override_settings
+
+from apps.accounts.factories import UserFactory
+from apps.commons.test import JwtAPITestCase
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+from services.mistral.factories import ProjectEmbeddingFactory
+from services.mistral.models import ProjectSimilarity
+
+
+class ProjectSimilarityTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.project = ProjectFactory(organizations=[cls.organization])
+        cls.near_project = ProjectFactory(organizations=[cls.organization])
+        cls.far_project = ProjectFactory(organizations=[cls.organization])
+        cls.private_project = ProjectFactory(
+            organizations=[cls.organization],
+            publication_status=Project.PublicationStatus.PRIVATE,
+        )
+        cls.hidden_project = ProjectFactory(organizations=[cls.organization])
+        for project, vector in [
+            (cls.project, [1, 0]),
+            (cls.near_project, [1, 0.1]),
+            (cls.far_project, [1, 0.4]),
+            (cls.private_project, [1, 0.05]),
+        ]:
+            ProjectEmbeddingFactory(
+                item=project, is_visible=True, embedding=vector + 1022 * [0]
+            )
+        ProjectEmbeddingFactory(
+            item=cls.hidden_project, is_visible=False, embedding=[1] + 1023 * [0]
+        )
+
+    @override_settings(SIMILAR_ITEMS_COUNT=2)
+    def test_refresh(self):
+        ProjectSimilarity.objects.create(
+            item=self.hidden_project, similar=self.project, distance=0
+        )
+        ProjectSimilarity.refresh()
+        similars = ProjectSimilarity.objects.filter(item=self.project).order_by(
+            "distance"
+        )
+        self.assertEqual(
+            [similarity.similar for similarity in similars],
+            [self.private_project, self.near_project],
+        )
+        self.assertFalse(
+            ProjectSimilarity.objects.filter(item=self.hidden_project).exists()
+        )
+
+    def test_similars_module(self):
+        ProjectSimilarity.refresh()
+        user = UserFactory()
+        similars = self.project.modules_by_user(user).similars()
+        self.assertEqual(list(similars), [self.near_project])
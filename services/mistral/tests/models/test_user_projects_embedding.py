@@ -1,6 +1,7 @@
 from faker import Faker
 
 from apps.accounts.factories import UserFactory
+from apps.accounts.models import ProjectUser
 from apps.commons.test import JwtAPITestCase
 from apps.organizations.factories import OrganizationFactory
 from apps.projects.factories import ProjectFactory
@@ -8,6 +9,7 @@ from services.mistral.factories import (
     ProjectEmbeddingFactory,
     UserProjectsEmbeddingFactory,
 )
+from services.mistral.models import UserProjectsEmbedding
 from services.mistral.testcases import MistralTestCaseMixin
 
 faker = Faker()
@@ -96,3 +98,33 @@ class VectorizeUserProjectsTestCase(JwtAPITestCase, MistralTestCaseMixin):
             [round(e, 2) for e in embedding.embedding],
             [round(e, 2) for e in average_vector],
         )
+
+    def test_vectorize_bulk(self):
+        user = UserFactory(
+            groups=[self.project_1.get_members(), self.project_3.get_owners()]
+        )
+        user_without_projects = UserFactory()
+        UserProjectsEmbeddingFactory(
+            item=user_without_projects, is_visible=True, embedding=self.vector_1
+        )
+        users = ProjectUser.objects.filter(id__in=[user.id, user_without_projects.id])
+        self.assertEqual(UserProjectsEmbedding.vectorize_bulk(users), 2)
+
+        embedding = UserProjectsEmbedding.objects.get(item=user)
+        score_1 = self.project_1.get_or_create_score().score
+        score_3 = self.project_3.get_or_create_score().score
+        average_vector = [
+            (score_1 * self.vector_1[i] + 2 * score_3 * self.vector_3[i])
+            / (score_1 + 2 * score_3)
+            for i in range(1024)
+        ]
+        self.assertTrue(embedding.is_visible)
+        self.assertEqual(
+            [round(e, 2) for e in embedding.embedding],
+            [round(e, 2) for e in average_vector],
+        )
+        self.assertAlmostEqual(embedding.get_weight(), score_1 + score_3)
+
+        embedding = UserProjectsEmbedding.objects.get(item=user_without_projects)
+        self.assertFalse(embedding.is_visible)
+        self.assertIsNone(embedding.embedding)
@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from faker import Faker
+
+from apps.commons.test import JwtAPITestCase
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+from services.mistral.factories import ProjectEmbeddingFactory
+from services.mistral.interface import MistralService
+from services.mistral.models import EmbeddingError, ProjectEmbedding
+from services.mistral.testcases import MistralClientStub
+
+faker = Faker()
+
+
+@override_settings(MISTRAL_EMBEDDING_BATCH_SIZE=2)
+class VectorizeBatchTestCase(JwtAPITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+
+    def vectorize_batch(self, client: MistralClientStub, projects: list[Project]):
+        queryset = Project.objects.filter(id__in=[p.id for p in projects])
+        with patch.object(MistralService, "service", client):
+            return ProjectEmbedding.vectorize_batch(queryset)
+
+    def test_vectorize_batch(self):
+        projects = ProjectFactory.create_batch(3, organizations=[self.organization])
+        hidden_project = ProjectFactory(
+            description="", organizations=[self.organization]
+        )
+        client = MistralClientStub()
+        updated = self.vectorize_batch(client, [*projects, hidden_project])
+        self.assertEqual(updated, 3)
+        self.assertEqual(len(client.chat_calls), 3)
+        self.assertEqual([len(c) for c in client.embedding_calls], [2, 1])
+        self.assertFalse(ProjectEmbedding.objects.filter(item=hidden_project).exists())
+        for project in projects:
+            embedding = ProjectEmbedding.objects.get(item=project)
+            self.assertTrue(embedding.is_visible)
+            self.assertEqual(embedding.prompt_hashcode, embedding.hash_prompt())
+            self.assertIn(embedding.summary, sum(client.embedding_calls, []))
+            self.assertEqual(len(embedding.embedding), 1024)
+            self.assertAlmostEqual(
+                float(embedding.embedding[0]),
+                MistralClientStub.get_vector(embedding.summary)[0],
+                places=5,
+            )
+
+    def test_only_changed_prompts_are_vectorized(self):
+        projects = ProjectFactory.create_batch(2, organizations=[self.organization])
+        self.vectorize_batch(MistralClientStub(), projects)
+
+        client = MistralClientStub()
+        self.assertEqual(self.vectorize_batch(client, projects), 0)
+        self.assertEqual(client.chat_calls, [])
+        self.assertEqual(client.embedding_calls, [])
+
+        projects[0].title = faker.sentence()
+        projects[0].save()
+        client = MistralClientStub()
+        self.assertEqual(self.vectorize_batch(client, projects), 1)
+        self.assertEqual(len(client.chat_calls), 1)
+        self.assertEqual(len(client.embedding_calls), 1)
+
+    def test_hidden_item_embedding_is_removed(self):
+        project = ProjectFactory(organizations=[self.organization])
+        embedding = ProjectEmbeddingFactory(
+            item=project, is_visible=True, embedding=1024 * [1]
+        )
+        project.description = ""
+        project.save()
+        client = MistralClientStub()
+        self.assertEqual(self.vectorize_batch(client, [project]), 1)
+        self.assertEqual(client.chat_calls, [])
+        embedding.refresh_from_db()
+        self.assertFalse(embedding.is_visible)
+        self.assertIsNone(embedding.embedding)
+
+    @patch("services.mistral.interface.time.sleep")
+    def test_rate_limited_calls_are_retried(self, mocked_sleep):
+        project = ProjectFactory(organizations=[self.organization])
+        client = MistralClientStub(rate_limited_calls=2)
+        self.assertEqual(self.vectorize_batch(client, [project]), 1)
+        self.assertEqual(mocked_sleep.call_count, 2)
+        embedding = ProjectEmbedding.objects.get(item=project)
+        self.assertIsNotNone(embedding.embedding)
+
+    def test_failed_item_saves_error(self):
+        project = ProjectFactory(organizations=[self.organization])
+        failing_project = ProjectFactory(organizations=[self.organization])
+        client = MistralClientStub(failing_inputs={f"Title : {failing_project.title}"})
+        self.assertEqual(self.vectorize_batch(client, [project, failing_project]), 1)
+        self.assertTrue(ProjectEmbedding.objects.filter(item=project).exists())
+        self.assertFalse(ProjectEmbedding.objects.filter(item=failing_project).exists())
+        error = EmbeddingError.objects.get(
+            item_type="Project", item_id=failing_project.id
+        )
+        self.assertEqual(error.error, "ValueError")
+        self.assertIn("ValueError: Invalid input", error.traceback)
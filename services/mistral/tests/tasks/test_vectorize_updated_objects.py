@@ -1,54 +1,73 @@
-from unittest.mock import call, patch
+from unittest.mock import patch
 
+from faker import Faker
+
+from apps.accounts.factories import UserFactory
 from apps.commons.test import JwtAPITestCase
 from services.mistral.factories import (
     ProjectEmbeddingFactory,
     UserEmbeddingFactory,
 )
+from services.mistral.interface import MistralService
 from services.mistral.models import EmbeddingError
 from services.mistral.tasks import _vectorize_updated_objects
+from services.mistral.testcases import MistralClientStub
+
+faker = Faker()
 
 
 class VectorizeUpdatedObjectsTest(JwtAPITestCase):
-    @patch("services.mistral.models.UserEmbedding.vectorize")
-    @patch("services.mistral.models.ProjectEmbedding.vectorize")
-    def test_vectorize_updated_objects(
-        self, mocked_project_vectorize, mocked_user_vectorize
-    ):
-        mocked_user_vectorize.return_value = None
-        mocked_project_vectorize.return_value = None
-
-        ProjectEmbeddingFactory()
+    @patch("services.mistral.models.UserEmbedding.vectorize_bulk")
+    def test_vectorize_updated_objects(self, mocked_user_vectorize):
+        mocked_user_vectorize.return_value = 0
+
+        embedding = ProjectEmbeddingFactory()
         UserEmbeddingFactory()
 
         project_embdedding = ProjectEmbeddingFactory()
         project_embdedding.prompt_hashcode = project_embdedding.hash_prompt()
         project_embdedding.save()
 
-        _vectorize_updated_objects()
-        mocked_user_vectorize.assert_has_calls([call()])
-        mocked_project_vectorize.assert_has_calls([call()])
+        client = MistralClientStub()
+        with patch.object(MistralService, "service", client):
+            _vectorize_updated_objects()
+        mocked_user_vectorize.assert_called_once_with()
+        self.assertEqual(len(client.chat_calls), 1)
+        embedding.refresh_from_db()
+        self.assertEqual(embedding.prompt_hashcode, embedding.hash_prompt())
 
-    @patch("services.mistral.models.UserEmbedding.set_embedding")
-    def test_user_embedding_error(self, mocked_user_vectorize):
-        mocked_user_vectorize.side_effect = ValueError("Test error")
-        embedding = UserEmbeddingFactory()
-        _vectorize_updated_objects()
-        mocked_user_vectorize.assert_has_calls([call()])
-        error = EmbeddingError.objects.filter(
-            item_id=embedding.item.id, item_type="ProjectUser"
+    def test_user_embedding(self):
+        user = UserFactory(description=faker.text())
+        with patch.object(MistralService, "service", MistralClientStub()):
+            _vectorize_updated_objects()
+        user.refresh_from_db()
+        self.assertTrue(user.profile_embedding.is_visible)
+        self.assertTrue(user.embedding.is_visible)
+        self.assertEqual(
+            [round(float(e), 4) for e in user.embedding.embedding],
+            [round(float(e), 4) for e in user.profile_embedding.embedding],
         )
+
+    @patch("services.mistral.models.UserProfileEmbedding.get_summary")
+    def test_user_embedding_error(self, mocked_user_summary):
+        mocked_user_summary.side_effect = ValueError("Test error")
+        user = UserFactory(description=faker.text())
+        with patch.object(MistralService, "service", MistralClientStub()):
+            _vectorize_updated_objects()
+        mocked_user_summary.assert_called_once()
+        error = EmbeddingError.objects.filter(item_id=user.id, item_type="ProjectUser")
         self.assertTrue(error.exists())
         error = error.get()
         self.assertEqual(error.error, "ValueError")
         self.assertIn("ValueError: Test error", error.traceback)
 
-    @patch("services.mistral.models.ProjectEmbedding.set_embedding")
-    def test_project_embedding_error(self, mocked_project_vectorize):
-        mocked_project_vectorize.side_effect = ValueError("Test error")
+    @patch("services.mistral.models.ProjectEmbedding.get_summary")
+    def test_project_embedding_error(self, mocked_project_summary):
+        mocked_project_summary.side_effect = ValueError("Test error")
         embedding = ProjectEmbeddingFactory()
-        _vectorize_updated_objects()
-        mocked_project_vectorize.assert_has_calls([call()])
+        with patch.object(MistralService, "service", MistralClientStub()):
+            _vectorize_updated_objects()
+        mocked_project_summary.assert_called_once()
         error = EmbeddingError.objects.filter(
             item_id=embedding.item.id, item_type="Project"
         )
@@ -1,3 +1,5 @@
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from faker import Faker
 from parameterized import parameterized
@@ -15,6 +17,10 @@ from services.mistral.testcases import MistralTestCaseMixin
 
 faker = Faker()
 
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
 
 class RecommendedProjectsTestCase(JwtAPITestCase, MistralTestCaseMixin):
     @classmethod
@@ -267,3 +273,31 @@ class RecommendedProjectsTestCase(JwtAPITestCase, MistralTestCaseMixin):
             content[0]["id"],
             [self.projects[project].id for project in retrieved_projects[:2]],
         )
+
+    @override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES)
+    def test_random_recommendations_pool_cache(self):
+        cache.clear()
+        user = self.get_parameterized_test_user(
+            TestRoles.SUPERADMIN, instances=[self.member_project]
+        )
+        embedding = UserEmbeddingFactory(
+            item=user, embedding=[*1024 * [1.0]], is_visible=True
+        )
+        self.client.force_authenticate(user)
+        url = reverse(
+            "RecommendedProjects-random-for-user", args=(self.organization.code,)
+        )
+        response = self.client.get(url + "?count=1&pool=1")
+        self.assertEqual(response.json()[0]["id"], self.project.id)
+
+        # The pool is cached independently of the number of sampled results
+        response = self.client.get(url + "?count=2&pool=1")
+        self.assertEqual(
+            [project["id"] for project in response.json()], [self.project.id]
+        )
+
+        # The pool is computed again when the embedding changes
+        embedding.embedding = [*768 * [0.0], *256 * [1.0]]
+        embedding.save()
+        response = self.client.get(url + "?count=1&pool=1")
+        self.assertEqual(response.json()[0]["id"], self.public_project.id)
@@ -0,0 +1,34 @@
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+def set_vector_search_options(
+    connection: BaseDatabaseWrapper,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    iterative_scan: str | None = None,
+    is_local: bool = False,
+):
+    """
+    Set the search-time parameters of the approximate vector indexes.
+
+    Args:
+        - connection (BaseDatabaseWrapper): The database connection.
+        - ef_search (int | None): The size of the candidate lists explored by the
+            HNSW indexes, which is also the maximum number of returned rows.
+        - probes (int | None): The number of lists probed by the IVFFlat indexes.
+        - iterative_scan (str | None): The iterative scan mode of the indexes,
+            scanning them further when the filtered rows are not enough.
+        - is_local (bool): Only set the parameters for the current transaction.
+    """
+    options = {
+        "hnsw.ef_search": ef_search,
+        "ivfflat.probes": probes,
+        "hnsw.iterative_scan": iterative_scan,
+        "ivfflat.iterative_scan": iterative_scan,
+    }
+    with connection.cursor() as cursor:
+        for name, value in options.items():
+            if value is not None:
+                cursor.execute(
+                    "SELECT set_config(%s, %s, %s)", [name, str(value), is_local]
+                )
@@ -1,3 +1,6 @@
+import random
+from functools import cached_property
+
 from django.conf import settings
 from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
@@ -9,7 +12,7 @@ from rest_framework.viewsets import GenericViewSet
 
 from apps.accounts.models import ProjectUser
 from apps.accounts.serializers import UserLightSerializer
-from apps.commons.cache import redis_cache_viewset_method
+from apps.commons.cache import get_cache_versions, get_or_set_cache
 from apps.commons.permissions import ReadOnly
 from apps.commons.views import MultipleIDViewsetMixin
 from apps.organizations.utils import get_below_hierarchy_codes
@@ -42,28 +45,42 @@ class RecommendationsViewset(MultipleIDViewsetMixin, GenericViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    def get_embedding_instance(
+        self, item: Project | ProjectUser
+    ) -> ProjectEmbedding | UserEmbedding | None:
+        """
+        Return the embedding of a project or of an authenticated user, creating it
+        if needed. The embeddings are fetched once per request.
+        """
+        if isinstance(item, Project):
+            model = ProjectEmbedding
+        elif item.is_authenticated:
+            model = UserEmbedding
+        else:
+            return None
+        embeddings = self.__dict__.setdefault("_embeddings", {})
+        if (model, item.pk) not in embeddings:
+            embedding, _ = model.objects.get_or_create(item=item)
+            if embedding.embedding is None:
+                embedding = embedding.vectorize()
+            embeddings[model, item.pk] = embedding
+        return embeddings[model, item.pk]
+
     def get_user_embedding(self, user: ProjectUser) -> list[float] | None:
         """
         Return the user's embedding.
         If the user is not authenticated, return None.
         If the embedding is None, create it and return it.
         """
-        if user.is_authenticated:
-            embedding, _ = UserEmbedding.objects.get_or_create(item=user)
-            if embedding.embedding is None:
-                embedding = embedding.vectorize()
-            return embedding.embedding
-        return None
+        embedding = self.get_embedding_instance(user)
+        return embedding.embedding if embedding is not None else None
 
     def get_project_embedding(self, project: Project) -> list[float] | None:
         """
         Return the project's embedding.
         If the embedding is None, create it and return it.
         """
-        embedding, _ = ProjectEmbedding.objects.get_or_create(item=project)
-        if embedding.embedding is None:
-            embedding = embedding.vectorize()
-        return embedding.embedding
+        return self.get_embedding_instance(project).embedding
 
     def get_queryset_for_project(
         self, project: Project
@@ -81,24 +98,78 @@ class RecommendationsViewset(MultipleIDViewsetMixin, GenericViewSet):
         """
         raise NotImplementedError
 
-    def get_queryset(self) -> QuerySet[Project | ProjectUser]:
+    @cached_property
+    def recommendation_target(self) -> Project | ProjectUser:
+        """Return the project or the user for which the recommendations are made."""
         if "project_id" in self.kwargs:
-            project = get_object_or_404(
+            return get_object_or_404(
                 self.request.user.get_project_queryset(),
                 id=self.kwargs["project_id"],
                 organizations__code__in=get_below_hierarchy_codes(
                     [self.kwargs["organization_code"]]
                 ),
             )
-            return self.get_queryset_for_project(project)
-        return self.get_queryset_for_user(self.request.user)
+        return self.request.user
+
+    def get_queryset(self) -> QuerySet[Project | ProjectUser]:
+        target = self.recommendation_target
+        if isinstance(target, Project):
+            return self.get_queryset_for_project(target)
+        return self.get_queryset_for_user(target)
+
+    def get_pool_cache_key(self, pool: int) -> str:
+        """
+        Return the cache key of a recommendation pool. It depends on the target of
+        the recommendations, the organization, the requesting user for the
+        permissions, and the version of the target's embedding: the pool is
+        computed again when the embedding changes.
+        """
+        target = self.recommendation_target
+        embedding = self.get_embedding_instance(target)
+        version = (
+            int(embedding.last_update.timestamp() * 1e6)
+            if embedding is not None and embedding.embedding is not None
+            else "none"
+        )
+        target_type = "project" if isinstance(target, Project) else "user"
+        return (
+            f"{self.queryset.model._meta.model_name}.{target_type}.{target.pk}."
+            f"{self.kwargs['organization_code']}.{self.request.user.pk}."
+            f"{version}.{pool}"
+        )
 
-    @redis_cache_viewset_method(
-        "recommendations", settings.CACHE_RECOMMENDATION_POOL_TTL
-    )
     def get_queryset_pool_ids(self, pool: int) -> list[str | int]:
-        queryset = self.get_queryset()[:pool]
-        return list(queryset.values_list("id", flat=True))
+        """Return the ids of the `pool` best recommendations, cached by
+        `get_pool_cache_key`."""
+
+        def get_pool_ids():
+            queryset = self.get_queryset()[:pool]
+            return list(queryset.values_list("id", flat=True))
+
+        if settings.ENABLE_CACHE:
+            (version,) = get_cache_versions("recommendations")
+            return get_or_set_cache(
+                f"recommendations.{version}.{self.get_pool_cache_key(pool)}",
+                "recommendations",
+                get_pool_ids,
+                settings.CACHE_RECOMMENDATION_POOL_TTL,
+            )
+        return get_pool_ids()
+
+    def _random_list(self, request):
+        """
+        Return `count` recommendations sampled among the cached pool of the `pool`
+        best recommendations. Only the sampled objects are fetched.
+        """
+        count = int(request.query_params.get("count", 4))
+        pool = int(request.query_params.get("pool", 25))
+        pool_ids = self.get_queryset_pool_ids(pool)
+        sample = random.sample(pool_ids, min(count, len(pool_ids)))  # nosec B311
+        objects = self.queryset.in_bulk(sample)
+        serializer = self.get_serializer(
+            [objects[pk] for pk in sample if pk in objects], many=True
+        )
+        return Response(serializer.data)
 
     @action(
         detail=False,
@@ -147,12 +218,7 @@ class RecommendationsViewset(MultipleIDViewsetMixin, GenericViewSet):
         The `count` parameter specifies the number of results to return.
         The `pool` parameter specifies the number of results among which to choose the final results.
         """
-        count = int(request.query_params.get("count", 4))
-        pool = int(request.query_params.get("pool", 25))
-        pool_ids = self.get_queryset_pool_ids(pool)
-        queryset = self.queryset.filter(id__in=pool_ids).order_by("?")[:count]
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._random_list(request)
 
     @extend_schema(
         parameters=[
@@ -182,12 +248,7 @@ class RecommendationsViewset(MultipleIDViewsetMixin, GenericViewSet):
         The `count` parameter specifies the number of results to return.
         The `pool` parameter specifies the number of results among which to choose the final results.
         """
-        count = int(request.query_params.get("count", 4))
-        pool = int(request.query_params.get("pool", 25))
-        pool_ids = self.get_queryset_pool_ids(pool)
-        queryset = self.queryset.filter(id__in=pool_ids).order_by("?")[:count]
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._random_list(request)
 
 
 class ProjectRecommendationsViewset(RecommendationsViewset):
@@ -208,7 +269,9 @@ class ProjectRecommendationsViewset(RecommendationsViewset):
         )
         embedding = self.get_project_embedding(project)
         if embedding is not None and queryset.exists():
-            return ProjectEmbedding.vector_search(embedding, queryset)
+            return ProjectEmbedding.vector_search(
+                embedding, queryset, limit=settings.VECTOR_SEARCH_CANDIDATES
+            )
         return queryset.none()
 
     def get_queryset_for_user(self, user: ProjectUser) -> QuerySet[Project]:
@@ -226,7 +289,9 @@ class ProjectRecommendationsViewset(RecommendationsViewset):
         if user.is_authenticated:
             queryset = queryset.exclude(groups__users__id=user.id)
         if embedding is not None and queryset.exists():
-            return ProjectEmbedding.vector_search(embedding, queryset)
+            return ProjectEmbedding.vector_search(
+                embedding, queryset, limit=settings.VECTOR_SEARCH_CANDIDATES
+            )
         return queryset.order_by("-score__score")
 
 
@@ -249,7 +314,9 @@ class UserRecommendationsViewset(RecommendationsViewset):
         if self.request.user.is_authenticated:
             queryset = queryset.exclude(id=self.request.user.id)
         if embedding is not None and queryset.exists():
-            return UserEmbedding.vector_search(embedding, queryset)
+            return UserEmbedding.vector_search(
+                embedding, queryset, limit=settings.VECTOR_SEARCH_CANDIDATES
+            )
         return queryset.none()
 
     def get_queryset_for_user(self, user: ProjectUser) -> QuerySet[ProjectUser]:
@@ -263,5 +330,7 @@ class UserRecommendationsViewset(RecommendationsViewset):
         if user.is_authenticated:
             queryset = queryset.exclude(id=user.id)
         if embedding is not None and queryset.exists():
-            return UserEmbedding.vector_search(embedding, queryset)
+            return UserEmbedding.vector_search(
+                embedding, queryset, limit=settings.VECTOR_SEARCH_CANDIDATES
+            )
         return queryset.order_by("-score__score")
@@ -0,0 +1,69 @@
+# Generated by Django 6.0.5 on 2026-10-16 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def compute_view_counts(apps, schema_editor):
+    MixpanelEvent = apps.get_model("mixpanel", "MixpanelEvent")
+    ProjectViewCount = apps.get_model("mixpanel", "ProjectViewCount")
+    counts = (
+        MixpanelEvent.objects.order_by()
+        .values("project_id", "organization_id")
+        .annotate(views=models.Count("id"))
+    )
+    ProjectViewCount.objects.bulk_create(
+        [ProjectViewCount(**count) for count in counts.iterator()], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organizations", "0004_categoryfollow_categoryfollow_unique_category_follow"),
+        ("projects", "0004_projecttab_show_preview_alter_projecttab_description_and_more"),
+        ("mixpanel", "0003_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectViewCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("views", models.PositiveIntegerField(default=0)),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="organizations.organization",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_counts",
+                        to="projects.project",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project", "organization"],
+                        name="mixpanel_project_views_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(compute_view_counts, migrations.RunPython.noop),
+    ]
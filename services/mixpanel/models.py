@@ -1,6 +1,7 @@
 import datetime
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
 
 from apps.organizations.models import Organization
 from apps.projects.models import Project
@@ -20,3 +21,45 @@ class MixpanelEvent(models.Model):
 
     class Meta:
         ordering = ["-date"]
+
+
+class ProjectViewCount(models.Model):
+    """
+    Number of views of a project in an organization, aggregated from the mixpanel
+    events when they are fetched so that reading the views costs a single query.
+    """
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="view_counts"
+    )
+    organization = models.ForeignKey(Organization, null=True, on_delete=models.CASCADE)
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "organization"], name="mixpanel_project_views_idx"
+            )
+        ]
+
+    @classmethod
+    def refresh(cls, project_ids: list[str] | None = None):
+        """
+        Recompute the view counts of the given projects, or of all the projects,
+        with a single grouped aggregate over the mixpanel events.
+        """
+        events = MixpanelEvent.objects.all()
+        view_counts = cls.objects.all()
+        if project_ids is not None:
+            events = events.filter(project_id__in=project_ids)
+            view_counts = view_counts.filter(project_id__in=project_ids)
+        counts = (
+            events.order_by()
+            .values("project_id", "organization_id")
+            .annotate(views=Count("id"))
+        )
+        with transaction.atomic():
+            view_counts.delete()
+            cls.objects.bulk_create(
+                [cls(**count) for count in counts.iterator()], batch_size=1000
+            )
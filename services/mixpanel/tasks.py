@@ -3,7 +3,7 @@ import datetime
 from apps.commons.utils import clear_memory
 from projects.celery import app
 from services.mixpanel.interface import MixpanelService
-from services.mixpanel.models import MixpanelEvent
+from services.mixpanel.models import MixpanelEvent, ProjectViewCount
 
 
 @app.task(name="services.mixpanel.tasks.get_new_mixpanel_events")
@@ -13,6 +13,7 @@ def get_new_mixpanel_events():
         date = MixpanelService.initial_date
     else:
         date = MixpanelEvent.get_latest_date()
+    project_ids = set()
     while date <= datetime.date.today():
         events = MixpanelService.get_events(date, date)
         events = MixpanelEvent.objects.bulk_create(
@@ -20,7 +21,6 @@ def get_new_mixpanel_events():
             ignore_conflicts=True,
             batch_size=1000,
         )
+        project_ids.update(event.project_id for event in events)
         date += datetime.timedelta(days=1)
-    projects = {event.project for event in events}
-    for project in projects:
-        project.set_cached_views()
+    ProjectViewCount.refresh(list(project_ids))
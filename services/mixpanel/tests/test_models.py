@@ -0,0 +1,61 @@
+from django.test import TestCase
+
+from apps.organizations.factories import OrganizationFactory
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+from services.mixpanel.factories import MixpanelEventFactory
+from services.mixpanel.models import ProjectViewCount
+
+
+class ProjectViewCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.organization = OrganizationFactory()
+        cls.other_organization = OrganizationFactory()
+        cls.project = ProjectFactory(
+            organizations=[cls.organization, cls.other_organization]
+        )
+        cls.other_project = ProjectFactory(organizations=[cls.organization])
+        MixpanelEventFactory.create_batch(
+            3, project=cls.project, organization=cls.organization
+        )
+        MixpanelEventFactory.create_batch(
+            2, project=cls.project, organization=cls.other_organization
+        )
+        MixpanelEventFactory(project=cls.project, organization=None)
+        MixpanelEventFactory(project=cls.other_project, organization=cls.organization)
+        ProjectViewCount.refresh()
+
+    def test_project_views(self):
+        project = Project.objects.prefetch_related("view_counts").get(
+            id=self.project.id
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(project.get_views(), 6)
+        self.assertEqual(project.get_views_organizations([self.organization]), 3)
+        self.assertEqual(
+            project.get_views_organizations(
+                [self.organization, self.other_organization]
+            ),
+            5,
+        )
+
+    def test_queryset_views(self):
+        projects = Project.objects.filter(
+            id__in=[self.project.id, self.other_project.id]
+        )
+        with self.assertNumQueries(1):
+            views = Project.get_queryset_total_views(projects)
+        self.assertDictEqual(views, {self.project.id: 6, self.other_project.id: 1})
+        with self.assertNumQueries(1):
+            views = Project.get_queryset_organization_views(
+                projects, self.other_organization
+            )
+        self.assertDictEqual(views, {self.project.id: 2, self.other_project.id: 0})
+
+    def test_refresh_projects(self):
+        MixpanelEventFactory(project=self.other_project, organization=None)
+        ProjectViewCount.refresh([self.other_project.id])
+        self.assertEqual(self.other_project.get_views(), 2)
+        self.assertEqual(self.project.get_views(), 6)
@@ -0,0 +1,264 @@
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from apps.commons.mixins import OrganizationRelated
+
+from .interface import AzureTranslatorService
+from .memory import (
+    get_memory_translations,
+    set_memory_translations,
+    translated_characters,
+)
+from .models import AZURE_MAX_ELEMENTS, AZURE_MAX_LENGTH, AutoTranslatedField
+
+BASE64_IMAGE_PATTERN = re.compile(r'data:image\/[a-zA-Z]+;base64,[^"\']+')
+
+
+class TranslationEngine:
+    """
+    Translate many `AutoTranslatedField` at once.
+
+    The instances of the fields are loaded in bulk for each content type, and their
+    content is split in chunks. The chunks sharing the same target languages and
+    text type are packed in as few Azure Translator requests as the per-request
+    limits allow, and the translated columns are written back with one `bulk_update`
+    per model. Chunks already translated are read from the translation memory
+    instead of being sent again.
+
+    Errors are collected in `errors` by field id instead of being raised, the fields
+    that could not be translated are left as not up to date to be retried later.
+    """
+
+    # Safety margin on the maximum number of characters per request
+    max_length = int(AZURE_MAX_LENGTH * 0.8)
+    max_elements = AZURE_MAX_ELEMENTS
+
+    def __init__(self, fields: Iterable[AutoTranslatedField]):
+        self.fields = list(fields)
+        self.errors: dict[int, Exception] = {}
+        self._instances: dict[tuple[int, str], models.Model] = {}
+        self._languages: dict[tuple[int, str], tuple[str, ...]] = {}
+        self._translations: dict[int, dict[str, Any]] = {}
+        self._requests: dict[tuple[tuple[str, ...], str], list] = defaultdict(list)
+
+    def run(self) -> list[AutoTranslatedField]:
+        """
+        Translate the fields and return the ones that are now up to date.
+        """
+        self._load_instances()
+        for field in self.fields:
+            if field.id not in self.errors:
+                try:
+                    self._prepare(field)
+                except Exception as e:  # noqa: PIE786
+                    self.errors[field.id] = e
+        self._translate()
+        return self._save()
+
+    def _load_instances(self):
+        object_ids = defaultdict(set)
+        for field in self.fields:
+            object_ids[field.content_type_id].add(field.object_id)
+        for content_type_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            for pk, instance in model._base_manager.in_bulk(ids).items():
+                self._instances[(content_type_id, str(pk))] = instance
+        for field in self.fields:
+            if (field.content_type_id, field.object_id) not in self._instances:
+                self.errors[field.id] = ContentType.DoesNotExist(
+                    f"Object {field.object_id} of content type "
+                    f"{field.content_type_id} does not exist."
+                )
+
+    def _get_languages(self, field: AutoTranslatedField) -> tuple[str, ...]:
+        key = (field.content_type_id, field.object_id)
+        if key not in self._languages:
+            instance = self._instances[key]
+            if not isinstance(instance, OrganizationRelated):
+                raise ValueError(
+                    f"{instance._meta.model.__name__} does not support translations. "
+                    "`OrganizationRelated` mixin is required for automatic "
+                    "translations."
+                )
+            organizations = [
+                o
+                for o in instance.get_related_organizations()
+                if o.auto_translate_content
+            ]
+            if getattr(instance, "auto_translate_all_languages", False):
+                languages = settings.REQUIRED_LANGUAGES if organizations else []
+            else:
+                languages = {lang for org in organizations for lang in org.languages}
+            self._languages[key] = tuple(sorted(languages))
+        return self._languages[key]
+
+    def _prepare(self, field: AutoTranslatedField):
+        """
+        Split the content of a field in chunks, and queue the chunks that need to be
+        translated. Each chunk is a dict of its text by language, filled when the
+        chunk is translated.
+        """
+        instance = self._instances[(field.content_type_id, field.object_id)]
+        languages = self._get_languages(field)
+        content = getattr(instance, field.field_name, "")
+        translation = {"languages": languages, "chunks": None, "detected": []}
+        self._translations[field.id] = translation
+        if not languages or not content:
+            return
+        max_length = self.max_length // len(languages)
+        skip = BASE64_IMAGE_PATTERN.search(content) is not None
+        chunks = AutoTranslatedField.split_content(
+            content, max_length, text_type=field.field_type
+        )
+        translation["chunks"] = []
+        for chunk in chunks:
+            text = str(chunk)
+            translated = {}
+            if (
+                skip
+                or (
+                    field.field_type == AutoTranslatedField.FieldType.HTML
+                    and (not text.strip() or not chunk.get_text(strip=True))
+                )
+                or (len(text) > max_length and len(text) >= self.max_length)
+            ):
+                translated = dict.fromkeys(languages, text)
+            elif len(text) <= max_length:
+                self._requests[(languages, field.field_type)].append(
+                    (field.id, translated, text)
+                )
+            else:
+                # Too long to be translated in all languages at once
+                for language in languages:
+                    self._requests[((language,), field.field_type)].append(
+                        (field.id, translated, text)
+                    )
+            translation["chunks"].append(translated)
+
+    def _pack(self, chunks: list, languages_count: int) -> Iterable[list]:
+        """
+        Pack the chunks in batches that fit in a single Azure Translator request.
+        """
+        batch, length = [], 0
+        for chunk in chunks:
+            chunk_length = len(chunk[0]) * languages_count
+            if batch and (
+                len(batch) >= self.max_elements
+                or length + chunk_length > self.max_length
+            ):
+                yield batch
+                batch, length = [], 0
+            batch.append(chunk)
+            length += chunk_length
+        if batch:
+            yield batch
+
+    def _translate(self):
+        """
+        Translate the queued chunks, using the translation memory first. The chunks
+        missing from the memory are deduplicated and sent to Azure Translator, grouped
+        by the languages they are still missing.
+        """
+        memory = get_memory_translations(
+            {
+                (text, field_type, language)
+                for (languages, field_type), chunks in self._requests.items()
+                for _, _, text in chunks
+                for language in languages
+            }
+        )
+        requests = defaultdict(lambda: defaultdict(list))
+        for (languages, field_type), chunks in self._requests.items():
+            for field_id, translated, text in chunks:
+                missing = []
+                detected_language = None
+                for language in languages:
+                    if (text, field_type, language) in memory:
+                        translated[language], detected_language = memory[
+                            (text, field_type, language)
+                        ]
+                    else:
+                        missing.append(language)
+                if missing:
+                    requests[(tuple(missing), field_type)][text].append(
+                        (field_id, translated)
+                    )
+                else:
+                    self._translations[field_id]["detected"].append(detected_language)
+
+        new_translations = {}
+        for (languages, field_type), texts in requests.items():
+            for batch in self._pack(list(texts.items()), len(languages)):
+                try:
+                    results = AzureTranslatorService.translate_text_contents(
+                        [text for text, _ in batch], languages, field_type
+                    )
+                except Exception as e:  # noqa: PIE786
+                    for _, chunks in batch:
+                        for field_id, _ in chunks:
+                            self.errors.setdefault(field_id, e)
+                    continue
+                translated_characters.labels(source="translator").inc(
+                    sum(len(text) for text, _ in batch) * len(languages)
+                )
+                for (text, chunks), (translations, detected) in zip(batch, results):
+                    for translation in translations:
+                        new_translations[(text, field_type, translation["to"])] = (
+                            translation["text"],
+                            detected,
+                        )
+                    for field_id, translated in chunks:
+                        for translation in translations:
+                            translated[translation["to"]] = translation["text"]
+                        self._translations[field_id]["detected"].append(detected)
+        set_memory_translations(new_translations)
+
+    def _save(self) -> list[AutoTranslatedField]:
+        instances = defaultdict(dict)
+        columns = defaultdict(set)
+        translated_fields = []
+        for field in self.fields:
+            if field.id in self.errors:
+                continue
+            translation = self._translations[field.id]
+            instance = self._instances[(field.content_type_id, field.object_id)]
+            content = getattr(instance, field.field_name, "")
+            for language in translation["languages"]:
+                value = (
+                    content
+                    if translation["chunks"] is None
+                    else "".join(
+                        chunk.get(language, "") for chunk in translation["chunks"]
+                    )
+                )
+                setattr(instance, f"{field.field_name}_{language}", value)
+                columns[instance._meta.model].add(f"{field.field_name}_{language}")
+            if translation["detected"]:
+                # Use the most common detected language among chunks
+                detected_language = Counter(translation["detected"]).most_common(1)
+                setattr(
+                    instance,
+                    f"{field.field_name}_detected_language",
+                    detected_language[0][0],
+                )
+                columns[instance._meta.model].add(
+                    f"{field.field_name}_detected_language"
+                )
+            instances[instance._meta.model][instance.pk] = instance
+            translated_fields.append(field)
+        for model, model_columns in columns.items():
+            model._base_manager.bulk_update(
+                instances[model].values(), sorted(model_columns)
+            )
+        AutoTranslatedField.objects.filter(
+            id__in=[field.id for field in translated_fields]
+        ).update(up_to_date=True)
+        for field in translated_fields:
+            field.up_to_date = True
+        return translated_fields
@@ -24,19 +24,34 @@ class AzureTranslatorService:
         """
         Translate text content to the specified languages.
         """
+        return cls.translate_text_contents([content], languages, field_type)[0]
+
+    @classmethod
+    def translate_text_contents(
+        cls, contents: list[str], languages: list[str], field_type: str
+    ) -> list[tuple[list[dict], str]]:
+        """
+        Translate several text contents to the specified languages in a single request.
+
+        The caller is responsible for respecting the limits of the Azure Translator
+        API: 1000 elements and 50 000 characters across all target languages per
+        request.
+        """
         response = cls.service.translate(
-            body=[content],
+            body=contents,
             to_language=set(languages),
             text_type=field_type.lower(),
         )
-        response = response[0]
-        detected_language = response.detected_language.language
-        translations = response.translations
-        translations = [
-            {
-                "to": translation.to,
-                "text": cls.clean_translation(translation.text),
-            }
-            for translation in translations
+        return [
+            (
+                [
+                    {
+                        "to": translation.to,
+                        "text": cls.clean_translation(translation.text),
+                    }
+                    for translation in item.translations
+                ],
+                item.detected_language.language,
+            )
+            for item in response
         ]
-        return translations, detected_language
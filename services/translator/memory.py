@@ -0,0 +1,124 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from prometheus_client import Counter
+
+from .models import TranslationMemory
+
+translation_memory_hits = Counter(
+    "projects_translation_memory_hits_total",
+    "Number of chunk translations found in the translation memory.",
+)
+translation_memory_misses = Counter(
+    "projects_translation_memory_misses_total",
+    "Number of chunk translations missing from the translation memory.",
+)
+translated_characters = Counter(
+    "projects_translated_characters_total",
+    "Number of characters translated, counted once per target language.",
+    ["source"],
+)
+
+# Refresh the last use of a translation at most once per period, to avoid writing
+# every translation read
+LAST_USED_REFRESH_PERIOD = timedelta(days=1)
+
+
+def get_translation_memory_key(text: str, text_type: str, language: str) -> str:
+    """
+    Return the key of a translation, a hash of its source text, text type and
+    target language.
+    """
+    return hashlib.sha256(f"{text_type}\0{language}\0{text}".encode()).hexdigest()
+
+
+def get_memory_translations(
+    chunks: set[tuple[str, str, str]],
+) -> dict[tuple[str, str, str], tuple[str, str]]:
+    """
+    Get the translations of many chunks from the translation memory in a single
+    query, and mark them as used.
+
+    Args:
+        - chunks (set[tuple[str, str, str]]): The `(text, text_type, language)` of
+            the chunks.
+
+    Returns:
+        - The `(translation, detected_language)` found for each chunk.
+    """
+    if not settings.TRANSLATION_MEMORY_ENABLED or not chunks:
+        return {}
+    keys = {get_translation_memory_key(*chunk): chunk for chunk in chunks}
+    memories = list(TranslationMemory.objects.filter(key__in=keys))
+    translations = {
+        keys[memory.key]: (memory.translation, memory.detected_language)
+        for memory in memories
+    }
+    now = timezone.now()
+    TranslationMemory.objects.filter(
+        key__in=[
+            memory.key
+            for memory in memories
+            if memory.last_used < now - LAST_USED_REFRESH_PERIOD
+        ]
+    ).update(last_used=now)
+    translation_memory_hits.inc(len(translations))
+    translation_memory_misses.inc(len(keys) - len(translations))
+    translated_characters.labels(source="memory").inc(
+        sum(len(text) for text, _, _ in translations)
+    )
+    return translations
+
+
+def set_memory_translations(
+    translations: dict[tuple[str, str, str], tuple[str, str]],
+):
+    """
+    Store new translations in the translation memory in a single query.
+
+    Args:
+        - translations (dict[tuple[str, str, str], tuple[str, str]]): The
+            `(translation, detected_language)` of each `(text, text_type, language)`.
+    """
+    if not settings.TRANSLATION_MEMORY_ENABLED or not translations:
+        return
+    now = timezone.now()
+    TranslationMemory.objects.bulk_create(
+        [
+            TranslationMemory(
+                key=get_translation_memory_key(*chunk),
+                translation=translation,
+                detected_language=detected_language or "",
+                last_used=now,
+            )
+            for chunk, (translation, detected_language) in translations.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["translation", "detected_language", "last_used"],
+    )
+
+
+def prune_translation_memory() -> int:
+    """
+    Delete the translations unused for TRANSLATION_MEMORY_RETENTION_DAYS, and the
+    least recently used ones above TRANSLATION_MEMORY_MAX_ENTRIES.
+
+    Returns:
+        - The number of deleted translations.
+    """
+    deleted, _ = TranslationMemory.objects.filter(
+        last_used__lt=timezone.now()
+        - timedelta(days=settings.TRANSLATION_MEMORY_RETENTION_DAYS)
+    ).delete()
+    excess = TranslationMemory.objects.count() - settings.TRANSLATION_MEMORY_MAX_ENTRIES
+    if excess > 0:
+        count, _ = TranslationMemory.objects.filter(
+            key__in=TranslationMemory.objects.order_by("last_used", "key").values(
+                "key"
+            )[:excess]
+        ).delete()
+        deleted += count
+    return deleted
@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models, transaction
@@ -113,6 +115,48 @@ class HasAutoTranslatedFields(metaclass=TranslatedModelMeta):
                 if self.auto_translate_instantly:
                     auto_translated_field.update_translation()
 
+    @classmethod
+    def copy_auto_translated_fields(cls, copies: dict[Any, "HasAutoTranslatedFields"]):
+        """
+        Create the `AutoTranslatedField` of instances duplicated with `bulk_create`,
+        in a single query. The copies keep the translation state of the originals, and
+        fields that were never translated are marked as not up to date.
+
+        Arguments:
+            copies (dict[Any, HasAutoTranslatedFields]): The saved copies, by primary
+                key of the original instances.
+        """
+        content_type = ContentType.objects.get_for_model(cls)
+        up_to_date = {
+            (object_id, field_name): value
+            for object_id, field_name, value in AutoTranslatedField.objects.filter(
+                content_type=content_type,
+                object_id__in=[str(pk) for pk in copies],
+            ).values_list("object_id", "field_name", "up_to_date")
+        }
+        fields = [
+            (
+                field.split(":", 1)
+                if ":" in field
+                else (AutoTranslatedField.FieldType.PLAIN, field)
+            )
+            for field in cls.auto_translated_fields
+        ]
+        AutoTranslatedField.objects.bulk_create(
+            [
+                AutoTranslatedField(
+                    content_type=content_type,
+                    object_id=str(instance.pk),
+                    field_name=field,
+                    field_type=field_type,
+                    up_to_date=up_to_date.get((str(pk), field), False),
+                )
+                for pk, instance in copies.items()
+                for field_type, field in fields
+            ],
+            ignore_conflicts=True,
+        )
+
     def _delete_auto_translated_fields(self):
         AutoTranslatedField.objects.filter(
             content_type=ContentType.objects.get_for_model(self.__class__),
@@ -1,15 +1,10 @@
-import re
-
 from bs4 import BeautifulSoup
-from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
-
-from apps.commons.mixins import OrganizationRelated
-
-from .interface import AzureTranslatorService
+from django.utils import timezone
 
 AZURE_MAX_LENGTH = 50000
+AZURE_MAX_ELEMENTS = 1000
 
 
 class AutoTranslatedField(models.Model):
@@ -85,92 +80,34 @@ class AutoTranslatedField(models.Model):
         return chunks
 
     def update_translation(self):
-        instance = self.instance
-        field_name = self.field_name
-        content = getattr(instance, field_name, "")
-        if not isinstance(instance, OrganizationRelated):
-            raise ValueError(
-                f"{instance._meta.model.__name__} does not support translations. "
-                "`OrganizationRelated` mixin is required for automatic translations."
-            )
-        if getattr(instance, "auto_translate_all_languages", False):
-            languages = (
-                settings.REQUIRED_LANGUAGES
-                if any(
-                    o.auto_translate_content
-                    for o in instance.get_related_organizations()
-                )
-                else {}
-            )
-        else:
-            organizations = [
-                o
-                for o in instance.get_related_organizations()
-                if o.auto_translate_content
-            ]
-            # iter over languages in set (remove duplicate language)
-            languages: set[str] = {
-                lang for org in organizations for lang in org.languages
-            }
-        if languages:
-            base_max_length = AZURE_MAX_LENGTH * 0.8  # Safety margin
-            max_length = int(base_max_length // len(languages))
-            if content:
-                chunks = self.split_content(
-                    content, max_length, text_type=self.field_type
-                )
-                translations = {}
-                detected_languages = []
-                for chunk in chunks:
-                    if (
-                        self.field_type == "html"
-                        and (not str(chunk).strip() or not chunk.get_text(strip=True))
-                    ) or (re.findall(r'data:image\/[a-zA-Z]+;base64,[^"\']+', content)):
-                        chunk_translations = [
-                            {"to": lang, "text": str(chunk)} for lang in languages
-                        ]
-                    else:
-                        chunk = str(chunk)
-                        if len(chunk) <= max_length:
-                            chunk_translations, detected_language = (
-                                AzureTranslatorService.translate_text_content(
-                                    str(chunk), languages, self.field_type
-                                )
-                            )
-                            detected_languages.append(detected_language)
-                        elif len(chunk) < base_max_length:
-                            for lang in languages:
-                                lang_chunk_translation, detected_language = (
-                                    AzureTranslatorService.translate_text_content(
-                                        str(chunk), [lang], self.field_type
-                                    )
-                                )
-                                chunk_translations.append(
-                                    {
-                                        "to": lang,
-                                        "text": lang_chunk_translation[0]["text"],
-                                    }
-                                )
-                                detected_languages.append(detected_language)
-                        else:
-                            chunk_translations = [
-                                {"to": lang, "text": str(chunk)} for lang in languages
-                            ]
-                    translations = {
-                        f"{field_name}_{translation['to']}": (
-                            translations.get(f"{field_name}_{translation['to']}", "")
-                            + translation["text"]
-                        )
-                        for translation in chunk_translations
-                    }
-                # Use the most common detected language among chunks
-                if detected_languages:
-                    detected_language = max(
-                        set(detected_languages), key=detected_languages.count
-                    )
-                    translations[f"{field_name}_detected_language"] = detected_language
-            else:
-                translations = {f"{field_name}_{lang}": content for lang in languages}
-            instance._meta.model.objects.filter(pk=instance.pk).update(**translations)
-        self.up_to_date = True
-        self.save()
+        """Translate this field, see `TranslationEngine` to translate many fields."""
+        from .engine import TranslationEngine
+
+        engine = TranslationEngine([self])
+        engine.run()
+        if self.id in engine.errors:
+            raise engine.errors[self.id]
+
+
+class TranslationMemory(models.Model):
+    """
+    Translation of a chunk of text, addressed by a hash of its source text, text type
+    and target language, used to avoid sending the same text to the translator again.
+
+    Attributes:
+    ----------
+        key: CharField
+            The SHA-256 hash of the text type, target language and source text.
+        translation: TextField
+            The translated text.
+        detected_language: CharField
+            The language detected in the source text.
+        last_used: DateTimeField
+            The last time the translation was used, the least recently used
+            translations are pruned first.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    translation = models.TextField()
+    detected_language = models.CharField(max_length=10, blank=True, default="")
+    last_used = models.DateTimeField(default=timezone.now, db_index=True)
@@ -1,23 +1,32 @@
 import logging
+from itertools import batched
 
 from django.contrib.contenttypes.models import ContentType
 
 from apps.commons.utils import clear_memory
 from projects.celery import app
 
+from .engine import TranslationEngine
+from .memory import prune_translation_memory as _prune_translation_memory
 from .models import AutoTranslatedField
 
 logger = logging.getLogger(__name__)
 
+# Fields translated together by the engine, to bound the memory used by a run
+TRANSLATION_BATCH_SIZE = 500
+
 
 @app.task(name="apps.translations.tasks.automatic_translations")
 @clear_memory
 def automatic_translations():
-    for field in AutoTranslatedField.objects.filter(up_to_date=False):
-        try:
-            field.update_translation()
-        except Exception as e:  # noqa: PIE786
-            logger.error(f"Error updating auto-translated field {field.id}: {e}")
+    fields = AutoTranslatedField.objects.filter(up_to_date=False).order_by(
+        "content_type_id", "object_id"
+    )
+    for batch in batched(fields.iterator(), TRANSLATION_BATCH_SIZE):
+        engine = TranslationEngine(batch)
+        engine.run()
+        for field_id, e in engine.errors.items():
+            logger.error(f"Error updating auto-translated field {field_id}: {e}")
 
 
 @app.task(name="apps.translations.tasks.translate_object")
@@ -45,10 +54,15 @@ def translate_object(
         fields_name if fields_name is not None else "all",
     )
 
-    for field in queryset:
-        try:
-            field.update_translation()
-        except Exception as e:  # noqa: PIE786
-            logger.error(
-                f"Error updating model-translated {model} field {field.id}: {e}"
-            )
+    engine = TranslationEngine(queryset)
+    engine.run()
+    for field_id, e in engine.errors.items():
+        logger.error(f"Error updating model-translated {model} field {field_id}: {e}")
+
+
+@app.task(name="apps.translations.tasks.prune_translation_memory")
+@clear_memory
+def prune_translation_memory():
+    """Delete the unused and least recently used translations of the memory."""
+    deleted = _prune_translation_memory()
+    logger.info("Pruned %s translations from the translation memory", deleted)
@@ -14,8 +14,8 @@ class MockTranslateTestCase(JwtAPITestCase):
 
         Arguments
         ---------
-        - content (str): The text content to be translated.
-        - languages (list of str): The target languages for translation.
+        - body (list of str): The text contents to be translated.
+        - to_language (list of str): The target languages for translation.
 
         Returns
         -------
@@ -26,8 +26,9 @@ class MockTranslateTestCase(JwtAPITestCase):
             SimpleNamespace(
                 detected_language=SimpleNamespace(language="en", score=1.0),
                 translations=[
-                    SimpleNamespace(text=f"{lang} : {body[0]}", to=lang)
+                    SimpleNamespace(text=f"{lang} : {content}", to=lang)
                     for lang in to_language
                 ],
             )
+            for content in body
         ]
@@ -1,8 +1,11 @@
+from datetime import timedelta
 from unittest.mock import call, patch
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from faker import Faker
 
 from apps.accounts.factories import PeopleGroupFactory, UserFactory
@@ -41,7 +44,12 @@ from apps.skills.factories import (
     MentoringMessageFactory,
     TagClassificationFactory,
 )
-from services.translator.models import AutoTranslatedField
+from services.translator.engine import TranslationEngine
+from services.translator.memory import (
+    get_translation_memory_key,
+    prune_translation_memory,
+)
+from services.translator.models import AutoTranslatedField, TranslationMemory
 from services.translator.tasks import automatic_translations
 from services.translator.testcases import MockTranslateTestCase
 
@@ -344,33 +352,34 @@ class UpdateTranslationsTestCase(MockTranslateTestCase):
         # Run the automatic translations task
         automatic_translations()
 
-        # Check that the mock was called with the expected parameters
-        mock_translate.assert_has_calls(
-            [
-                call(
-                    body=[
-                        getattr(
-                            instance,
-                            field.split(":", 1)[1] if ":" in field else field,
-                        )
-                    ],
-                    to_language=(
-                        {str(lang) for lang in self.organization_1.languages}
+        # Check that the contents were sent in batched requests
+        requests = [
+            (text, frozenset(c.kwargs["to_language"]), c.kwargs["text_type"])
+            for c in mock_translate.call_args_list
+            for text in c.kwargs["body"]
+        ]
+        for instance, field in [
+            (data["instance_1"], field)
+            for data in self.instances
+            for field in data["model"].auto_translated_fields
+        ]:
+            self.assertIn(
+                (
+                    getattr(
+                        instance, field.split(":", 1)[1] if ":" in field else field
+                    ),
+                    (
+                        frozenset(str(lang) for lang in self.organization_1.languages)
                         if not instance.auto_translate_all_languages
-                        else {str(lang) for lang in settings.REQUIRED_LANGUAGES}
+                        else frozenset(
+                            str(lang) for lang in settings.REQUIRED_LANGUAGES
+                        )
                     ),
-                    text_type=(field.split(":", 1)[0] if ":" in field else "plain"),
-                )
-                for instance, field in [
-                    *[
-                        (data["instance_1"], field)
-                        for data in self.instances
-                        for field in data["model"].auto_translated_fields
-                    ]
-                ]
-            ],
-            any_order=True,
-        )
+                    field.split(":", 1)[0] if ":" in field else "plain",
+                ),
+                requests,
+            )
+        self.assertLess(mock_translate.call_count, len(requests))
 
         # Check that all fields are now up to date
         self.assertEqual(
@@ -488,3 +497,122 @@ class MiscTranslationTestCase(MockTranslateTestCase):
                 f"{description[3]}"
                 f"{description[4]}",
             )
+
+    @patch("azure.ai.translation.text.TextTranslationClient.translate")
+    def test_batch_translation_requests(self, mock_translate):
+        mock_translate.side_effect = self.translator_side_effect
+
+        projects = ProjectFactory.create_batch(3, organizations=[self.organization])
+        fields = AutoTranslatedField.objects.filter(
+            content_type=ContentType.objects.get_for_model(Project),
+            object_id__in=[str(project.pk) for project in projects],
+            field_name="title",
+        )
+        with patch.object(TranslationEngine, "max_elements", 2):
+            translated_fields = TranslationEngine(fields).run()
+        self.assertEqual(len(translated_fields), 3)
+        self.assertEqual(
+            [len(c.kwargs["body"]) for c in mock_translate.call_args_list], [2, 1]
+        )
+        self.assertFalse(
+            AutoTranslatedField.objects.filter(
+                id__in=[field.id for field in translated_fields], up_to_date=False
+            ).exists()
+        )
+        for project in projects:
+            project.refresh_from_db()
+            for lang in self.organization.languages:
+                self.assertEqual(
+                    getattr(project, f"title_{lang}"), f"{lang} : {project.title}"
+                )
+            self.assertEqual(project.title_detected_language, "en")
+
+    @override_settings(TRANSLATION_MEMORY_ENABLED=True)
+    @patch("azure.ai.translation.text.TextTranslationClient.translate")
+    def test_translation_memory(self, mock_translate):
+        mock_translate.side_effect = self.translator_side_effect
+        content_type = ContentType.objects.get_for_model(Project)
+
+        title = faker.sentence()
+        projects = ProjectFactory.create_batch(
+            2, organizations=[self.organization], title=title
+        )
+        TranslationEngine(
+            AutoTranslatedField.objects.filter(
+                content_type=content_type,
+                object_id__in=[str(project.pk) for project in projects],
+                field_name="title",
+            )
+        ).run()
+        # The same chunk is only sent once
+        mock_translate.assert_called_once_with(
+            body=[title],
+            to_language={str(lang) for lang in self.organization.languages},
+            text_type="plain",
+        )
+
+        mock_translate.reset_mock()
+        project = ProjectFactory(organizations=[self.organization], title=title)
+        TranslationEngine(
+            AutoTranslatedField.objects.filter(
+                content_type=content_type,
+                object_id=str(project.pk),
+                field_name="title",
+            )
+        ).run()
+        mock_translate.assert_not_called()
+        project.refresh_from_db()
+        for lang in self.organization.languages:
+            self.assertEqual(getattr(project, f"title_{lang}"), f"{lang} : {title}")
+        self.assertEqual(project.title_detected_language, "en")
+
+    @patch("azure.ai.translation.text.TextTranslationClient.translate")
+    def test_translation_memory_disabled(self, mock_translate):
+        mock_translate.side_effect = self.translator_side_effect
+        project = ProjectFactory(organizations=[self.organization])
+        field = AutoTranslatedField.objects.get(
+            content_type=ContentType.objects.get_for_model(Project),
+            object_id=project.pk,
+            field_name="title",
+        )
+        field.update_translation()
+        mock_translate.assert_called_once()
+        self.assertFalse(TranslationMemory.objects.exists())
+
+    @override_settings(
+        TRANSLATION_MEMORY_RETENTION_DAYS=30, TRANSLATION_MEMORY_MAX_ENTRIES=2
+    )
+    def test_prune_translation_memory(self):
+        now = timezone.now()
+        memories = TranslationMemory.objects.bulk_create(
+            [
+                TranslationMemory(
+                    key=get_translation_memory_key(f"text {i}", "plain", "fr"),
+                    translation=f"fr : text {i}",
+                    last_used=now - timedelta(days=days),
+                )
+                for i, days in enumerate([0, 1, 2, 40])
+            ]
+        )
+        self.assertEqual(prune_translation_memory(), 2)
+        self.assertSetEqual(
+            set(TranslationMemory.objects.values_list("key", flat=True)),
+            {memories[0].key, memories[1].key},
+        )
+
+    @override_settings(TRANSLATION_MEMORY_MAX_ENTRIES=2)
+    def test_prune_translation_memory_same_last_use(self):
+        now = timezone.now()
+        TranslationMemory.objects.bulk_create(
+            [
+                TranslationMemory(
+                    key=get_translation_memory_key(f"text {i}", "plain", "fr"),
+                    translation=f"fr : text {i}",
+                    last_used=now,
+                )
+                for i in range(5)
+            ]
+        )
+        # Only the excess is deleted, even if the translations were used together
+        self.assertEqual(prune_translation_memory(), 3)
+        self.assertEqual(TranslationMemory.objects.count(), 2)